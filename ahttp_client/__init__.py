@@ -26,11 +26,27 @@ from typing import NamedTuple, Literal, Optional
 from .body import Body
 from .body_json import BodyJson
 from .body_form import BodyForm
+from .cache import ResponseCache, CacheBackend, MemoryCacheBackend, SQLiteCacheBackend
+from .circuit import CircuitBreaker, CircuitOpenError, CircuitState
+from .coalesce import RequestCoalescer
+from .codec import JsonCodec, OrjsonCodec, MsgspecCodec, default_codec, fastest_codec
 from .header import Header
+from .histogram import Histogram
+from .hedge import HedgePolicy
+from .metrics import MetricsRegistry
 from .path import Path
+from .pool import PoolConfig, SessionPool
+from .profiler import Profiler
 from .query import Query
-from .request import RequestCore, request, get, post, options, put, delete
+from .ratelimit import RateLimiter, TokenBucket
+from .request import RequestCore, request, get, post, options, put, delete, sse
+from .request_state import RequestState
+from .retry import RetryPolicy, RetryBudget
+from .response import BufferedResponse
 from .session import Session
+from .sse import ServerSentEvent, EventStream, EventSource, EventStreamParser
+from .stream import Stream, ResponseStream, JsonLinesStream
+from .trace import NetworkTracer
 
 __title__ = "ahttp_client"
 __author__ = "gunyu1019"
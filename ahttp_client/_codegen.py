@@ -0,0 +1,150 @@
+"""MIT License
+
+Copyright (c) 2023-present gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import inspect
+import linecache
+from typing import TYPE_CHECKING
+
+import aiohttp
+
+from .payload import add_form_field
+from .request_state import RequestState
+
+if TYPE_CHECKING:
+    from typing import Any, Callable, Optional
+
+    from .request import RequestCore
+
+    BindFunction = Callable[..., tuple[RequestState, str, dict[str, Any]]]
+
+_PREFIX = "_ahttp_"
+_UNSUPPORTED_KINDS = (
+    inspect.Parameter.POSITIONAL_ONLY,
+    inspect.Parameter.VAR_POSITIONAL,
+    inspect.Parameter.VAR_KEYWORD,
+)
+
+
+def _make_signature(signature: inspect.Signature, namespace: dict[str, Any]) -> Optional[list[str]]:
+    arguments = []
+    is_keyword_only = False
+    for index, parameter in enumerate(signature.parameters.values()):
+        if parameter.kind in _UNSUPPORTED_KINDS or parameter.name.startswith(_PREFIX):
+            return None
+
+        if parameter.kind == inspect.Parameter.KEYWORD_ONLY and not is_keyword_only:
+            is_keyword_only = True
+            arguments.append("*")
+
+        if parameter.default is inspect.Parameter.empty:
+            arguments.append(parameter.name)
+            continue
+
+        default_name = "%sdefault_%d" % (_PREFIX, index)
+        namespace[default_name] = parameter.default
+        arguments.append("%s=%s" % (parameter.name, default_name))
+    return arguments
+
+
+def compile_bind(core: RequestCore) -> Optional[BindFunction]:
+    """Generate a function that maps the arguments of the request directly into HTTP components.
+
+    The generated function has the same signature as the decorated function (without response parameters)
+    and returns a tuple of (RequestState, path, arguments).
+
+    Parameters
+    ----------
+    core: RequestCore
+        The request to compile. The components of request must be set up.
+
+    Returns
+    -------
+    Optional[Callable[..., tuple[RequestState, str, dict[str, Any]]]]
+        The compiled function. Returns None, when the signature of the function can't be compiled.
+        (For example, positional-only parameter, \\*args or \\*\\*kwargs)
+    """
+    namespace: dict[str, Any] = {
+        "%score" % _PREFIX: core,
+        "%sform_data" % _PREFIX: aiohttp.FormData,
+        "%sadd_form_field" % _PREFIX: add_form_field,
+        "%sstate" % _PREFIX: RequestState,
+    }
+    arguments = _make_signature(core._signature, namespace)
+    if arguments is None:
+        return None
+
+    lines = ["def %sbind(%s):" % (_PREFIX, ", ".join(arguments))]
+
+    # Header
+    lines.append("    %sheaders = %score.headers.copy()" % (_PREFIX, _PREFIX))
+    for _name, _parameter in core.header_parameter.items():
+        # When method argument is None, it can cause an exception during the parsing process.
+        lines.append("    if %s is not None:" % _parameter.name)
+        lines.append("        %sheaders[%r] = %s" % (_PREFIX, _name, _parameter.name))
+
+    # Parameter
+    lines.append("    %sparams = %score.params.copy()" % (_PREFIX, _PREFIX))
+    for _name, _parameter in core.query_parameter.items():
+        lines.append("    if %s is not None:" % _parameter.name)
+        lines.append("        %sparams[%r] = %s" % (_PREFIX, _name, _parameter.name))
+
+    # Body
+    if core.is_formal_form and core.body_parameter is None:
+        lines.append("    %sbody = %sform_data()" % (_PREFIX, _PREFIX))
+        for _name, _parameter in core.body_form_parameter.items():
+            lines.append("    %sadd_form_field(%sbody, %r, %s)" % (_PREFIX, _PREFIX, _name, _parameter.name))
+    elif len(core.body_json_parameter) > 0 and core.body_parameter is None:
+        items = ", ".join("%r: %s" % (_name, _parameter.name) for _name, _parameter in core.body_json_parameter.items())
+        lines.append("    %sbody = {%s}" % (_PREFIX, items))
+    elif core.body_parameter is not None:
+        lines.append("    %sbody = %s" % (_PREFIX, core.body_parameter.name))
+    else:
+        lines.append("    %sbody = %score.body" % (_PREFIX, _PREFIX))
+
+    # Path
+    if core.path_template.is_static:
+        lines.append("    %spath = %r" % (_PREFIX, core.path_template.format({})))
+    else:
+        path_arguments = ", ".join(
+            "%r: %s" % (_name, _parameter.name) for _name, _parameter in core.path_parameter.items()
+        )
+        lines.append("    %spath = %score.path_template.format({%s})" % (_PREFIX, _PREFIX, path_arguments))
+
+    bounded_argument = ", ".join("%r: %s" % (name, name) for name in core._signature.parameters.keys())
+    lines.append(
+        "    return %sstate(%score, %sheaders, %sparams, %sbody), %spath, {%s}"
+        % (_PREFIX, _PREFIX, _PREFIX, _PREFIX, _PREFIX, _PREFIX, bounded_argument)
+    )
+
+    source = "\n".join(lines) + "\n"
+    filename = "<ahttp_client bind %s.%s-%d>" % (core.__module__, core.__qualname__, id(core))
+    exec(compile(source, filename, "exec"), namespace)
+
+    # Register the source code to show the generated line in the traceback.
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+
+    bind_function = namespace["%sbind" % _PREFIX]
+    bind_function.__source__ = source
+    return bind_function
@@ -22,12 +22,12 @@ SOFTWARE.
 """
 
 from __future__ import annotations
-from typing import Any, TypeVar, Callable, Coroutine, TYPE_CHECKING
+from typing import Any, Awaitable, TypeVar, Callable, Coroutine, TYPE_CHECKING
 
 if TYPE_CHECKING:
     import aiohttp
     from .session import Session
-    from .request import RequestCore
+    from .request_state import RequestState
 
 
 T = TypeVar("T")
@@ -39,10 +39,18 @@ RequestFunction = Callable[
     _Coroutine[T | aiohttp.ClientResponse],
 ]
 RequestBeforeHookFunction = Callable[
-    [Session, RequestCore, str],
-    _Coroutine[RequestCore],
+    [Session, RequestState, str],
+    _Coroutine[tuple[RequestState, str]],
 ]
 RequestAfterHookFunction = Callable[
     [Session, T | aiohttp.ClientResponse],
     _Coroutine[T | aiohttp.ClientResponse],
 ]
+MiddlewareNextFunction = Callable[
+    [RequestState],
+    Awaitable[aiohttp.ClientResponse | T],
+]
+Middleware = Callable[
+    [RequestState, MiddlewareNextFunction],
+    Awaitable[aiohttp.ClientResponse | T],
+]
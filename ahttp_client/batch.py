@@ -0,0 +1,150 @@
+"""MIT License
+
+Copyright (c) 2023-present gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+    from typing import Any, Optional
+
+T = TypeVar("T")
+_DONE = object()
+
+
+def make_call(func: Callable[..., Awaitable[T]], argument: Any) -> Callable[[], Awaitable[T]]:
+    """Make a call from an item of batch.
+    A mapping is used as keyword arguments, a tuple is used as positional arguments,
+    and others are used as a single positional argument."""
+    if isinstance(argument, Mapping):
+        return lambda: func(**argument)
+    elif isinstance(argument, tuple):
+        return lambda: func(*argument)
+    return lambda: func(argument)
+
+
+def _check_concurrency(concurrency: int) -> None:
+    if not isinstance(concurrency, int) or concurrency < 1:
+        raise ValueError("concurrency must be an integer greater than or equal to 1.")
+
+
+async def as_completed(
+    calls: Iterable[Callable[[], Awaitable[T]]],
+    *,
+    concurrency: int = 10,
+    return_exceptions: bool = False,
+    timeout: Optional[float] = None,
+) -> AsyncIterator[tuple[int, T | BaseException]]:
+    """Run calls with bounded concurrency, and yield results in the order of completion.
+    The calls are consumed lazily, so that only `concurrency` calls are in flight at the same time.
+
+    Parameters
+    ----------
+    calls: Iterable[Callable[[], Awaitable[T]]]
+        Functions that start a call.
+    concurrency: int
+        Maximum number of calls running at the same time.
+    return_exceptions: bool
+        If it is True, an exception of the call is yielded as the result.
+        Otherwise, the first exception cancels the remaining calls and is raised. (fail-fast)
+    timeout: Optional[float]
+        Deadline of the whole batch in seconds.
+        When the deadline is exceeded, the remaining calls are cancelled and `asyncio.TimeoutError` is raised.
+
+    Yields
+    ------
+    tuple[int, T | BaseException]
+        Index of the call and the result.
+    """
+    _check_concurrency(concurrency)
+
+    loop = asyncio.get_running_loop()
+    deadline = None if timeout is None else loop.time() + timeout
+    iterator = enumerate(calls)
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def worker():
+        try:
+            for index, call in iterator:
+                try:
+                    result = await call()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as error:
+                    queue.put_nowait((index, error, True))
+                else:
+                    queue.put_nowait((index, result, False))
+        except Exception as error:
+            # The iterable of calls raised an exception.
+            queue.put_nowait((-1, error, True))
+        finally:
+            queue.put_nowait(_DONE)
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+    running_workers = len(workers)
+    try:
+        while running_workers > 0:
+            remaining_time = None if deadline is None else max(0.0, deadline - loop.time())
+            item = await asyncio.wait_for(queue.get(), remaining_time)
+            if item is _DONE:
+                running_workers -= 1
+                continue
+
+            index, result, is_exception = item
+            if is_exception and (not return_exceptions or index == -1):
+                raise result
+            yield index, result
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+async def gather(
+    calls: Iterable[Callable[[], Awaitable[T]]],
+    *,
+    concurrency: int = 10,
+    return_exceptions: bool = False,
+    timeout: Optional[float] = None,
+) -> list[T | BaseException]:
+    """Run calls with bounded concurrency, and return results in the order of calls.
+    The parameters are same as :func:`as_completed`.
+    """
+    results: dict[int, T | BaseException] = dict()
+    iterator = as_completed(calls, concurrency=concurrency, return_exceptions=return_exceptions, timeout=timeout)
+    try:
+        async for index, result in iterator:
+            results[index] = result
+    finally:
+        await iterator.aclose()
+    return [results[index] for index in range(len(results))]
+
+
+def close_awaitable(awaitable: Awaitable[Any]) -> None:
+    """Close the coroutine that never started, to prevent the warning that the coroutine was never awaited."""
+    if inspect.iscoroutine(awaitable) and inspect.getcoroutinestate(awaitable) == inspect.CORO_CREATED:
+        awaitable.close()
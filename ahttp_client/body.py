@@ -27,10 +27,17 @@ from .component import UnsupportedCustomNameComponent
 class Body(UnsupportedCustomNameComponent):
     """This class is used to indicate that a method's parameter is used in the HTTP Request's Body.
 
+    A collection (ex. dict, list) is sent as JSON. Binary bodies are streamed without reading the whole body:
+    async iterables of bytes and file objects are sent in chunks, a path (`os.PathLike`) is read from the file,
+    and a memoryview or mmap is sent in slices.
+
     Examples
     --------
     >>> def function(body: dict | Body):
     ...    pass
+
+    >>> def upload(body: Annotated[pathlib.Path, Body]):
+    ...    pass
     """
 
     pass
@@ -26,6 +26,7 @@ from .component import Component
 
 class BodyForm(Component):
     """This class defines the parameters of a function to be used in the FormData of an HTTP Request.
+    A file object, a path (`os.PathLike`), a memoryview or mmap is streamed as a file field of multipart form.
 
     Examples
     --------
@@ -0,0 +1,561 @@
+"""MIT License
+
+Copyright (c) 2023-present gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING
+
+import aiohttp
+from yarl import URL
+
+from .response import BufferedResponse
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from typing import Any, Awaitable, Callable, Optional
+    from typing_extensions import Self
+
+    SendFunction = Callable[..., Awaitable[aiohttp.ClientResponse]]
+
+_log = logging.getLogger(__name__)
+
+CACHEABLE_METHODS = frozenset({aiohttp.hdrs.METH_GET, aiohttp.hdrs.METH_HEAD})
+SAFE_METHODS = frozenset(
+    {aiohttp.hdrs.METH_GET, aiohttp.hdrs.METH_HEAD, aiohttp.hdrs.METH_OPTIONS, aiohttp.hdrs.METH_TRACE}
+)
+# Status codes that are cacheable by default. (RFC 9110, Section 15.1)
+CACHEABLE_STATUS = frozenset({200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501})
+# Headers of `304 Not Modified` response that must not update the stored response.
+_NOT_UPDATED_HEADERS = frozenset({"content-length", "content-encoding", "transfer-encoding", "content-range"})
+
+
+def _parse_cache_control(value: Optional[str]) -> dict[str, Optional[str]]:
+    directives = dict()
+    if not value:
+        return directives
+
+    for directive in value.split(","):
+        name, _, argument = directive.partition("=")
+        name = name.strip().lower()
+        if not name:
+            continue
+        directives[name] = argument.strip().strip('"') or None
+    return directives
+
+
+def _parse_seconds(value: Optional[str]) -> Optional[int]:
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class CacheEntry:
+    """A stored HTTP response.
+
+    Attributes
+    ----------
+    url: str
+        URL of the request.
+    status: int
+        HTTP status code of the response.
+    reason: Optional[str]
+        HTTP status reason of the response.
+    headers: list[tuple[str, str]]
+        HTTP headers of the response.
+    body: bytes
+        Body of the response.
+    request_time: float
+        The time when the request was sent. (UNIX timestamp)
+    response_time: float
+        The time when the response was received. (UNIX timestamp)
+    vary: dict[str, Optional[str]]
+        Request headers selected by the `Vary` response header.
+    """
+
+    __slots__ = ("url", "status", "reason", "headers", "body", "request_time", "response_time", "vary")
+
+    def __init__(
+        self,
+        url: str,
+        status: int,
+        reason: Optional[str],
+        headers: list[tuple[str, str]],
+        body: bytes,
+        request_time: float,
+        response_time: float,
+        vary: Optional[dict[str, Optional[str]]] = None,
+    ):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.request_time = request_time
+        self.response_time = response_time
+        self.vary = vary or dict()
+
+    @property
+    def size(self) -> int:
+        """Approximate size of the entry in bytes."""
+        return len(self.body) + sum(len(key) + len(value) for key, value in self.headers) + len(self.url)
+
+    def get_header(self, name: str) -> Optional[str]:
+        name = name.lower()
+        for key, value in self.headers:
+            if key.lower() == name:
+                return value
+        return None
+
+    def match_vary(self, request_headers: Mapping[str, Any]) -> bool:
+        """Returns whether the request headers are same as the request headers stored with the response.
+
+        Parameters
+        ----------
+        request_headers: Mapping[str, Any]
+            Request headers with lowercase key.
+        """
+        for name, value in self.vary.items():
+            request_value = request_headers.get(name)
+            if (None if request_value is None else str(request_value)) != value:
+                return False
+        return True
+
+    def to_response(self, method: str) -> BufferedResponse:
+        response = BufferedResponse(method, self.url, self.status, self.reason, self.headers, self.body)
+        response.from_cache = True
+        return response
+
+    def to_metadata(self) -> dict[str, Any]:
+        return {
+            "url": self.url,
+            "status": self.status,
+            "reason": self.reason,
+            "headers": self.headers,
+            "request_time": self.request_time,
+            "response_time": self.response_time,
+            "vary": self.vary,
+        }
+
+    @classmethod
+    def from_metadata(cls, metadata: dict[str, Any], body: bytes) -> Self:
+        return cls(
+            metadata["url"],
+            metadata["status"],
+            metadata["reason"],
+            [(key, value) for key, value in metadata["headers"]],
+            body,
+            metadata["request_time"],
+            metadata["response_time"],
+            metadata["vary"],
+        )
+
+
+class CacheBackend(ABC):
+    """Base class of the storage used by :class:`ResponseCache`."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        """Returns the stored entry. If the entry does not exist, returns None."""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        """Store the entry."""
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Delete the stored entry."""
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Delete all stored entries."""
+        pass
+
+    async def close(self) -> None:
+        """Release the resources of backend."""
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """A bounded in-memory LRU storage.
+    When the total size of entries is greater than `max_size`, the least recently used entries are evicted.
+
+    Attributes
+    ----------
+    max_size: int
+        Maximum total size of entries in bytes.
+    """
+
+    def __init__(self, max_size: int = 32 * 1024 * 1024):
+        if max_size <= 0:
+            raise ValueError("max_size must be greater than 0.")
+        self.max_size = max_size
+        self.size = 0
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        await self.delete(key)
+        if entry.size > self.max_size:
+            return
+
+        self._entries[key] = entry
+        self.size += entry.size
+        while self.size > self.max_size:
+            _, evicted_entry = self._entries.popitem(last=False)
+            self.size -= evicted_entry.size
+
+    async def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """A storage in SQLite database. The database can be shared by multiple worker processes.
+    The database operations are executed in a separate thread not to block the event loop.
+
+    Attributes
+    ----------
+    path: str
+        Path of the SQLite database file.
+    max_size: Optional[int]
+        Maximum total size of bodies in bytes. If it is None, the size is unlimited.
+    timeout: float
+        Seconds to wait for the database lock of other processes.
+    """
+
+    def __init__(
+        self, path: str = "ahttp_client_cache.sqlite", *, max_size: Optional[int] = None, timeout: float = 30.0
+    ):
+        if max_size is not None and max_size <= 0:
+            raise ValueError("max_size must be greater than 0.")
+        self.path = path
+        self.max_size = max_size
+        self.timeout = timeout
+
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, metadata TEXT NOT NULL, body BLOB NOT NULL, "
+            "size INTEGER NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        return connection
+
+    def _run(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        with self._lock:
+            if self._connection is None:
+                self._connection = self._connect()
+            return func(self._connection)
+
+    async def _execute(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        return await asyncio.to_thread(self._run, func)
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        def _get(connection: sqlite3.Connection) -> Optional[tuple[str, bytes]]:
+            row = connection.execute("SELECT metadata, body FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            return row
+
+        row = await self._execute(_get)
+        if row is None:
+            return None
+        metadata, body = row
+        return CacheEntry.from_metadata(json.loads(metadata), bytes(body))
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        if self.max_size is not None and entry.size > self.max_size:
+            return
+
+        metadata = json.dumps(entry.to_metadata())
+
+        def _set(connection: sqlite3.Connection) -> None:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, metadata, body, size, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, metadata, entry.body, entry.size, time.time()),
+            )
+            if self.max_size is None:
+                return
+
+            (total_size,) = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+            if total_size <= self.max_size:
+                return
+
+            evicted_keys = []
+            for evicted_key, size in connection.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+                if total_size <= self.max_size:
+                    break
+                evicted_keys.append((evicted_key,))
+                total_size -= size
+            connection.executemany("DELETE FROM responses WHERE key = ?", evicted_keys)
+
+        await self._execute(_set)
+
+    async def delete(self, key: str) -> None:
+        await self._execute(lambda connection: connection.execute("DELETE FROM responses WHERE key = ?", (key,)))
+
+    async def clear(self) -> None:
+        await self._execute(lambda connection: connection.execute("DELETE FROM responses"))
+
+    async def close(self) -> None:
+        def _close(_) -> None:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+        await self._execute(_close)
+
+
+class ResponseCache:
+    """A private HTTP cache following `Cache-Control`, `Expires`, `ETag` and `Last-Modified`.
+    A fresh response is returned from the storage without the HTTP request.
+    A stale response is revalidated with conditional request, and `304 Not Modified` is treated as a hit.
+
+    The caching is enabled per request with the `cache` parameter of :func:`request`.
+
+    Attributes
+    ----------
+    backend: CacheBackend
+        The storage of responses.
+    heuristic_fraction: float
+        When the response doesn't have explicit expiration time,
+        the freshness lifetime is this fraction of the time since `Last-Modified`.
+    max_heuristic_lifetime: float
+        Maximum heuristic freshness lifetime in seconds.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        *,
+        heuristic_fraction: float = 0.1,
+        max_heuristic_lifetime: float = 24 * 60 * 60,
+    ):
+        self.backend = backend or MemoryCacheBackend()
+        self.heuristic_fraction = heuristic_fraction
+        self.max_heuristic_lifetime = max_heuristic_lifetime
+
+    @staticmethod
+    def make_key(method: str, url: URL, params: Optional[Mapping[str, Any]] = None) -> Optional[str]:
+        """Returns the key of response. If the key can't be made, returns None."""
+        if params:
+            try:
+                url = url.extend_query(params)
+            except TypeError:
+                return None
+        return "%s %s" % (method, url)
+
+    def freshness_lifetime(self, entry: CacheEntry) -> float:
+        """Returns the freshness lifetime of the entry in seconds."""
+        cache_control = _parse_cache_control(entry.get_header(aiohttp.hdrs.CACHE_CONTROL))
+        if "no-cache" in cache_control:
+            return 0
+
+        max_age = _parse_seconds(cache_control.get("max-age"))
+        if max_age is not None:
+            return max_age
+
+        date = _parse_http_date(entry.get_header(aiohttp.hdrs.DATE)) or entry.response_time
+        expires = entry.get_header(aiohttp.hdrs.EXPIRES)
+        if expires is not None:
+            # Invalid Expires header (ex. "0") means already expired.
+            return max(0.0, (_parse_http_date(expires) or 0) - date)
+
+        last_modified = _parse_http_date(entry.get_header(aiohttp.hdrs.LAST_MODIFIED))
+        if last_modified is not None:
+            return min(max(0.0, date - last_modified) * self.heuristic_fraction, self.max_heuristic_lifetime)
+        return 0
+
+    @staticmethod
+    def current_age(entry: CacheEntry, now: float) -> float:
+        """Returns the current age of the entry in seconds. (RFC 9111, Section 4.2.3)"""
+        date = _parse_http_date(entry.get_header(aiohttp.hdrs.DATE)) or entry.response_time
+        apparent_age = max(0.0, entry.response_time - date)
+        corrected_age_value = (_parse_seconds(entry.get_header(aiohttp.hdrs.AGE)) or 0) + (
+            entry.response_time - entry.request_time
+        )
+        return max(apparent_age, corrected_age_value) + (now - entry.response_time)
+
+    @staticmethod
+    def is_storable(response: aiohttp.ClientResponse) -> bool:
+        """Returns whether the response can be stored."""
+        if response.status not in CACHEABLE_STATUS:
+            return False
+
+        cache_control = _parse_cache_control(response.headers.get(aiohttp.hdrs.CACHE_CONTROL))
+        if "no-store" in cache_control or response.headers.get(aiohttp.hdrs.VARY, "").strip() == "*":
+            return False
+
+        return any(
+            [
+                "max-age" in cache_control,
+                "no-cache" in cache_control,
+                aiohttp.hdrs.EXPIRES in response.headers,
+                aiohttp.hdrs.ETAG in response.headers,
+                aiohttp.hdrs.LAST_MODIFIED in response.headers,
+            ]
+        )
+
+    async def request(
+        self, send: SendFunction, method: str, url: URL, **request_kwargs
+    ) -> aiohttp.ClientResponse | BufferedResponse:
+        """Returns the response from the storage or the HTTP request.
+
+        Parameters
+        ----------
+        send: Callable[..., Awaitable[aiohttp.ClientResponse]]
+            A coroutine function sending the HTTP request. (ex. `aiohttp.ClientSession.request`)
+        method: str
+            HTTP method (example. GET, POST)
+        url: yarl.URL
+            URL of the request.
+        **request_kwargs
+            Keyword arguments of the `send` function.
+        """
+        key = self.make_key(method, url, request_kwargs.get("params"))
+        if key is None:
+            return await send(method, url, **request_kwargs)
+
+        if method not in CACHEABLE_METHODS:
+            response = await send(method, url, **request_kwargs)
+            # Unsafe method invalidates the stored response of the same URL. (RFC 9111, Section 4.4)
+            if method not in SAFE_METHODS and response.status < 400:
+                await self.backend.delete(self.make_key(aiohttp.hdrs.METH_GET, url, request_kwargs.get("params")))
+            return response
+
+        request_headers = {str(k).lower(): v for k, v in (request_kwargs.get("headers") or {}).items()}
+        request_cache_control = _parse_cache_control(request_headers.get("cache-control"))
+        if "no-store" in request_cache_control:
+            return await send(method, url, **request_kwargs)
+
+        entry = await self.backend.get(key)
+        if entry is not None and not entry.match_vary(request_headers):
+            entry = None
+
+        if entry is not None and "no-cache" not in request_cache_control:
+            current_age = self.current_age(entry, time.time())
+            max_age = _parse_seconds(request_cache_control.get("max-age"))
+            if current_age < self.freshness_lifetime(entry) and (max_age is None or current_age <= max_age):
+                _log.debug("Cache Hit: [%s] %s" % (method, url))
+                return entry.to_response(method)
+
+        if entry is not None:
+            etag = entry.get_header(aiohttp.hdrs.ETAG)
+            last_modified = entry.get_header(aiohttp.hdrs.LAST_MODIFIED)
+            if etag is not None or last_modified is not None:
+                conditional_headers = dict(request_kwargs.get("headers") or {})
+                if etag is not None:
+                    conditional_headers[aiohttp.hdrs.IF_NONE_MATCH] = etag
+                if last_modified is not None:
+                    conditional_headers[aiohttp.hdrs.IF_MODIFIED_SINCE] = last_modified
+                request_kwargs["headers"] = conditional_headers
+
+        request_time = time.time()
+        response = await send(method, url, **request_kwargs)
+        response_time = time.time()
+
+        if response.status == 304 and entry is not None:
+            _log.debug("Cache Revalidated: [%s] %s" % (method, url))
+            response.release()
+            # The headers describing the payload of 304 response don't replace the stored headers.
+            updated_headers = [
+                (key, value) for key, value in response.headers.items() if key.lower() not in _NOT_UPDATED_HEADERS
+            ]
+            updated_names = {key.lower() for key, _ in updated_headers}
+            entry.headers = [
+                (key, value) for key, value in entry.headers if key.lower() not in updated_names
+            ] + updated_headers
+            entry.request_time = request_time
+            entry.response_time = response_time
+            await self.backend.set(key, entry)
+            return entry.to_response(method)
+
+        if self.is_storable(response):
+            body = await response.read()
+            vary = dict()
+            for name in response.headers.get(aiohttp.hdrs.VARY, "").split(","):
+                name = name.strip().lower()
+                if not name:
+                    continue
+                vary[name] = None if request_headers.get(name) is None else str(request_headers.get(name))
+
+            entry = CacheEntry(
+                str(response.url),
+                response.status,
+                response.reason,
+                [(key, value) for key, value in response.headers.items()],
+                body,
+                request_time,
+                response_time,
+                vary,
+            )
+            await self.backend.set(key, entry)
+        return response
+
+    async def clear(self) -> None:
+        """Delete all stored responses."""
+        await self.backend.clear()
+
+    async def close(self) -> None:
+        """Release the resources of backend."""
+        await self.backend.close()
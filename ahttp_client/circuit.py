@@ -0,0 +1,361 @@
+"""MIT License
+
+Copyright (c) 2023-present gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import enum
+import inspect
+import logging
+import time
+from typing import TYPE_CHECKING
+
+import aiohttp
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Hashable
+    from typing import Any, Awaitable, Callable, Literal, Optional
+
+    from yarl import URL
+
+    from .response import BufferedResponse
+
+    SendFunction = Callable[..., Awaitable[aiohttp.ClientResponse | BufferedResponse]]
+    StateChangeCallback = Callable[[Hashable, "CircuitState", "CircuitState"], Any]
+
+_log = logging.getLogger(__name__)
+
+FAILURE_STATUSES = frozenset({500, 502, 503, 504})
+FAILURE_EXCEPTIONS = (aiohttp.ClientError, asyncio.TimeoutError)
+
+
+class CircuitState(enum.Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """An exception raised when the request is rejected by the open circuit.
+
+    Attributes
+    ----------
+    key: Hashable
+        The key of circuit. (The name of request or the host)
+    state: CircuitState
+        The state of circuit.
+    retry_after: float
+        Seconds until the circuit becomes half-open.
+    """
+
+    def __init__(self, key: Hashable, state: CircuitState, retry_after: float):
+        self.key = key
+        self.state = state
+        self.retry_after = retry_after
+        super().__init__("Circuit '%s' is %s. (retry after %.3f seconds)" % (key, state.value, retry_after))
+
+
+class _Circuit:
+    __slots__ = (
+        "state",
+        "generation",
+        "opened_at",
+        "probes",
+        "probe_successes",
+        "seconds",
+        "calls",
+        "failures",
+        "slow_calls",
+    )
+
+    def __init__(self, window: int):
+        self.state = CircuitState.CLOSED
+        # It is increased when the state is changed. A call is recorded only in the state it was admitted.
+        self.generation = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.probe_successes = 0
+
+        # Rolling window of one second buckets.
+        self.seconds = [0] * window
+        self.calls = [0] * window
+        self.failures = [0] * window
+        self.slow_calls = [0] * window
+
+    def reset(self) -> None:
+        window = len(self.seconds)
+        self.seconds = [0] * window
+        self.calls = [0] * window
+        self.failures = [0] * window
+        self.slow_calls = [0] * window
+
+    def record(self, failure: bool, slow: bool) -> None:
+        second = int(time.monotonic())
+        index = second % len(self.seconds)
+        if self.seconds[index] != second:
+            self.seconds[index] = second
+            self.calls[index] = self.failures[index] = self.slow_calls[index] = 0
+        self.calls[index] += 1
+        self.failures[index] += failure
+        self.slow_calls[index] += slow
+
+    def totals(self) -> tuple[int, int, int]:
+        oldest = int(time.monotonic()) - len(self.seconds)
+        calls = failures = slow_calls = 0
+        for index, second in enumerate(self.seconds):
+            if second <= oldest:
+                continue
+            calls += self.calls[index]
+            failures += self.failures[index]
+            slow_calls += self.slow_calls[index]
+        return calls, failures, slow_calls
+
+
+class CircuitBreaker:
+    """A circuit breaker failing fast requests to a degraded upstream.
+    It can be attached to :class:`Session` (`circuit_breaker`), or to a request (`circuit_breaker` of decorators).
+
+    The circuit opens when the failure rate or the slow-call rate in the rolling window exceeds the threshold.
+    While the circuit is open, requests raise :class:`CircuitOpenError` without sending.
+    After `open_duration`, the circuit becomes half-open and lets `half_open_probes` requests through.
+    If all probes succeed, the circuit is closed. Otherwise, the circuit opens again.
+
+    Parameters
+    ----------
+    failure_rate_threshold: float
+        Failure rate (0.0 ~ 1.0) to open the circuit.
+    slow_call_rate_threshold: float
+        Slow-call rate (0.0 ~ 1.0) to open the circuit.
+    slow_call_duration: float
+        Seconds regarded as a slow call. The duration is measured until the response headers are received,
+        and it includes waiting for the rate limiters.
+    window: int
+        Length of the rolling window in seconds.
+    minimum_calls: int
+        Minimum number of calls in the window to calculate the rates.
+    open_duration: float
+        Seconds the circuit stays open before it becomes half-open.
+    half_open_probes: int
+        Number of requests let through in the half-open state.
+    failure_statuses: Collection[int]
+        Response statuses regarded as a failure.
+    exceptions: tuple[type[BaseException], ...]
+        Exceptions regarded as a failure.
+    scope: Literal['endpoint', 'host']
+        The unit of circuit. When it is 'endpoint', a circuit is created per request name.
+        When it is 'host', a circuit is created per host.
+    on_state_change: Optional[Callable[[Hashable, CircuitState, CircuitState], Any]]
+        A callback called with the key, the previous state and the new state when the state is changed.
+        See also :meth:`add_listener`.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_rate_threshold: float = 0.5,
+        slow_call_rate_threshold: float = 1.0,
+        slow_call_duration: float = 5.0,
+        window: int = 60,
+        minimum_calls: int = 10,
+        open_duration: float = 30.0,
+        half_open_probes: int = 3,
+        failure_statuses: Collection[int] = FAILURE_STATUSES,
+        exceptions: tuple[type[BaseException], ...] = FAILURE_EXCEPTIONS,
+        scope: Literal["endpoint", "host"] = "endpoint",
+        on_state_change: Optional[StateChangeCallback] = None,
+    ):
+        if not 0 < failure_rate_threshold <= 1 or not 0 < slow_call_rate_threshold <= 1:
+            raise ValueError("The rate thresholds must be greater than 0 and less than or equal to 1.")
+        if window < 1:
+            raise ValueError("window must be greater than or equal to 1.")
+        if minimum_calls < 1 or half_open_probes < 1:
+            raise ValueError("minimum_calls and half_open_probes must be greater than or equal to 1.")
+        if scope not in ("endpoint", "host"):
+            raise ValueError("scope must be one of 'endpoint' or 'host'.")
+
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.window = int(window)
+        self.minimum_calls = minimum_calls
+        self.open_duration = open_duration
+        self.half_open_probes = half_open_probes
+        self.failure_statuses = frozenset(failure_statuses)
+        self.exceptions = tuple(exceptions)
+        self.scope = scope
+
+        self._listeners: list[StateChangeCallback] = list()
+        if on_state_change is not None:
+            self._listeners.append(on_state_change)
+        self._circuits: dict[Hashable, _Circuit] = dict()
+        self._listener_tasks: set[asyncio.Future] = set()
+
+    def add_listener(self, func: StateChangeCallback) -> StateChangeCallback:
+        """A decorator that registers a callback called when the state of circuit is changed.
+        A coroutine function can be registered. It is scheduled as a task.
+
+        Parameters
+        ----------
+        func: Callable[[Hashable, CircuitState, CircuitState], Any]
+            The callback called with the key, the previous state and the new state.
+        """
+        self._listeners.append(func)
+        return func
+
+    def remove_listener(self, func: StateChangeCallback) -> None:
+        """Remove the registered callback."""
+        self._listeners.remove(func)
+
+    def make_key(self, url: Optional[URL] = None, endpoint: Optional[str] = None) -> Hashable:
+        """Returns the key of circuit following the scope."""
+        if self.scope == "host":
+            return url.host if url is not None else None
+        return endpoint
+
+    def _circuit(self, key: Hashable) -> _Circuit:
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = _Circuit(self.window)
+        return circuit
+
+    def state(self, key: Hashable = None) -> CircuitState:
+        """Returns the state of circuit of the key."""
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            return CircuitState.CLOSED
+        if circuit.state == CircuitState.OPEN and time.monotonic() - circuit.opened_at >= self.open_duration:
+            self._transition(key, circuit, CircuitState.HALF_OPEN)
+        return circuit.state
+
+    def _transition(self, key: Hashable, circuit: _Circuit, state: CircuitState) -> None:
+        previous_state = circuit.state
+        if previous_state == state:
+            return
+
+        circuit.state = state
+        circuit.generation += 1
+        circuit.probes = circuit.probe_successes = 0
+        if state == CircuitState.OPEN:
+            circuit.opened_at = time.monotonic()
+        circuit.reset()
+        _log.debug("Circuit State Changed: %s (%s -> %s)" % (key, previous_state.value, state.value))
+
+        for listener in self._listeners:
+            result = listener(key, previous_state, state)
+            if inspect.isawaitable(result):
+                # The reference of task is kept until it is done.
+                task = asyncio.ensure_future(result)
+                self._listener_tasks.add(task)
+                task.add_done_callback(self._listener_done)
+
+    def _listener_done(self, task: asyncio.Future) -> None:
+        self._listener_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            _log.error("Exception in the state listener of circuit breaker", exc_info=task.exception())
+
+    def _before_call(self, key: Hashable) -> tuple[_Circuit, int]:
+        state = self.state(key)
+        circuit = self._circuit(key)
+        if state == CircuitState.CLOSED:
+            return circuit, circuit.generation
+
+        if state == CircuitState.HALF_OPEN and circuit.probes < self.half_open_probes:
+            circuit.probes += 1
+            return circuit, circuit.generation
+
+        retry_after = max(0.0, self.open_duration - (time.monotonic() - circuit.opened_at))
+        raise CircuitOpenError(key, state, retry_after)
+
+    def _after_call(self, key: Hashable, circuit: _Circuit, generation: int, failure: bool, slow: bool) -> None:
+        if circuit.generation != generation:
+            # The state was changed while the call was running. (ex. a call admitted before the circuit opened)
+            return
+
+        if circuit.state == CircuitState.HALF_OPEN:
+            if failure or slow:
+                self._transition(key, circuit, CircuitState.OPEN)
+                return
+            circuit.probe_successes += 1
+            if circuit.probe_successes >= self.half_open_probes:
+                self._transition(key, circuit, CircuitState.CLOSED)
+            return
+
+        circuit.record(failure, slow)
+        calls, failures, slow_calls = circuit.totals()
+        if calls < self.minimum_calls:
+            return
+        if failures / calls >= self.failure_rate_threshold or slow_calls / calls >= self.slow_call_rate_threshold:
+            self._transition(key, circuit, CircuitState.OPEN)
+
+    def reset(self, key: Hashable = None) -> None:
+        """Close the circuit of the key."""
+        circuit = self._circuits.get(key)
+        if circuit is not None:
+            self._transition(key, circuit, CircuitState.CLOSED)
+
+    async def request(
+        self,
+        send: SendFunction,
+        method: str,
+        url: URL,
+        *,
+        endpoint: Optional[str] = None,
+        **request_kwargs,
+    ) -> aiohttp.ClientResponse | BufferedResponse:
+        """Send the HTTP request, if the circuit allows.
+
+        Parameters
+        ----------
+        send: Callable[..., Awaitable[aiohttp.ClientResponse]]
+            A coroutine function sending the HTTP request. (ex. `aiohttp.ClientSession.request`)
+        method: str
+            HTTP method (example. GET, POST)
+        url: yarl.URL
+            URL of the request.
+        endpoint: Optional[str]
+            Name of the request. It is used when the scope is 'endpoint'.
+        **request_kwargs
+            Keyword arguments of the `send` function.
+
+        Raises
+        ------
+        CircuitOpenError
+            The circuit is open, or the probes of half-open circuit are exhausted.
+        """
+        key = self.make_key(url, endpoint)
+        circuit, generation = self._before_call(key)
+        started_at = time.monotonic()
+        try:
+            response = await send(method, url, **request_kwargs)
+        except self.exceptions:
+            self._after_call(key, circuit, generation, True, False)
+            raise
+        except BaseException:
+            # The cancelled call is not a result of the upstream. Return the probe slot.
+            if circuit.generation == generation and circuit.state == CircuitState.HALF_OPEN and circuit.probes > 0:
+                circuit.probes -= 1
+            raise
+
+        slow = time.monotonic() - started_at >= self.slow_call_duration
+        self._after_call(key, circuit, generation, response.status in self.failure_statuses, slow)
+        return response
@@ -0,0 +1,159 @@
+"""MIT License
+
+Copyright (c) 2023-present gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+from collections.abc import Collection
+from typing import TYPE_CHECKING
+
+import aiohttp
+
+from .response import BufferedResponse
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Mapping
+    from typing import Any, Awaitable, Callable, Optional
+
+    from yarl import URL
+
+    SendFunction = Callable[..., Awaitable[aiohttp.ClientResponse | BufferedResponse]]
+
+_log = logging.getLogger(__name__)
+
+COALESCABLE_METHODS = frozenset({aiohttp.hdrs.METH_GET, aiohttp.hdrs.METH_HEAD, aiohttp.hdrs.METH_OPTIONS})
+
+
+class _InFlightRequest:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class RequestCoalescer:
+    """Coalesce identical in-flight requests into a single HTTP request. (Single-flight)
+    The first request (leader) sends the HTTP request, and the identical requests (followers) called
+    while the leader is in flight share the buffered response of the leader.
+
+    The HTTP request runs in a separate task. Therefore, even if the leader is cancelled,
+    the followers receive the response. When every waiter is cancelled, the HTTP request is cancelled.
+    """
+
+    def __init__(self):
+        self._in_flight: dict[Hashable, _InFlightRequest] = dict()
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    @staticmethod
+    def make_key(
+        method: str,
+        url: URL,
+        params: Optional[Mapping[str, Any]] = None,
+        headers: Optional[Mapping[str, Any]] = None,
+        selected_headers: Optional[Collection[str]] = None,
+    ) -> Hashable:
+        """Returns the key of in-flight request.
+
+        Parameters
+        ----------
+        method: str
+            HTTP method (example. GET, POST)
+        url: yarl.URL
+            URL of the request.
+        params: Optional[Mapping[str, Any]]
+            Request parameters.
+        headers: Optional[Mapping[str, Any]]
+            Request headers.
+        selected_headers: Optional[Collection[str]]
+            Header names included in the key. If it is None, all headers are included.
+        """
+        _params = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+        _headers = {str(k).lower(): str(v) for k, v in (headers or {}).items()}
+        if selected_headers is not None:
+            _selected_headers = {name.lower() for name in selected_headers}
+            _headers = {k: v for k, v in _headers.items() if k in _selected_headers}
+        return method, str(url), _params, tuple(sorted(_headers.items()))
+
+    def _discard(self, key: Hashable, in_flight: _InFlightRequest, _: asyncio.Task) -> None:
+        if self._in_flight.get(key) is in_flight:
+            del self._in_flight[key]
+
+    @staticmethod
+    async def _fetch(send: SendFunction, method: str, url: URL, request_kwargs: dict[str, Any]) -> BufferedResponse:
+        response = await send(method, url, **request_kwargs)
+        if isinstance(response, BufferedResponse):
+            return response
+        return await BufferedResponse.from_response(response)
+
+    async def request(
+        self,
+        send: SendFunction,
+        method: str,
+        url: URL,
+        *,
+        selected_headers: Optional[Collection[str]] = None,
+        **request_kwargs,
+    ) -> aiohttp.ClientResponse | BufferedResponse:
+        """Returns the response of the identical in-flight request, or sends a new HTTP request.
+        Only idempotent methods (GET, HEAD, OPTIONS) are coalesced.
+
+        Parameters
+        ----------
+        send: Callable[..., Awaitable[aiohttp.ClientResponse]]
+            A coroutine function sending the HTTP request. (ex. `aiohttp.ClientSession.request`)
+        method: str
+            HTTP method (example. GET, POST)
+        url: yarl.URL
+            URL of the request.
+        selected_headers: Optional[Collection[str]]
+            Header names included in the key. If it is None, all headers are included.
+        **request_kwargs
+            Keyword arguments of the `send` function.
+        """
+        if method not in COALESCABLE_METHODS:
+            return await send(method, url, **request_kwargs)
+
+        key = self.make_key(method, url, request_kwargs.get("params"), request_kwargs.get("headers"), selected_headers)
+        in_flight = self._in_flight.get(key)
+        if in_flight is None:
+            task = asyncio.ensure_future(self._fetch(send, method, url, request_kwargs))
+            in_flight = self._in_flight[key] = _InFlightRequest(task)
+            task.add_done_callback(functools.partial(self._discard, key, in_flight))
+        else:
+            _log.debug("Request Coalesced: [%s] %s" % (method, url))
+
+        in_flight.waiters += 1
+        try:
+            return await asyncio.shield(in_flight.task)
+        except asyncio.CancelledError:
+            if in_flight.waiters == 1 and not in_flight.task.done():
+                # No one waits for the response anymore.
+                in_flight.task.cancel()
+            raise
+        finally:
+            in_flight.waiters -= 1
@@ -0,0 +1,171 @@
+"""MIT License
+
+Copyright (c) 2023-present gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+from typing import TYPE_CHECKING
+
+try:
+    import orjson
+except (ModuleNotFoundError, ImportError):
+    orjson = None
+
+try:
+    import msgspec
+except (ModuleNotFoundError, ImportError):
+    msgspec = None
+
+if TYPE_CHECKING:
+    from typing import Any, Callable, Optional
+
+    import aiohttp
+
+    from .response import BufferedResponse
+
+
+class JsonCodec:
+    """A JSON codec of the session. The body of `BodyJson` or `Body` is encoded to bytes with it,
+    and the JSON bodies of response (ex. NDJSON stream) are decoded from bytes with it.
+
+    The base class uses the `json` module of the standard library.
+    To use another JSON library, override :meth:`encode` and :meth:`decode`.
+
+    Attributes
+    ----------
+    name: str
+        Name of the codec.
+    content_type: str
+        Content-Type of the encoded body.
+
+    Examples
+    --------
+    >>> class MetroAPI(Session):
+    ...     json_codec = OrjsonCodec()
+    ...
+    ...     @request("GET", "/metro/station")
+    ...     async def station_search_with_query(self, response: aiohttp.ClientResponse, name: Query | str):
+    ...         return await self.json_codec.read(response)
+    """
+
+    name: str = "json"
+    content_type: str = "application/json"
+
+    def __repr__(self) -> str:
+        return "<%s name=%s>" % (self.__class__.__name__, self.name)
+
+    def encode(self, obj: Any) -> bytes:
+        """Encode the object to JSON bytes."""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def decode(self, data: bytes | bytearray | memoryview | str) -> Any:
+        """Decode the JSON bytes (or str) to the object."""
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+    async def read(self, response: aiohttp.ClientResponse | BufferedResponse) -> Any:
+        """Read the body of response and decode it. If the body is empty, None is returned.
+        Unlike `response.json()`, the Content-Type of response is not checked."""
+        data = await response.read()
+        if not data.strip():
+            return None
+        return self.decode(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """A JSON codec using `orjson`.
+
+    Parameters
+    ----------
+    option: Optional[int]
+        Option of `orjson.dumps`. (ex. orjson.OPT_NON_STR_KEYS)
+    default: Optional[Callable[[Any], Any]]
+        A function serializing the object which orjson doesn't support.
+    """
+
+    name = "orjson"
+
+    def __init__(self, option: Optional[int] = None, default: Optional[Callable[[Any], Any]] = None):
+        if orjson is None:
+            raise ModuleNotFoundError("orjson is not installed.")
+        self.option = option
+        self.default = default
+
+    def encode(self, obj: Any) -> bytes:
+        return orjson.dumps(obj, default=self.default, option=self.option)
+
+    def decode(self, data: bytes | bytearray | memoryview | str) -> Any:
+        return orjson.loads(data)
+
+
+class MsgspecCodec(JsonCodec):
+    """A JSON codec using `msgspec`.
+
+    Parameters
+    ----------
+    enc_hook: Optional[Callable[[Any], Any]]
+        A function serializing the object which msgspec doesn't support.
+    """
+
+    name = "msgspec"
+
+    def __init__(self, enc_hook: Optional[Callable[[Any], Any]] = None):
+        if msgspec is None:
+            raise ModuleNotFoundError("msgspec is not installed.")
+        self._encoder = msgspec.json.Encoder(enc_hook=enc_hook)
+        self._decoder = msgspec.json.Decoder()
+
+    def encode(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def decode(self, data: bytes | bytearray | memoryview | str) -> Any:
+        return self._decoder.decode(data)
+
+
+@functools.lru_cache(maxsize=None)
+def default_codec() -> JsonCodec:
+    """Returns the default JSON codec using the standard library. The codec is created once and shared.
+    A faster codec is opt-in with :attr:`Session.json_codec`. (See :func:`fastest_codec`)"""
+    return JsonCodec()
+
+
+@functools.lru_cache(maxsize=None)
+def fastest_codec() -> JsonCodec:
+    """Returns the fastest JSON codec installed. (orjson, msgspec, and the standard library in order)
+    The codec is created once and shared.
+
+    orjson is used with `orjson.OPT_NON_STR_KEYS`, so the keys which aren't str are encoded like the standard library.
+    Other objects which the standard library accepts can be rejected. (ex. a subclass of int or tuple)
+
+    Examples
+    --------
+    >>> class MetroAPI(Session):
+    ...     json_codec = fastest_codec()
+    """
+    if orjson is not None:
+        return OrjsonCodec(option=orjson.OPT_NON_STR_KEYS)
+    if msgspec is not None:
+        return MsgspecCodec()
+    return JsonCodec()
@@ -21,9 +21,16 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-from .multiple_hook import multiple_hook
+from .msgspec import (
+    get_msgspec_decoder,
+    get_msgspec_encoder,
+    msgspec_response_model,
+    msgspec_request_model,
+)
+from .multiple_hook import HookChain, get_hook_chain, multiple_hook
 from .pydantic import (
     get_pydantic_response_model,
+    get_type_adapter,
     pydantic_response_model,
     pydantic_request_model,
 )
@@ -0,0 +1,197 @@
+"""MIT License
+
+Copyright (c) 2023-present gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import inspect
+import typing
+from types import GenericAlias, UnionType
+from typing import Annotated, get_args, get_origin, TYPE_CHECKING
+
+from .multiple_hook import multiple_hook
+from ..component import Component
+from ..response import is_response
+
+if TYPE_CHECKING:
+    from typing import Any, Callable, Optional
+
+    from ..request import RequestCore
+    from ..request_state import RequestState
+
+
+def is_model_value(data: Any, model_type: type) -> bool:
+    """Returns whether the data is a model (or a sequence starting with a model)."""
+    if isinstance(data, (list, tuple)):
+        return len(data) > 0 and is_model_value(data[0], model_type)
+    return isinstance(data, model_type)
+
+
+def is_model_annotation(annotation: Any, model_type: type) -> bool:
+    """Returns whether the annotation holds a model. (ex. Model, list[Model], Header | Model)"""
+    if isinstance(annotation, type) and not isinstance(annotation, GenericAlias):
+        return issubclass(annotation, model_type)
+    return any(is_model_annotation(x, model_type) for x in get_args(annotation))
+
+
+def _value_types(annotation: Any) -> list[Any]:
+    """Returns the types of value in the annotation. The components (ex. Header, Body) are excluded."""
+    origin = get_origin(annotation)
+    if origin is Annotated:
+        return _value_types(get_args(annotation)[0])
+    if origin is typing.Union or isinstance(annotation, UnionType):
+        return [x for arg in get_args(annotation) for x in _value_types(arg)]
+    if isinstance(annotation, Component) or (
+        isinstance(annotation, type) and not isinstance(annotation, GenericAlias) and issubclass(annotation, Component)
+    ):
+        return []
+    return [annotation]
+
+
+def _may_be_model(value_type: Any, model_type: type) -> bool:
+    if value_type is typing.Any or value_type is inspect.Parameter.empty:
+        return True
+    if isinstance(value_type, GenericAlias):
+        return get_origin(value_type) in (list, tuple) and any(
+            _may_be_model(x, model_type) for x in get_args(value_type)
+        )
+    if isinstance(value_type, type):
+        # The type is a model, or a base type of model. (ex. object)
+        return issubclass(value_type, model_type) or issubclass(model_type, value_type)
+    # The type can't be resolved. (ex. TypeVar, forward reference)
+    return value_type is not None and value_type is not type(None)
+
+
+def may_hold_model(annotation: Any, model_type: type) -> bool:
+    """Returns whether the annotation can't exclude a model. (ex. Model, Any, Header, Annotated[Any, Body])
+    A component without the type of value (ex. `Header`) can hold any value."""
+    value_types = _value_types(annotation)
+    if len(value_types) == 0:
+        return True
+    return any(_may_be_model(x, model_type) for x in value_types)
+
+
+def resolve_model(func: RequestCore, model: Any) -> Any:
+    """Returns the model of response. If the model is empty, the return annotation of directly response is used.
+    A list model (ex. list[Model]) is unwrapped, because the shape of result follows the response."""
+    _model = model
+    if model is None and func.directly_response:
+        _model = func._signature.return_annotation
+
+    if _model is inspect.Signature.empty or _model is None:
+        raise TypeError("Invalid model type.")
+
+    if isinstance(_model, GenericAlias) and get_origin(_model) is list:
+        _model = get_args(_model)[0]
+    return _model
+
+
+def add_request_model_hook(
+    func: RequestCore,
+    index: Optional[int],
+    model_type: type,
+    encode: Callable[[Any], Optional[bytes]],
+) -> None:
+    """Register a pre-invoke hook encoding the models of headers, parameters and body to JSON.
+
+    The components holding a model are found from the annotations of request at decoration.
+    The components whose annotation can't exclude a model (ex. `Any`, `Header`) are checked at call time.
+    `encode` returns the JSON bytes of a model (or a sequence of models), or None if the data is not a model.
+    """
+    header_names = [
+        *(
+            name
+            for name, parameter in func.header_parameter.items()
+            if may_hold_model(parameter.annotation, model_type)
+        ),
+        *(name for name, value in func.headers.items() if is_model_value(value, model_type)),
+    ]
+    param_names = [
+        *(name for name, parameter in func.query_parameter.items() if may_hold_model(parameter.annotation, model_type)),
+        *(name for name, value in func.params.items() if is_model_value(value, model_type)),
+    ]
+    is_model_body = (
+        func.body_parameter is not None and is_model_annotation(func.body_parameter.annotation, model_type)
+    ) or is_model_value(func.body, model_type)
+    # The annotation of body can't exclude a model. (ex. `Annotated[Any, Body]`) The body is checked at call time.
+    may_be_model_body = (
+        not is_model_body
+        and func.body_parameter is not None
+        and may_hold_model(func.body_parameter.annotation, model_type)
+    )
+
+    @multiple_hook(func.before_hook, index=index)
+    async def wrapper(_, request: RequestState, path: str):
+        # `encode` returns None for the value which isn't a model.
+        for name in header_names:
+            if (encoded_data := encode(request.headers.get(name))) is not None:
+                request.headers[name] = encoded_data.decode()
+
+        for name in param_names:
+            if (encoded_data := encode(request.params.get(name))) is not None:
+                request.params[name] = encoded_data.decode()
+
+        if is_model_body:
+            encoded_data = encode(request.body)
+            if encoded_data is None:
+                # The body isn't a model. (ex. `Body | Model | dict`) Therefore, the body type follows the body.
+                request.body_parameter_type = None
+                return request, path
+        elif may_be_model_body and is_model_value(request.body, model_type):
+            encoded_data = encode(request.body)
+            if encoded_data is None:
+                return request, path
+        else:
+            return request, path
+
+        request.body = encoded_data
+        request.body_parameter_type = "data"
+        if not any(key.lower() == "content-type" for key in request.headers.keys()):
+            request.headers["Content-Type"] = "application/json"
+        return request, path
+
+
+def add_response_model_hook(
+    func: RequestCore,
+    index: Optional[int],
+    decode: Callable[[bytes, bool], Any],
+    convert: Callable[[Any, bool], Any],
+) -> None:
+    """Register a post-invoke hook returning the model of response.
+
+    `decode` is called with the body of response, and whether the body is a JSON array.
+    `convert` is called with the object returned by the previous post-invoke hook, and whether it is a sequence.
+    An empty (or `null`) body returns None.
+    """
+
+    @multiple_hook(func.after_hook, index=index)
+    async def wrapper(_, response: Any):
+        if is_response(response):
+            data = await response.read()
+            stripped = data.strip()
+            if not stripped or stripped == b"null":
+                return None
+            return decode(data, stripped.startswith(b"["))
+
+        if response is None:
+            return None
+        return convert(response, isinstance(response, (list, tuple)))
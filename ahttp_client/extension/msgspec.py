@@ -0,0 +1,218 @@
+"""MIT License
+
+Copyright (c) 2023-present gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import functools
+
+from typing import TypeVar, TYPE_CHECKING
+
+from ._model import add_request_model_hook, add_response_model_hook, is_model_value, resolve_model
+
+if TYPE_CHECKING:
+    from typing import Any, Optional, Callable, Literal
+
+    from ..request import RequestCore
+
+try:
+    import msgspec
+except (ModuleNotFoundError, ImportError):
+    is_msgspec = False
+    StructT = TypeVar("StructT")
+else:
+    is_msgspec = True
+    StructT = TypeVar("StructT", bound=type[msgspec.Struct])
+
+
+@functools.lru_cache(maxsize=None)
+def get_msgspec_decoder(
+    model: Any, strict: bool = True, dec_hook: Optional[Callable[[type, Any], Any]] = None
+) -> msgspec.json.Decoder:
+    """Returns the `msgspec.json.Decoder` of the model. The decoder is created once for each model.
+
+    Parameters
+    ----------
+    model: Any
+        A type supported by msgspec. (ex. msgspec.Struct, list[msgspec.Struct])
+    strict: bool
+        Same feature as parameter of msgspec.json.Decoder named strict.
+    dec_hook: Optional[Callable[[type, Any], Any]]
+        Same feature as parameter of msgspec.json.Decoder named dec_hook.
+    """
+    if not is_msgspec:
+        raise ModuleNotFoundError("msgspec is not installed.")
+    return msgspec.json.Decoder(model, strict=strict, dec_hook=dec_hook)
+
+
+@functools.lru_cache(maxsize=None)
+def get_msgspec_encoder(
+    enc_hook: Optional[Callable[[Any], Any]] = None,
+    order: Optional[Literal["deterministic", "sorted"]] = None,
+) -> msgspec.json.Encoder:
+    """Returns the `msgspec.json.Encoder`. The encoder is created once for each option.
+
+    Parameters
+    ----------
+    enc_hook: Optional[Callable[[Any], Any]]
+        Same feature as parameter of msgspec.json.Encoder named enc_hook.
+    order: Optional[Literal['deterministic', 'sorted']]
+        Same feature as parameter of msgspec.json.Encoder named order.
+    """
+    if not is_msgspec:
+        raise ModuleNotFoundError("msgspec is not installed.")
+    return msgspec.json.Encoder(enc_hook=enc_hook, order=order)
+
+
+def is_msgspec_model(data: Any) -> bool:
+    return is_model_value(data, msgspec.Struct)
+
+
+def _encode_model(data: Any, encoder: msgspec.json.Encoder) -> Optional[bytes]:
+    """Encode a struct (or a sequence of structs) to JSON bytes.
+    If the data is not a struct, None is returned."""
+    if isinstance(data, msgspec.Struct):
+        return encoder.encode(data)
+
+    if isinstance(data, (list, tuple)) and all(isinstance(x, msgspec.Struct) for x in data):
+        return encoder.encode(data)
+    return None
+
+
+def msgspec_request_model(
+    index: Optional[int] = None,
+    *,
+    enc_hook: Optional[Callable[[Any], Any]] = None,
+    order: Optional[Literal["deterministic", "sorted"]] = None,
+):
+    """A decorator that the `request` objects to provide serializing from a msgspec.Struct into JSON.
+
+    The headers, parameters and body holding a `msgspec.Struct` are found
+    from the annotations of the request at decoration. (ex. `Header | Model`, `Body | list[Model]`)
+    At call time, only the found components are encoded to JSON with the cached `msgspec.json.Encoder`.
+    The body is sent as bytes with `application/json` content-type.
+
+    Parameters
+    ----------
+    index : Optional[int]
+        Order of invocation in invoke-hook.
+        The order is recommended to be last after the status check.
+    enc_hook : Optional[Callable[[Any], Any]]
+        Same feature as parameter of msgspec.json.Encoder named enc_hook.
+    order : Optional[Literal['deterministic', 'sorted']]
+        Same feature as parameter of msgspec.json.Encoder named order.
+
+    Warnings
+    --------
+    This feature is experimental. It might not work as expected.
+    And `msgspec` package required.
+    """
+    if not is_msgspec:
+        raise ModuleNotFoundError("msgspec is not installed.")
+
+    encoder = get_msgspec_encoder(enc_hook, order)
+
+    def decorator(func: RequestCore) -> RequestCore:
+        add_request_model_hook(func, index, msgspec.Struct, functools.partial(_encode_model, encoder=encoder))
+        return func
+
+    return decorator
+
+
+def msgspec_response_model(
+    model: Optional[StructT] = None,
+    /,
+    index: Optional[int] = None,
+    *,
+    strict: bool = True,
+    from_attributes: bool = False,
+    dec_hook: Optional[Callable[[type, Any], Any]] = None,
+):
+    """Create a request method to return a msgspec.Struct decoded from the body of response.
+
+    The `msgspec.json.Decoder` of the model is created once at decoration,
+    and the body of response is decoded straight from the bytes. (without `response.json()`)
+    The result follows the shape of response. When the response is a JSON array, a list of the model is returned.
+    Otherwise, the model is returned. (even if the model is `list[Model]`)
+
+    Parameters
+    ----------
+    model: Optional[msgspec.Struct]
+        A type supported by msgspec to decode JSON. A generic type (ex. list[Model]) is allowed.
+        If directly_response enabled and model parameter is empty, model will followed return annotation.
+        However, model parameter is empty, TypeError("Invalid model type.") will be raised.
+    index: Optional[int]
+        Order of invocation in invoke-hook.
+        The order is recommended to be last after the status check.
+    strict: bool
+        Same feature as parameter of msgspec.json.Decoder named strict.
+    from_attributes: bool
+        Same feature as parameter of msgspec.convert method named from_attributes.
+        It is used when the previous post-invoke hook returns an object instead of the response.
+    dec_hook: Optional[Callable[[type, Any], Any]]
+        Same feature as parameter of msgspec.json.Decoder named dec_hook.
+
+    Warnings
+    --------
+    This feature is experimental. It might not work as expected.
+    And `msgspec` package required.
+
+    Examples
+    --------
+    >>> class ResponseModel(msgspec.Struct):
+    ...     name: str
+    ...     id: str
+    ...
+    >>> class MetroAPI(Session):
+    ...    def __init__(self, loop: asyncio.AbstractEventLoop):
+    ...        super().__init__("https://api.yhs.kr", loop=loop)
+    ...
+    ...    @msgspec_response_model()
+    ...    @request("GET", "/metro/station", directly_response=True)
+    ...    async def station_search_with_query(self, name: Query | str) -> ResponseModel:
+    ...        pass
+    """
+    if not is_msgspec:
+        raise ModuleNotFoundError("msgspec is not installed.")
+
+    def decorator(func: RequestCore) -> RequestCore:
+        _model = resolve_model(func, model)
+        decoder = get_msgspec_decoder(_model, strict, dec_hook)
+        # A JSON array is decoded as a list of the model.
+        list_decoder = get_msgspec_decoder(list[_model], strict, dec_hook)
+
+        def decode(data: bytes, is_list: bool) -> Any:
+            return (list_decoder if is_list else decoder).decode(data)
+
+        def convert(obj: Any, is_list: bool) -> Any:
+            return msgspec.convert(
+                obj,
+                list[_model] if is_list else _model,
+                strict=strict,
+                from_attributes=from_attributes,
+                dec_hook=dec_hook,
+            )
+
+        add_response_model_hook(func, index, decode, convert)
+        return func
+
+    return decorator
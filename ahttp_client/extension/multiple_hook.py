@@ -23,14 +23,16 @@ SOFTWARE.
 
 from __future__ import annotations
 
-import aiohttp
+import bisect
+import itertools
+import math
 from typing import TYPE_CHECKING, TypeVar
 
 T = TypeVar("T")
 
 if TYPE_CHECKING:
     from abc import ABC, abstractmethod
-    from typing import Callable, Generic, Optional
+    from typing import Any, Callable, Generic, Optional
     from .._types import RequestAfterHookFunction, RequestBeforeHookFunction
     from ..query import Query
     from ..request import RequestCore, request
@@ -51,6 +53,138 @@ if TYPE_CHECKING:
     MultipleHookT = BoundedMethod[T, CallableT, CallableR] | Callable[[CallableT], CallableR]
 
 
+class HookChain:
+    """A chain of hooks registered with :func:`multiple_hook`.
+    The chain is sorted when a hook is registered, and it is composed into a single coroutine.
+    The composed coroutine is registered as the hook of the request.
+
+    When the chain has only one hook, the hook is registered directly.
+    When the chain is empty, the hook of the request is removed. (No cost for calling the request)
+
+    Attributes
+    ----------
+    name: str
+        Name of the hook. (`before_hook` or `after_hook`)
+    """
+
+    def __init__(self, hook: MultipleHookT):
+        self.name: str = hook.__name__
+        self._instance = hook.__self__
+        self._register = hook.__func__
+
+        # Entries are kept in the order of (index, registration).
+        self._entries: list[tuple[float, int, Callable[..., Any], Optional[int]]] = list()
+        self._counter = itertools.count()
+
+    def __repr__(self) -> str:
+        return "<HookChain name=%s hooks=%r>" % (self.name, self.hooks)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self.hooks)
+
+    def __contains__(self, func: Any) -> bool:
+        return any(entry[2] is func for entry in self._entries)
+
+    @property
+    def hooks(self) -> list[Callable[..., Any]]:
+        """Hooks in the order of invocation."""
+        return [func for _, _, func, _ in self._entries]
+
+    @property
+    def order(self) -> list[tuple[Optional[int], Callable[..., Any]]]:
+        """Pairs of the index and the hook in the order of invocation."""
+        return [(index, func) for _, _, func, index in self._entries]
+
+    def add(self, func: Callable[..., Any], index: Optional[int] = -1) -> None:
+        """Add the hook to the chain. A hook without index (None) is invoked after the hooks with index.
+        Hooks with the same index are invoked in the order of registration."""
+        sort_key = math.inf if index is None else index
+        bisect.insort(self._entries, (sort_key, next(self._counter), func, index), key=lambda x: (x[0], x[1]))
+        self._compile()
+
+    def remove(self, func: Callable[..., Any]) -> None:
+        """Remove the hook from the chain.
+
+        Raises
+        ------
+        ValueError
+            The hook is not in the chain.
+        """
+        for position, entry in enumerate(self._entries):
+            if entry[2] is func:
+                del self._entries[position]
+                break
+        else:
+            raise ValueError("%r is not in the hook chain." % func)
+        self._compile()
+
+    def clear(self) -> None:
+        """Remove all hooks from the chain."""
+        self._entries.clear()
+        self._compile()
+
+    def _compile(self) -> None:
+        hooks = tuple(self.hooks)
+        if len(hooks) == 0:
+            setattr(self._instance, "_%s" % self.name, None)
+            return
+
+        if len(hooks) == 1:
+            self._register(self._instance, hooks[0])
+            return
+
+        if self.name == "after_hook":
+
+            async def composed_hook(session, response):
+                for func in hooks:
+                    response = await func(session, response)
+                return response
+
+        else:
+
+            async def composed_hook(session, *args):
+                for func in hooks:
+                    args = await func(session, *args)
+                return args
+
+        self._register(self._instance, composed_hook)
+
+
+def get_hook_chain(
+    hook: MultipleHookT[
+        RequestCore,
+        (RequestAfterHookFunction | RequestBeforeHookFunction),
+        RequestAfterHookFunction | RequestBeforeHookFunction,
+    ],
+) -> HookChain:
+    """Returns the :class:`HookChain` of the hook. If it does not exist, a new chain is created.
+
+    Parameters
+    ----------
+    hook: Callable[
+            (RequestAfterHookFunction | RequestBeforeHookFunction),
+            RequestAfterHookFunction | RequestBeforeHookFunction
+        ]
+        This can be :meth:`RequestObj.before_hook` or :meth:`RequestObj.after_hook`.
+
+    Examples
+    --------
+    >>> chain = get_hook_chain(MetroAPI.station_search_with_query.before_hook)
+    >>> chain.hooks
+    [<function MetroAPI.before_hook_1 at ...>, <function MetroAPI.before_hook_2 at ...>]
+    >>> chain.remove(MetroAPI.before_hook_2)
+    """
+    attribute_name = "__multiple_%s__" % hook.__name__
+    chain = getattr(hook.__self__, attribute_name, None)
+    if chain is None:
+        chain = HookChain(hook)
+        setattr(hook.__self__, attribute_name, chain)
+    return chain
+
+
 def multiple_hook(
     hook: MultipleHookT[
         RequestCore,
@@ -70,7 +204,8 @@ def multiple_hook(
         Contains the decorator function used for hooking.
         This can be :meth:`RequestObj.before_hook` or :meth:`RequestObj.after_hook`.
     index: Optional[int]
-        Order of invocation in invoke-hook
+        Order of invocation in invoke-hook. The hooks are invoked in ascending order of index.
+        If it is None, the hook is invoked after the hooks with index.
 
     Warnings
     --------
@@ -100,26 +235,10 @@ def multiple_hook(
     ...        # Set-up before request
     ...        return obj, path
     """
-    hook_name = hook.__name__
-    instance = hook.__self__
-
-    is_exist_multiple_hook = True
-    if not hasattr(instance, "__multiple_%s__" % hook_name):
-        is_exist_multiple_hook = False
-        setattr(instance, "__multiple_%s__" % hook_name, [])
+    chain = get_hook_chain(hook)
 
     def decorator(func):
-        getattr(instance, "__multiple_%s__" % hook_name).append((func, index))
+        chain.add(func, index)
         return func
 
-    async def wrapper(wrapped_instance, *args):
-        _args = tuple(args)
-        multiple_hook_func = getattr(instance, "__multiple_%s__" % hook_name)
-        sorted_multiple_hook_func = sorted(multiple_hook_func, key=lambda x: x[1])
-        for func, _ in sorted_multiple_hook_func:
-            _args = await func(wrapped_instance, *_args)
-        return _args
-
-    if not is_exist_multiple_hook:
-        hook.__func__(instance, wrapper)
     return decorator
@@ -23,14 +23,11 @@ SOFTWARE.
 
 from __future__ import annotations
 
-import inspect
-import aiohttp
+import functools
 
-from collections.abc import Sequence
-from typing import overload, TypeVar, TYPE_CHECKING
+from typing import TypeVar, TYPE_CHECKING
 
-from .multiple_hook import multiple_hook
-from ..utils import *
+from ._model import add_request_model_hook, add_response_model_hook, is_model_value, resolve_model
 
 if TYPE_CHECKING:
     import asyncio
@@ -39,6 +36,7 @@ if TYPE_CHECKING:
 
     from ..query import Query
     from ..request import RequestCore, request
+    from ..request_state import RequestState
     from ..session import Session
 
 try:
@@ -51,145 +49,33 @@ else:
     BaseModelT = TypeVar("BaseModelT", bound=type[pydantic.BaseModel])
 
 
-@overload
-def _parsing_json_to_model(
-    data: list[Any],
-    model: type[BaseModelT],
-    /,
-    *,
-    strict: Optional[bool] = None,
-    from_attributes: Optional[bool] = None,
-    context: Optional[Any] = None,
-    by_alias: Optional[bool] = False,
-    by_name: Optional[bool] = False,
-) -> Optional[list[BaseModelT]]: ...
-
-
-@overload
-def _parsing_json_to_model(
-    data: dict[Any, ...],
-    model: type[BaseModelT],
-    /,
-    *,
-    strict: Optional[bool] = None,
-    from_attributes: Optional[bool] = None,
-    context: Optional[Any] = None,
-    by_alias: Optional[bool] = False,
-    by_name: Optional[bool] = False,
-) -> Optional[BaseModelT]: ...
-
-
-def _parsing_json_to_model(
-    data: dict[Any, ...] | list[Any],
-    model: type[BaseModelT],
-    *,
-    strict: Optional[bool] = None,
-    from_attributes: Optional[bool] = None,
-    context: Optional[Any] = None,
-    by_alias: Optional[bool] = False,
-    by_name: Optional[bool] = False,
-) -> Optional[BaseModelT | list[BaseModelT]]:
-    if isinstance(data, Sequence):
-        validated_data = [
-            model.model_validate(
-                obj=x,
-                strict=strict,
-                from_attributes=from_attributes,
-                context=context,
-                by_alias=by_alias,
-                by_name=by_name,
-            )
-            for x in data
-        ]
-    elif isinstance(data, type(None)):
-        return None
-    else:
-        validated_data = model.model_validate(
-            obj=data,
-            strict=strict,
-            from_attributes=from_attributes,
-            context=context,
-            by_alias=by_alias,
-            by_name=by_name,
-        )
-    return validated_data
-
-
-@overload
-def _parsing_model_to_json(
-    data: Optional[list[BaseModelT]],
-    /,
-    *,
-    by_alias: bool | None = None,
-    exclude_unset: bool = False,
-    exclude_defaults: bool = False,
-    exclude_none: bool = False,
-    exclude_computed_fields: bool = False,
-    context: Optional[Any] = None,
-    fallback: Optional[Callable[[Any], Any]] = None,
-) -> Optional[list[dict[str, Any]]]: ...
+@functools.lru_cache(maxsize=None)
+def get_type_adapter(model: Any) -> pydantic.TypeAdapter:
+    """Returns the `pydantic.TypeAdapter` of the model. The adapter is created once for each model.
 
+    Parameters
+    ----------
+    model: Any
+        A type supported by pydantic. (ex. pydantic.BaseModel, list[pydantic.BaseModel])
+    """
+    if not is_pydantic:
+        raise ModuleNotFoundError("pydantic is not installed.")
+    return pydantic.TypeAdapter(model)
 
-@overload
-def _parsing_model_to_json(
-    data: Optional[BaseModelT],
-    /,
-    *,
-    by_alias: bool | None = None,
-    exclude_unset: bool = False,
-    exclude_defaults: bool = False,
-    exclude_none: bool = False,
-    exclude_computed_fields: bool = False,
-    context: Optional[Any] = None,
-    fallback: Optional[Callable[[Any], Any]] = None,
-) -> Optional[dict[str, Any]]: ...
 
+def is_pydantic_model(data: Any) -> bool:
+    return is_model_value(data, pydantic.BaseModel)
 
-def _parsing_model_to_json(
-    data: Optional[BaseModelT | list[BaseModelT]],
-    /,
-    *,
-    by_alias: bool | None = None,
-    exclude_unset: bool = False,
-    exclude_defaults: bool = False,
-    exclude_none: bool = False,
-    exclude_computed_fields: bool = False,
-    context: Optional[Any] = None,
-    fallback: Optional[Callable[[Any], Any]] = None,
-) -> Optional[dict[str, Any] | list[dict[str, Any]]]:
-    if isinstance(data, (list, tuple)):
-        dumped_data = [
-            _parsing_model_to_json(
-                x,
-                by_alias=by_alias,
-                exclude_unset=exclude_unset,
-                exclude_defaults=exclude_defaults,
-                exclude_none=exclude_none,
-                exclude_computed_fields=exclude_computed_fields,
-                context=context,
-                fallback=fallback,
-            )
-            for x in data
-        ]
-    elif isinstance(data, type(None)):
-        return None
-    else:
-        dumped_data = data.model_dump(
-            by_alias=by_alias,
-            exclude_unset=exclude_unset,
-            exclude_defaults=exclude_defaults,
-            exclude_none=exclude_none,
-            exclude_computed_fields=exclude_computed_fields,
-            context=context,
-            fallback=fallback,
-        )
-    return dumped_data
 
+def _dump_model_json(data: Any, **options) -> Optional[bytes]:
+    """Serialize a model (or a sequence of models) to JSON bytes.
+    If the data is not a model, None is returned."""
+    if isinstance(data, pydantic.BaseModel):
+        return get_type_adapter(type(data)).dump_json(data, **options)
 
-def is_pydantic_model(data: Any) -> bool:
-    if isinstance(data, (list, tuple)):
-        return is_pydantic_model(data[0])
-    return isinstance(data, pydantic.BaseModel)
+    if isinstance(data, (list, tuple)) and all(isinstance(x, pydantic.BaseModel) for x in data):
+        return b"[%s]" % b",".join(get_type_adapter(type(x)).dump_json(x, **options) for x in data)
+    return None
 
 
 def pydantic_request_model(
@@ -203,7 +89,12 @@ def pydantic_request_model(
     context: Optional[Any] = None,
     fallback: Optional[Callable[[Any], Any]] = None,
 ):
-    """A decorator that the `request` objects to provide parsing from raw data into a pydantic model.
+    """A decorator that the `request` objects to provide serializing from a pydantic model into JSON.
+
+    The headers, parameters and body holding a pydantic model are found
+    from the annotations of the request at decoration. (ex. `Header | Model`, `Body | list[Model]`)
+    At call time, only the found components are serialized to JSON with `pydantic.TypeAdapter.dump_json`.
+    The body is sent as bytes with `application/json` content-type. (without the second encoding of aiohttp)
 
     Parameters
     ----------
@@ -211,74 +102,35 @@ def pydantic_request_model(
         Order of invocation in invoke-hook.
         The order is recommended to be last after the status check.
     by_alias : bool | None
-        Same feature as parameter of pydantic.BaseModel.model_dump method named by_alias.
+        Same feature as parameter of pydantic.BaseModel.model_dump_json method named by_alias.
     exclude_unset : bool
-        Same feature as parameter of pydantic.BaseModel.model_dump method named exclude_unset.
+        Same feature as parameter of pydantic.BaseModel.model_dump_json method named exclude_unset.
     exclude_defaults : bool
-        Same feature as parameter of pydantic.BaseModel.model_dump method named exclude_defaults.
+        Same feature as parameter of pydantic.BaseModel.model_dump_json method named exclude_defaults.
     exclude_none : bool
-        Same feature as parameter of pydantic.BaseModel.model_dump method named exclude_none.
+        Same feature as parameter of pydantic.BaseModel.model_dump_json method named exclude_none.
     exclude_computed_fields : bool
-        Same feature as parameter of pydantic.BaseModel.model_dump method named exclude_computed_fields.
+        Same feature as parameter of pydantic.BaseModel.model_dump_json method named exclude_computed_fields.
     context : Optional[dict[str, Any]]
-        Same feature as parameter of pydantic.BaseModel.model_dump method named context.
+        Same feature as parameter of pydantic.BaseModel.model_dump_json method named context.
     fallback : Optional[Callable[[Any], Any]]
-        Same feature as parameter of pydantic.BaseModel.model_dump method named fallback.
+        Same feature as parameter of pydantic.BaseModel.model_dump_json method named fallback.
     """
     if not is_pydantic:
         raise ModuleNotFoundError("pydantic is not installed.")
 
-    def decorator(func: RequestCore) -> RequestCore:
-        # If the Pydantic model is serialized, the body parameter type must be json, and all others must be data.
-        # Therefore, as the argument state is abstract, it was defined as None.
-        if func.body_parameter is not None:
-            func.body_parameter_type = None
-
-        @multiple_hook(func.before_hook, index=index)
-        async def wrapper(_, request: RequestCore, path: str):
-            for name, value in request.headers.items():
-                if not is_pydantic_model(value):
-                    continue
-
-                request.headers[name] = _parsing_model_to_json(
-                    value,
-                    by_alias=by_alias,
-                    exclude_unset=exclude_unset,
-                    exclude_defaults=exclude_defaults,
-                    exclude_none=exclude_none,
-                    exclude_computed_fields=exclude_computed_fields,
-                    context=context,
-                    fallback=fallback,
-                ).__str__()  # noqa
-
-            for name, value in request.params.items():
-                if not is_pydantic_model(value):
-                    continue
-                request.params[name] = _parsing_model_to_json(
-                    value,
-                    by_alias=by_alias,
-                    exclude_unset=exclude_unset,
-                    exclude_defaults=exclude_defaults,
-                    exclude_none=exclude_none,
-                    exclude_computed_fields=exclude_computed_fields,
-                    context=context,
-                    fallback=fallback,
-                ).__str__()
-
-            if is_pydantic_model(request.body):
-                request.body_parameter_type = "json"
-                request.body = _parsing_model_to_json(
-                    request.body,
-                    by_alias=by_alias,
-                    exclude_unset=exclude_unset,
-                    exclude_defaults=exclude_defaults,
-                    exclude_none=exclude_none,
-                    exclude_computed_fields=exclude_computed_fields,
-                    context=context,
-                    fallback=fallback,
-                )
-            return request, path
+    options = dict(
+        by_alias=by_alias,
+        exclude_unset=exclude_unset,
+        exclude_defaults=exclude_defaults,
+        exclude_none=exclude_none,
+        exclude_computed_fields=exclude_computed_fields,
+        context=context,
+        fallback=fallback,
+    )
 
+    def decorator(func: RequestCore) -> RequestCore:
+        add_request_model_hook(func, index, pydantic.BaseModel, functools.partial(_dump_model_json, **options))
         return func
 
     return decorator
@@ -297,30 +149,37 @@ def pydantic_response_model(
 ):
     """Create a request method to return a model extended by pydantic.BaseModel
 
+    The `pydantic.TypeAdapter` of the model is created once at decoration,
+    and the body of response is validated straight from the bytes. (without `response.json()`)
+    The result follows the shape of response. When the response is a JSON array, a list of the model is returned.
+    Otherwise, the model is returned. (even if the model is `list[Model]`)
+
     Parameters
     ----------
     model: Optional[pydantic.BaseModel]
-        A model extended by pydantic.BaseModel to parse JSON.
+        A model extended by pydantic.BaseModel to parse JSON. A generic type (ex. list[Model]) is allowed.
         If directly_response enabled and model parameter is empty, model will followed return annotation.
         However, model parameter is empty, TypeError("Invalid model type.") will be raised.
     index: Optional[int]
         Order of invocation in invoke-hook.
         The order is recommended to be last after the status check.
     strict: Optional[bool]
-        Same feature as parameter of pydantic.BaseModel.model_validate method named strict.
+        Same feature as parameter of pydantic.TypeAdapter.validate_json method named strict.
     from_attributes: Optional[bool]
-        Same feature as parameter of pydantic.BaseModel.model_validate method named from_attributes.
+        Same feature as parameter of pydantic.TypeAdapter.validate_python method named from_attributes.
+        It is used when the previous post-invoke hook returns an object instead of the response.
     context: Optional[Any]
-        Same feature as parameter of pydantic.BaseModel.model_validate method named context.
+        Same feature as parameter of pydantic.TypeAdapter.validate_json method named context.
     by_alias: Optional[bool]
-        Same feature as parameter of pydantic.BaseModel.model_validate method named by_alias.
+        Same feature as parameter of pydantic.TypeAdapter.validate_json method named by_alias.
+        If both `by_alias` and `by_name` are False, the configuration of model is used.
     by_name: Optional[bool]
-        Same feature as parameter of pydantic.BaseModel.model_validate method named by_name.
+        Same feature as parameter of pydantic.TypeAdapter.validate_json method named by_name.
 
     Warnings
     --------
     This feature is experimental. It might not work as expected.
-    And `pydatnic` pacakge required.
+    And `pydantic` package required.
 
     Examples
     --------
@@ -345,34 +204,25 @@ def pydantic_response_model(
         raise ModuleNotFoundError("pydantic is not installed.")
 
     def decorator(func: RequestCore) -> BaseModelT:
-        _model = model
-        if model is None and func.directly_response:
-            _model = func._signature.return_annotation
-
-        if _model is inspect.Signature.empty or _model is None:
-            raise TypeError("Invalid model type.")
-
-        if isinstance(_model, GenericAlias):
-            _model = _model.__args__[0]
-
-        @multiple_hook(func.after_hook, index=index)
-        async def wrapper(_, response: dict[str, Any] | aiohttp.ClientResponse):
-            if isinstance(response, aiohttp.ClientResponse):
-                data = await response.json()
-            else:
-                data = response
-
-            result = _parsing_json_to_model(
-                data,
-                _model,
-                strict=strict,
-                from_attributes=from_attributes,
-                context=context,
-                by_alias=by_alias,
-                by_name=by_name,
+        _model = resolve_model(func, model)
+        adapter = get_type_adapter(_model)
+        # A JSON array is validated as a list of the model.
+        list_adapter = get_type_adapter(list[_model])
+        if not by_alias and not by_name:
+            # pydantic rejects that both are False.
+            options = dict(strict=strict, context=context)
+        else:
+            options = dict(strict=strict, context=context, by_alias=by_alias, by_name=by_name)
+
+        def decode(data: bytes, is_list: bool) -> Any:
+            return (list_adapter if is_list else adapter).validate_json(data, **options)
+
+        def convert(obj: Any, is_list: bool) -> Any:
+            return (list_adapter if is_list else adapter).validate_python(
+                obj, from_attributes=from_attributes, **options
             )
-            return result
 
+        add_response_model_hook(func, index, decode, convert)
         return func
 
     return decorator
@@ -0,0 +1,251 @@
+"""MIT License
+
+Copyright (c) 2023-present gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from typing import TYPE_CHECKING
+
+from .payload import is_replayable_body
+from .retry import IDEMPOTENT_METHODS, RetryBudget
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Hashable
+    from typing import Awaitable, Callable, Optional
+
+    import aiohttp
+    from yarl import URL
+
+    from .response import BufferedResponse
+
+    SendFunction = Callable[..., Awaitable[aiohttp.ClientResponse | BufferedResponse]]
+
+_log = logging.getLogger(__name__)
+
+
+class LatencyWindow:
+    """A fixed size window of recent latencies to estimate the percentile.
+
+    Parameters
+    ----------
+    size: int
+        Number of recent latencies kept.
+    """
+
+    # The percentile is sorted again after this number of records.
+    _REFRESH_INTERVAL = 16
+
+    def __init__(self, size: int = 256):
+        if size < 1:
+            raise ValueError("size must be greater than or equal to 1.")
+        self.size = size
+        self._samples: list[float] = list()
+        self._index = 0
+        self._sorted: Optional[list[float]] = None
+        self._records_since_sort = 0
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, latency: float) -> None:
+        if len(self._samples) < self.size:
+            self._samples.append(latency)
+        else:
+            self._samples[self._index] = latency
+            self._index = (self._index + 1) % self.size
+
+        self._records_since_sort += 1
+        if self._records_since_sort >= self._REFRESH_INTERVAL:
+            self._sorted = None
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """Returns the latency at the percentile (0.0 ~ 1.0). If no latency is recorded, it returns None."""
+        if not self._samples:
+            return None
+        if self._sorted is None or len(self._sorted) == 0:
+            self._sorted = sorted(self._samples)
+            self._records_since_sort = 0
+        index = min(len(self._sorted) - 1, max(0, math.ceil(percentile * len(self._sorted)) - 1))
+        return self._sorted[index]
+
+
+class HedgePolicy:
+    """A policy sending hedged requests to cut the tail latency.
+    If the response isn't returned until the delay, an identical request is sent,
+    and the first response is returned. The other requests are cancelled and released.
+
+    Parameters
+    ----------
+    delay: Optional[float]
+        Seconds to wait before sending a hedged request.
+        If it is None, the delay is the `percentile` latency of the request. (The delay is tracked per request name)
+    percentile: float
+        Percentile (0.0 ~ 1.0) of the tracked latency used as the delay.
+    min_samples: int
+        Number of latencies required before hedging with the tracked delay.
+    max_hedges: int
+        Maximum number of hedged requests of one call.
+    budget: Optional[RetryBudget]
+        The budget limiting the ratio of hedged requests to requests.
+        If it is None, 10% of requests (at least 5 in ten seconds) can be hedged.
+    methods: Collection[str]
+        HTTP methods to hedge. Only idempotent methods should be hedged.
+
+    Examples
+    --------
+    >>> class MetroAPI(Session):
+    ...     @request("GET", "/bus/station", hedge_policy=HedgePolicy(percentile=0.95))
+    ...     async def station_query(self, name: Query | str) -> aiohttp.ClientResponse:
+    ...         pass
+    """
+
+    def __init__(
+        self,
+        delay: Optional[float] = None,
+        *,
+        percentile: float = 0.95,
+        min_samples: int = 20,
+        max_hedges: int = 1,
+        budget: Optional[RetryBudget] = None,
+        methods: Collection[str] = IDEMPOTENT_METHODS,
+    ):
+        if delay is not None and delay < 0:
+            raise ValueError("delay must be greater than or equal to 0.")
+        if not 0 < percentile <= 1:
+            raise ValueError("percentile must be greater than 0 and less than or equal to 1.")
+        if max_hedges < 1:
+            raise ValueError("max_hedges must be greater than or equal to 1.")
+
+        self.delay = delay
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.max_hedges = max_hedges
+        self.budget = budget if budget is not None else RetryBudget(ratio=0.1, min_retries=5)
+        self.methods = frozenset(method.upper() for method in methods)
+
+        self._latencies: dict[Hashable, LatencyWindow] = dict()
+
+    def latency(self, endpoint: Hashable) -> LatencyWindow:
+        """Returns the tracked latencies of the request name."""
+        window = self._latencies.get(endpoint)
+        if window is None:
+            window = self._latencies[endpoint] = LatencyWindow()
+        return window
+
+    def get_delay(self, endpoint: Hashable) -> Optional[float]:
+        """Returns seconds to wait before sending a hedged request.
+        If the tracked latencies are not enough, it returns None."""
+        if self.delay is not None:
+            return self.delay
+
+        window = self.latency(endpoint)
+        if len(window) < self.min_samples:
+            return None
+        return window.percentile(self.percentile)
+
+    @staticmethod
+    def _release_loser(task: asyncio.Task) -> None:
+        if task.cancelled() or task.exception() is not None:
+            return
+        task.result().release()
+
+    async def _attempt(self, send: SendFunction, method: str, url: URL, endpoint: Hashable, request_kwargs: dict):
+        started_at = time.monotonic()
+        try:
+            response = await send(method, url, **request_kwargs)
+        except asyncio.CancelledError:
+            # The slow attempts are cancelled by the winner. The elapsed time is recorded as a lower bound,
+            # or the tracked latency is biased to fast responses.
+            self.latency(endpoint).record(time.monotonic() - started_at)
+            raise
+        self.latency(endpoint).record(time.monotonic() - started_at)
+        return response
+
+    async def request(
+        self,
+        send: SendFunction,
+        method: str,
+        url: URL,
+        *,
+        endpoint: Optional[str] = None,
+        **request_kwargs,
+    ) -> aiohttp.ClientResponse | BufferedResponse:
+        """Send the HTTP request with hedged requests.
+
+        Parameters
+        ----------
+        send: Callable[..., Awaitable[aiohttp.ClientResponse]]
+            A coroutine function sending the HTTP request. (ex. `aiohttp.ClientSession.request`)
+        method: str
+            HTTP method (example. GET, POST)
+        url: yarl.URL
+            URL of the request.
+        endpoint: Optional[str]
+            Name of the request. The latency is tracked per name.
+        **request_kwargs
+            Keyword arguments of the `send` function.
+        """
+        delay = None
+        if method.upper() in self.methods and is_replayable_body(request_kwargs.get("data")):
+            delay = self.get_delay(endpoint)
+        if delay is None:
+            return await self._attempt(send, method, url, endpoint, request_kwargs)
+
+        self.budget.record_request()
+        pending = {asyncio.ensure_future(self._attempt(send, method, url, endpoint, request_kwargs))}
+        hedges = 0
+        exception: Optional[BaseException] = None
+        try:
+            while pending:
+                timeout = delay if hedges < self.max_hedges else None
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                winner: Optional[asyncio.Task] = None
+                for task in done:
+                    if task.exception() is not None:
+                        exception = task.exception()
+                    elif winner is None:
+                        winner = task
+                    else:
+                        # The attempts completed at the same time. Only the first response is returned.
+                        task.result().release()
+                if winner is not None:
+                    return winner.result()
+
+                if done:
+                    continue
+                if not self.budget.can_retry():
+                    hedges = self.max_hedges
+                    continue
+
+                hedges += 1
+                self.budget.record_retry()
+                _log.debug("Request Hedged: [%s] %s (hedge=%d, delay=%.3f)" % (method, url, hedges, delay))
+                pending.add(asyncio.ensure_future(self._attempt(send, method, url, endpoint, request_kwargs)))
+            raise exception
+        finally:
+            for task in pending:
+                task.cancel()
+                task.add_done_callback(self._release_loser)
@@ -0,0 +1,189 @@
+"""MIT License
+
+Copyright (c) 2023-present gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from typing import Any, Optional
+
+
+class Histogram:
+    """A histogram with fixed buckets like HdrHistogram.
+    The values are counted in exponential buckets, each of which is divided into linear sub-buckets.
+    Therefore, the relative error of percentiles is bounded by `1 / 2 ** significant_bits`.
+
+    Recording a value doesn't allocate memory. (The buckets are allocated when the histogram is created)
+
+    Parameters
+    ----------
+    unit: float
+        The smallest value distinguished by the histogram. (ex. 1e-6 for latencies in seconds)
+    significant_bits: int
+        Number of significant bits of the buckets. The larger it is, the more buckets are used.
+    max_value: float
+        The largest value distinguished by the histogram. Larger values are counted in the last bucket.
+
+    Attributes
+    ----------
+    count: int
+        Number of recorded values.
+    sum: float
+        Sum of recorded values.
+    min: Optional[float]
+        The smallest recorded value.
+    max: Optional[float]
+        The largest recorded value.
+    """
+
+    __slots__ = ("unit", "significant_bits", "max_value", "count", "sum", "min", "max", "_counts", "_half", "_limit")
+
+    def __init__(self, unit: float = 1e-6, significant_bits: int = 4, max_value: float = 3600.0):
+        if unit <= 0:
+            raise ValueError("unit must be greater than 0.")
+        if significant_bits < 1:
+            raise ValueError("significant_bits must be greater than or equal to 1.")
+        if max_value <= unit:
+            raise ValueError("max_value must be greater than unit.")
+        self.unit = unit
+        self.significant_bits = significant_bits
+        self.max_value = max_value
+
+        self._half = 1 << significant_bits
+        self._limit = int(max_value / unit)
+        self._counts = [0] * (self._index(self._limit) + 1)
+
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def __repr__(self) -> str:
+        return "<Histogram count=%d sum=%r min=%r max=%r>" % (self.count, self.sum, self.min, self.max)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _index(self, units: int) -> int:
+        if units < self._half << 1:
+            return units
+        shift = units.bit_length() - self.significant_bits - 1
+        return shift * self._half + (units >> shift)
+
+    def _upper_bound(self, index: int) -> int:
+        """Returns the largest value of the bucket in units."""
+        if index < self._half << 1:
+            return index
+        shift = index // self._half - 1
+        return ((index - shift * self._half + 1) << shift) - 1
+
+    def record(self, value: float) -> None:
+        """Record the value."""
+        units = int(value / self.unit)
+        if units < 0:
+            units = 0
+        elif units > self._limit:
+            units = self._limit
+        self._counts[self._index(units)] += 1
+
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> Optional[float]:
+        """The mean of recorded values. If no value is recorded, None is returned."""
+        if self.count == 0:
+            return None
+        return self.sum / self.count
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """Returns the value at the percentile. If no value is recorded, None is returned.
+
+        Parameters
+        ----------
+        percentile: float
+            The percentile between 0 and 1. (ex. 0.99)
+        """
+        if not 0 <= percentile <= 1:
+            raise ValueError("percentile must be between 0 and 1.")
+        if self.count == 0:
+            return None
+
+        rank = max(1, round(percentile * self.count))
+        accumulated = 0
+        for index, count in enumerate(self._counts):
+            accumulated += count
+            if accumulated >= rank:
+                break
+        # The last bucket counts the values larger than max_value.
+        if index == len(self._counts) - 1:
+            return self.max
+        # The upper bound of bucket is not larger than the largest recorded value.
+        return min(self._upper_bound(index) * self.unit, self.max)
+
+    def buckets(self) -> Iterator[tuple[float, int]]:
+        """Yields the upper bound and the count of each non-empty bucket in ascending order."""
+        for index, count in enumerate(self._counts):
+            if count > 0:
+                yield self._upper_bound(index) * self.unit, count
+
+    def merge(self, other: Histogram) -> None:
+        """Add the recorded values of other histogram. The buckets of both histograms must be same."""
+        if (other.unit, other.significant_bits, other.max_value) != (self.unit, self.significant_bits, self.max_value):
+            raise ValueError("The buckets of histograms are different.")
+        for index, count in enumerate(other._counts):
+            self._counts[index] += count
+        self.count += other.count
+        self.sum += other.sum
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def reset(self) -> None:
+        """Remove all recorded values."""
+        for index in range(len(self._counts)):
+            self._counts[index] = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns the summary of histogram. (count, sum, min, max, mean and percentiles)"""
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+        }
@@ -0,0 +1,335 @@
+"""MIT License
+
+Copyright (c) 2023-present gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import bisect
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+    from typing import Any, Awaitable, Callable, Optional
+
+    import aiohttp
+    from yarl import URL
+
+    from .response import BufferedResponse
+
+    SendFunction = Callable[..., Awaitable[aiohttp.ClientResponse | BufferedResponse]]
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DEFAULT_SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# The label of requests exceeding the maximum number of endpoints.
+OTHER_ENDPOINT = "__other__"
+
+
+class _BucketHistogram:
+    """A histogram with cumulative buckets of Prometheus."""
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        # The last bucket counts the values larger than all bounds. (+Inf)
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> Iterable[tuple[str, int]]:
+        accumulated = 0
+        for bound, count in zip((*(_format_number(bound) for bound in self.bounds), "+Inf"), self.counts):
+            accumulated += count
+            yield bound, accumulated
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"count": self.count, "sum": self.sum, "buckets": dict(self.cumulative())}
+
+
+def _format_number(value: float) -> str:
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    return "{%s}" % ",".join('%s="%s"' % (key, _escape(str(value))) for key, value in labels.items())
+
+
+class MetricsRegistry:
+    """A registry of request metrics fed by :class:`Session`. (See :attr:`Session.metrics`)
+
+    The metrics are labeled by the name of request (:attr:`RequestCore.name`) instead of the formatted path,
+    so the cardinality of labels is bounded by the number of endpoints.
+    The metrics are recorded on the event loop without locks.
+
+    Metrics
+    -------
+    requests_total
+        Counter of HTTP requests by endpoint, method and status.
+    requests_in_flight
+        Gauge of HTTP requests waiting for the response by endpoint.
+    request_duration_seconds
+        Histogram of the latency until the headers of response by endpoint.
+    response_size_bytes
+        Histogram of the size of response body by endpoint. (When the size is known)
+    retries_total
+        Counter of retried requests by endpoint.
+    cache_hits_total, cache_misses_total
+        Counters of the response cache by endpoint.
+    errors_total
+        Counter of exceptions raised while sending the request by endpoint and the exception name.
+
+    Parameters
+    ----------
+    namespace: str
+        Prefix of the metric names.
+    latency_buckets: Sequence[float]
+        Upper bounds of the latency buckets in seconds.
+    size_buckets: Sequence[float]
+        Upper bounds of the response size buckets in bytes.
+    max_endpoints: int
+        Maximum number of endpoint labels. The other requests are labeled as `__other__`.
+
+    Examples
+    --------
+    >>> class MetroAPI(Session):
+    ...     metrics = MetricsRegistry()
+    ...
+    >>> async with MetroAPI("https://api.yhs.kr") as client:
+    ...     await client.station_search_with_query(name="Gangnam")
+    ...     print(client.metrics.render())
+    """
+
+    def __init__(
+        self,
+        namespace: str = "ahttp_client",
+        *,
+        latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        size_buckets: Sequence[float] = DEFAULT_SIZE_BUCKETS,
+        max_endpoints: int = 1000,
+    ):
+        if max_endpoints < 1:
+            raise ValueError("max_endpoints must be greater than or equal to 1.")
+        self.namespace = namespace
+        self.latency_buckets = tuple(sorted(latency_buckets))
+        self.size_buckets = tuple(sorted(size_buckets))
+        self.max_endpoints = max_endpoints
+
+        self._endpoints: set[str] = set()
+        self._requests: dict[tuple[str, str, int], int] = dict()
+        self._in_flight: dict[str, int] = dict()
+        self._latency: dict[str, _BucketHistogram] = dict()
+        self._size: dict[str, _BucketHistogram] = dict()
+        self._retries: dict[str, int] = dict()
+        self._cache_hits: dict[str, int] = dict()
+        self._cache_misses: dict[str, int] = dict()
+        self._errors: dict[tuple[str, str], int] = dict()
+
+    def label(self, endpoint: Optional[str]) -> str:
+        """Returns the endpoint label of the request name. The number of labels is bounded by `max_endpoints`."""
+        if endpoint is None:
+            return OTHER_ENDPOINT
+        if endpoint in self._endpoints:
+            return endpoint
+        if len(self._endpoints) >= self.max_endpoints:
+            return OTHER_ENDPOINT
+        self._endpoints.add(endpoint)
+        return endpoint
+
+    def record_retry(self, endpoint: Optional[str]) -> None:
+        """Count a retry of the request."""
+        endpoint = self.label(endpoint)
+        self._retries[endpoint] = self._retries.get(endpoint, 0) + 1
+
+    def record_response(
+        self,
+        endpoint: Optional[str],
+        method: str,
+        response: aiohttp.ClientResponse | BufferedResponse,
+        latency: float,
+        cache: bool = False,
+    ) -> None:
+        """Record the response of the request."""
+        endpoint = self.label(endpoint)
+        key = (endpoint, method, response.status)
+        self._requests[key] = self._requests.get(key, 0) + 1
+
+        latency_histogram = self._latency.get(endpoint)
+        if latency_histogram is None:
+            latency_histogram = self._latency[endpoint] = _BucketHistogram(self.latency_buckets)
+        latency_histogram.observe(latency)
+
+        size = response.content_length
+        if size is not None:
+            size_histogram = self._size.get(endpoint)
+            if size_histogram is None:
+                size_histogram = self._size[endpoint] = _BucketHistogram(self.size_buckets)
+            size_histogram.observe(size)
+
+        if cache:
+            counters = self._cache_hits if getattr(response, "from_cache", False) else self._cache_misses
+            counters[endpoint] = counters.get(endpoint, 0) + 1
+
+    def record_error(self, endpoint: Optional[str], error: BaseException) -> None:
+        """Count the exception raised while sending the request."""
+        key = (self.label(endpoint), type(error).__name__)
+        self._errors[key] = self._errors.get(key, 0) + 1
+
+    async def request(
+        self,
+        send: SendFunction,
+        method: str,
+        url: URL,
+        *,
+        endpoint: Optional[str] = None,
+        cache: bool = False,
+        **request_kwargs,
+    ) -> aiohttp.ClientResponse | BufferedResponse:
+        """Send the request with the `send` function, and record the metrics.
+
+        Parameters
+        ----------
+        send: Callable[..., Awaitable[aiohttp.ClientResponse]]
+            A coroutine function sending the HTTP request. (ex. `aiohttp.ClientSession.request`)
+        method: str
+            HTTP method (example. GET, POST)
+        url: yarl.URL
+            URL of the request.
+        endpoint: Optional[str]
+            The name of request.
+        cache: bool
+            Whether the request uses the response cache.
+        **request_kwargs
+            Keyword arguments of the `send` function.
+        """
+        label = self.label(endpoint)
+        self._in_flight[label] = self._in_flight.get(label, 0) + 1
+        started_at = time.perf_counter()
+        try:
+            response = await send(method, url, **request_kwargs)
+        except Exception as exc:
+            self.record_error(label, exc)
+            raise
+        finally:
+            self._in_flight[label] -= 1
+        self.record_response(label, method, response, time.perf_counter() - started_at, cache)
+        return response
+
+    def reset(self) -> None:
+        """Remove all recorded metrics. The gauges of in-flight requests are kept."""
+        self._requests.clear()
+        self._latency.clear()
+        self._size.clear()
+        self._retries.clear()
+        self._cache_hits.clear()
+        self._cache_misses.clear()
+        self._errors.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns the metrics by endpoint as a dictionary.
+
+        Returns
+        -------
+        dict[str, Any]
+            The metrics of each endpoint.
+            (requests[method][status], in_flight, latency, response_size, retries, cache_hits, cache_misses, errors)
+        """
+        result: dict[str, Any] = dict()
+
+        def get(endpoint: str) -> dict[str, Any]:
+            if endpoint not in result:
+                result[endpoint] = {
+                    "requests": dict(),
+                    "in_flight": self._in_flight.get(endpoint, 0),
+                    "latency": None,
+                    "response_size": None,
+                    "retries": self._retries.get(endpoint, 0),
+                    "cache_hits": self._cache_hits.get(endpoint, 0),
+                    "cache_misses": self._cache_misses.get(endpoint, 0),
+                    "errors": dict(),
+                }
+            return result[endpoint]
+
+        for (endpoint, method, status), value in self._requests.items():
+            get(endpoint)["requests"].setdefault(method, dict())[status] = value
+        for endpoint, histogram in self._latency.items():
+            get(endpoint)["latency"] = histogram.snapshot()
+        for endpoint, histogram in self._size.items():
+            get(endpoint)["response_size"] = histogram.snapshot()
+        for (endpoint, error), value in self._errors.items():
+            get(endpoint)["errors"][error] = value
+        for endpoint in (*self._in_flight.keys(), *self._retries.keys()):
+            get(endpoint)
+        return result
+
+    def render(self) -> str:
+        """Returns the metrics in the text-based exposition format of Prometheus."""
+        lines: list[str] = list()
+
+        def header(name: str, metric_type: str, description: str) -> str:
+            name = "%s_%s" % (self.namespace, name)
+            lines.append("# HELP %s %s" % (name, description))
+            lines.append("# TYPE %s %s" % (name, metric_type))
+            return name
+
+        def counter(name: str, description: str, values: dict[str, int], metric_type: str = "counter") -> None:
+            name = header(name, metric_type, description)
+            for endpoint, value in values.items():
+                lines.append("%s%s %d" % (name, _format_labels({"endpoint": endpoint}), value))
+
+        def histogram(name: str, description: str, values: dict[str, _BucketHistogram]) -> None:
+            name = header(name, "histogram", description)
+            for endpoint, _histogram in values.items():
+                for bound, count in _histogram.cumulative():
+                    lines.append("%s_bucket%s %d" % (name, _format_labels({"endpoint": endpoint, "le": bound}), count))
+                labels = _format_labels({"endpoint": endpoint})
+                lines.append("%s_sum%s %s" % (name, labels, repr(float(_histogram.sum))))
+                lines.append("%s_count%s %d" % (name, labels, _histogram.count))
+
+        name = header("requests_total", "counter", "Number of HTTP requests.")
+        for (endpoint, method, status), value in self._requests.items():
+            labels = _format_labels({"endpoint": endpoint, "method": method, "status": status})
+            lines.append("%s%s %d" % (name, labels, value))
+
+        counter("requests_in_flight", "Number of HTTP requests waiting for the response.", self._in_flight, "gauge")
+        histogram("request_duration_seconds", "Latency until the headers of response.", self._latency)
+        histogram("response_size_bytes", "Size of the response body.", self._size)
+        counter("retries_total", "Number of retried requests.", self._retries)
+        counter("cache_hits_total", "Number of responses served from the response cache.", self._cache_hits)
+        counter("cache_misses_total", "Number of cached requests sent to the network.", self._cache_misses)
+
+        name = header("errors_total", "counter", "Number of exceptions raised while sending the request.")
+        for (endpoint, error), value in self._errors.items():
+            lines.append("%s%s %d" % (name, _format_labels({"endpoint": endpoint, "error": error}), value))
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,163 @@
+"""MIT License
+
+Copyright (c) 2023-present gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import string
+from collections import OrderedDict
+from typing import NamedTuple, TYPE_CHECKING
+from urllib.parse import quote
+
+from yarl import URL
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from typing import Any, Optional
+
+# Characters allowed in the path segment without percent-encoding. (RFC 3986, pchar)
+_SEGMENT_SAFE = "!$&'()*+,;=:@"
+# Characters allowed in the literal text of path. Reserved characters and already encoded characters are kept.
+_LITERAL_SAFE = _SEGMENT_SAFE + "/?#[]%"
+
+_formatter = string.Formatter()
+
+
+class PathSegment(NamedTuple):
+    """A segment of :class:`PathTemplate`.
+    If field_name is None, the segment is the literal text. Otherwise, the segment is filled with argument.
+    """
+
+    literal: str
+    field_name: Optional[str] = None
+    format_spec: str = ""
+    conversion: Optional[str] = None
+
+    @property
+    def is_field(self) -> bool:
+        return self.field_name is not None
+
+    def format(self, arguments: Mapping[str, Any]) -> str:
+        if self.field_name.isidentifier():
+            value = arguments[self.field_name]
+        else:
+            value, _ = _formatter.get_field(self.field_name, (), arguments)
+
+        if self.conversion is not None:
+            value = _formatter.convert_field(value, self.conversion)
+        return quote(format(value, self.format_spec), safe=_SEGMENT_SAFE)
+
+
+class PathTemplate:
+    """Request path compiled at setup.
+    The path is parsed once into the literal segments and field segments, and each field value is percent-encoded.
+
+    Attributes
+    ----------
+    path: str
+        Raw request path. (example. /users/{user}/repos)
+    segments: tuple[PathSegment, ...]
+        The parsed segments of path.
+    cache_size: int
+        Maximum number of URLs stored for the parameterized path.
+    """
+
+    __slots__ = ("path", "segments", "cache_size", "_static_path", "_url_cache")
+
+    def __init__(self, path: str, *, cache_size: int = 128):
+        self.path = path
+        self.cache_size = cache_size
+
+        segments = []
+        for literal, field_name, format_spec, conversion in _formatter.parse(path):
+            if literal:
+                segments.append(PathSegment(quote(literal, safe=_LITERAL_SAFE)))
+            if field_name is not None:
+                if field_name == "" or field_name.isdigit():
+                    raise ValueError("Positional field is not supported in path: %s" % path)
+                segments.append(PathSegment("", field_name, format_spec or "", conversion))
+        self.segments: tuple[PathSegment, ...] = tuple(segments)
+
+        self._static_path: Optional[str] = None
+        if not self.field_names:
+            self._static_path = "".join(segment.literal for segment in self.segments)
+
+        self._url_cache: OrderedDict[tuple[Optional[URL], str], URL] = OrderedDict()
+
+    @property
+    def field_names(self) -> set[str]:
+        """Returns the name of fields in path."""
+        return {segment.field_name for segment in self.segments if segment.is_field}
+
+    @property
+    def is_static(self) -> bool:
+        """Returns whether the path doesn't have any field."""
+        return self._static_path is not None
+
+    def format(self, arguments: Mapping[str, Any]) -> str:
+        """Get final HTTP path (percent-encoded) from arguments.
+
+        Parameters
+        ----------
+        arguments: Mapping[str, Any]
+            Values of the fields.
+
+        Raises
+        ------
+        KeyError
+            The value of field is missing.
+        """
+        if self._static_path is not None:
+            return self._static_path
+        return "".join(segment.format(arguments) if segment.is_field else segment.literal for segment in self.segments)
+
+    def url(self, base_url: Optional[URL], path: str, encoded: bool = False) -> URL:
+        """Returns the URL of path joined with base url.
+        URLs that are built are stored, so that the same URL is not parsed again.
+
+        Parameters
+        ----------
+        base_url: Optional[yarl.URL]
+            The base url of the session.
+        path: str
+            The final path.
+        encoded: bool
+            Whether the path is already percent-encoded. (ex. the path formatted by this template)
+        """
+        key = (base_url, path, encoded)
+        url = self._url_cache.get(key)
+        if url is not None:
+            self._url_cache.move_to_end(key)
+            return url
+
+        url = URL(path, encoded=encoded)
+        if base_url is not None and not url.absolute:
+            url = base_url.join(url)
+
+        self._url_cache[key] = url
+        if len(self._url_cache) > self.cache_size:
+            self._url_cache.popitem(last=False)
+        return url
+
+    def clear_cache(self) -> None:
+        """Clear the stored URLs."""
+        self._url_cache.clear()
@@ -0,0 +1,194 @@
+"""MIT License
+
+Copyright (c) 2023-present gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import mimetypes
+import mmap
+import os
+import pathlib
+from collections.abc import AsyncIterable
+from typing import TYPE_CHECKING
+
+import aiohttp
+from aiohttp.payload import Payload
+
+if TYPE_CHECKING:
+    from typing import Any, Optional
+
+    from aiohttp.abc import AbstractStreamWriter
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# The types are sent as a binary body, even if the type is a Collection. (ex. bytes, memoryview)
+BINARY_BODY_TYPES = (
+    bytes,
+    bytearray,
+    memoryview,
+    mmap.mmap,
+    io.IOBase,
+    os.PathLike,
+    AsyncIterable,
+    Payload,
+)
+
+
+def is_binary_body(body: Any) -> bool:
+    """Returns True if the body is sent as a binary body instead of JSON."""
+    return isinstance(body, BINARY_BODY_TYPES)
+
+
+def is_replayable_body(body: Any) -> bool:
+    """Returns True if the body can be sent again. (ex. for the retry)
+    An async iterable is consumed by the first request, and a file object can be sent again only if it is seekable.
+    """
+    if isinstance(body, (FilePayload, BufferPayload)):
+        return True
+    if isinstance(body, AsyncIterable):
+        return False
+    if isinstance(body, io.IOBase):
+        return body.seekable()
+    if isinstance(body, aiohttp.FormData):
+        return all(is_replayable_body(value) for _, _, value in body._fields)
+    return True
+
+
+class FilePayload(Payload):
+    """A payload streaming a file from the path.
+    The file is opened when the request is sent, and it is read in chunks in the executor.
+    The size of file is sent as `Content-Length` header.
+
+    Because the file is opened on every send, the payload can be sent again.
+
+    Parameters
+    ----------
+    path: str | os.PathLike
+        Path of the file.
+    chunk_size: int
+        Size of chunk read at once.
+    content_type: Optional[str]
+        Content type of the file. If it is None, the content type is guessed from the file name.
+    """
+
+    _autoclose = True
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        content_type: Optional[str] = None,
+        **kwargs,
+    ):
+        path = pathlib.Path(path)
+        if content_type is None:
+            content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        kwargs.setdefault("filename", path.name)
+        super().__init__(path, content_type=content_type, **kwargs)
+        self.chunk_size = chunk_size
+
+    @property
+    def size(self) -> int:
+        return os.stat(self._value).st_size
+
+    async def write(self, writer: AbstractStreamWriter) -> None:
+        await self.write_with_length(writer, None)
+
+    async def write_with_length(self, writer: AbstractStreamWriter, content_length: Optional[int]) -> None:
+        loop = asyncio.get_running_loop()
+        file = await loop.run_in_executor(None, open, self._value, "rb")
+        try:
+            remaining = content_length
+            while remaining is None or remaining > 0:
+                size = self.chunk_size if remaining is None else min(self.chunk_size, remaining)
+                chunk = await loop.run_in_executor(None, file.read, size)
+                if not chunk:
+                    break
+                await writer.write(chunk)
+                if remaining is not None:
+                    remaining -= len(chunk)
+        finally:
+            await loop.run_in_executor(None, file.close)
+
+    def decode(self, encoding: str = "utf-8", errors: str = "strict") -> str:
+        return pathlib.Path(self._value).read_bytes().decode(encoding, errors)
+
+
+class BufferPayload(Payload):
+    """A payload streaming a buffer (ex. memoryview, mmap) in chunks without copying it into bytes.
+    Each chunk is a slice of the memoryview, and the next chunk is written after the transport is drained.
+
+    Parameters
+    ----------
+    value: memoryview | mmap.mmap | bytearray
+        An object supporting the buffer protocol.
+    chunk_size: int
+        Size of chunk written at once.
+    """
+
+    _autoclose = True
+
+    def __init__(self, value: memoryview | mmap.mmap | bytearray, *, chunk_size: int = DEFAULT_CHUNK_SIZE, **kwargs):
+        view = memoryview(value).cast("B")
+        kwargs.setdefault("content_type", "application/octet-stream")
+        super().__init__(view, **kwargs)
+        self._size = view.nbytes
+        self.chunk_size = chunk_size
+
+    async def write(self, writer: AbstractStreamWriter) -> None:
+        await self.write_with_length(writer, None)
+
+    async def write_with_length(self, writer: AbstractStreamWriter, content_length: Optional[int]) -> None:
+        view: memoryview = self._value
+        end = view.nbytes if content_length is None else min(content_length, view.nbytes)
+        for start in range(0, end, self.chunk_size):
+            await writer.write(view[slice(start, min(start + self.chunk_size, end))])
+
+    def decode(self, encoding: str = "utf-8", errors: str = "strict") -> str:
+        return bytes(self._value).decode(encoding, errors)
+
+
+def make_payload(body: Any) -> Any:
+    """Convert the body which aiohttp can't stream into a payload.
+    A path is converted into :class:`FilePayload`, and a memoryview or mmap is converted into :class:`BufferPayload`.
+    Other bodies are returned as is. (aiohttp streams async iterables and file objects)
+    """
+    if isinstance(body, os.PathLike):
+        return FilePayload(body)
+    if isinstance(body, (memoryview, mmap.mmap)):
+        return BufferPayload(body)
+    return body
+
+
+def add_form_field(form_data: aiohttp.FormData, name: str, value: Any) -> None:
+    """Add the field to the form. A path, a memoryview or mmap is streamed as a file field.
+    A file object is streamed by aiohttp."""
+    if isinstance(value, os.PathLike):
+        path = pathlib.Path(value)
+        form_data.add_field(name, FilePayload(path), filename=path.name)
+    elif isinstance(value, (memoryview, mmap.mmap)):
+        form_data.add_field(name, BufferPayload(value), filename=name)
+    else:
+        form_data.add_field(name, value)
@@ -0,0 +1,341 @@
+"""MIT License
+
+Copyright (c) 2023-present gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Mapping
+from typing import TYPE_CHECKING
+
+import aiohttp
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+    from typing import Any, Optional
+
+_log = logging.getLogger(__name__)
+
+
+class PoolConfig:
+    """Configuration of the connection pool (`aiohttp.TCPConnector`) used by :class:`Session`.
+    The default values are tuned for high-throughput clients.
+
+    Attributes
+    ----------
+    limit: int
+        The total number of simultaneous connections. If it is 0, the number is unlimited.
+    limit_per_host: int
+        The number of simultaneous connections to one host. If it is 0, the number is unlimited.
+    keepalive_timeout: Optional[float]
+        Seconds to keep an idle connection for reuse.
+        It is ignored (None), when `force_close` is True.
+    ttl_dns_cache: Optional[int]
+        Seconds to cache DNS resolution. If it is None, the resolution is cached forever.
+    enable_cleanup_closed: bool
+        Clean up the closed SSL transports. Some servers do not properly complete the SSL shutdown process.
+    force_close: bool
+        Close the connection after each request. (Connections are not reused.)
+
+    Examples
+    --------
+    >>> class GithubService(Session):
+    ...     pool_config = PoolConfig(limit=200, limit_per_host=50)
+    """
+
+    __slots__ = (
+        "limit",
+        "limit_per_host",
+        "keepalive_timeout",
+        "ttl_dns_cache",
+        "enable_cleanup_closed",
+        "force_close",
+    )
+
+    def __init__(
+        self,
+        *,
+        limit: int = 256,
+        limit_per_host: int = 0,
+        keepalive_timeout: Optional[float] = 30.0,
+        ttl_dns_cache: Optional[int] = 300,
+        enable_cleanup_closed: bool = False,
+        force_close: bool = False,
+    ):
+        if not isinstance(limit, int) or limit < 0:
+            raise ValueError("limit must be an integer greater than or equal to 0.")
+        if not isinstance(limit_per_host, int) or limit_per_host < 0:
+            raise ValueError("limit_per_host must be an integer greater than or equal to 0.")
+        if limit != 0 and limit_per_host > limit:
+            raise ValueError("limit_per_host must be less than or equal to limit.")
+        if ttl_dns_cache is not None and ttl_dns_cache < 0:
+            raise ValueError("ttl_dns_cache must be greater than or equal to 0.")
+
+        if force_close:
+            # The connections are not kept alive.
+            keepalive_timeout = None
+        elif keepalive_timeout is None or keepalive_timeout < 0:
+            raise ValueError("keepalive_timeout must be greater than or equal to 0.")
+
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.enable_cleanup_closed = enable_cleanup_closed
+        self.force_close = force_close
+
+    def _astuple(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        if not isinstance(other, PoolConfig):
+            return False
+        return self._astuple() == other._astuple()
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self._astuple())
+
+    def __repr__(self):
+        return "PoolConfig(%s)" % ", ".join("%s=%r" % (name, getattr(self, name)) for name in self.__slots__)
+
+    def replace(self, **kwargs) -> PoolConfig:
+        """Returns a new configuration with the changed values."""
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(kwargs)
+        return PoolConfig(**values)
+
+    def create_connector(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> aiohttp.TCPConnector:
+        """Create a new connector with this configuration.
+        If `loop` is None, this method must be called in the running event loop."""
+        connector_kwargs = dict(
+            loop=loop,
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.ttl_dns_cache,
+            enable_cleanup_closed=self.enable_cleanup_closed,
+            force_close=self.force_close,
+        )
+        if not self.force_close:
+            connector_kwargs["keepalive_timeout"] = self.keepalive_timeout
+        return aiohttp.TCPConnector(**connector_kwargs)
+
+
+def _make_hashable(value: Any) -> Hashable:
+    if isinstance(value, Mapping):
+        return tuple(sorted((str(k), _make_hashable(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_make_hashable(x) for x in value)
+
+    try:
+        hash(value)
+    except TypeError:
+        # Unhashable objects (for example, connector or cookie jar) are compared by identity.
+        return "__id__", id(value)
+    return value
+
+
+class _PooledSession:
+    __slots__ = ("session", "loop", "reference_count", "expire_handle")
+
+    def __init__(self, session: aiohttp.ClientSession, loop: asyncio.AbstractEventLoop):
+        self.session = session
+        self.loop = loop
+        self.reference_count = 0
+        self.expire_handle: Optional[asyncio.TimerHandle] = None
+
+
+class SessionPool:
+    """A process-wide registry of `aiohttp.ClientSession` shared by single sessions.
+    The sessions are keyed by base url, session keyword arguments and event loop,
+    so that single-session functions reuse keep-alive connections instead of opening new connections every call.
+
+    A shared session is closed after it has not been used for `idle_timeout` seconds.
+
+    Attributes
+    ----------
+    idle_timeout: float
+        Seconds to keep an unused session open.
+
+    Warnings
+    --------
+    An `aiohttp.ClientSession` is bound to an event loop.
+    If a new event loop is created for each call, the session can't be reused.
+    Call :meth:`close` before the event loop is closed.
+    Otherwise, the session of closed event loop is discarded without the graceful shutdown.
+    """
+
+    def __init__(self, idle_timeout: float = 60.0):
+        if idle_timeout < 0:
+            raise ValueError("idle_timeout must be greater than or equal to 0.")
+
+        self.idle_timeout = idle_timeout
+        self._sessions: dict[Hashable, _PooledSession] = dict()
+        self._keys: dict[int, Hashable] = dict()
+        self._closing_tasks: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    @staticmethod
+    def _make_key(
+        base_url: str,
+        loop: asyncio.AbstractEventLoop,
+        pool_config: Optional[PoolConfig],
+        session_kwargs: dict[str, Any],
+    ) -> Hashable:
+        return base_url, pool_config, _make_hashable(session_kwargs), id(loop)
+
+    def _purge_closed_loop(self) -> None:
+        for key, pooled_session in list(self._sessions.items()):
+            if not pooled_session.loop.is_closed():
+                continue
+
+            # The session can't be closed gracefully without the event loop.
+            # The connector is closed synchronously, and its connections are dropped.
+            _log.warning(
+                "Discard pooled session of closed event loop: %s (Call SessionPool.close before the loop is closed)"
+                % key[0]
+            )
+            self._remove(key)
+            connector = pooled_session.session.connector
+            if connector is not None:
+                connector._close()
+
+    def _remove(self, key: Hashable) -> Optional[_PooledSession]:
+        pooled_session = self._sessions.pop(key, None)
+        if pooled_session is None:
+            return None
+
+        self._keys.pop(id(pooled_session.session), None)
+        if pooled_session.expire_handle is not None:
+            pooled_session.expire_handle.cancel()
+        return pooled_session
+
+    def acquire(
+        self,
+        base_url: str,
+        *,
+        pool_config: Optional[PoolConfig] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        **session_kwargs,
+    ) -> aiohttp.ClientSession:
+        """Returns a shared session for base url and session keyword arguments.
+        If the session does not exist, a new session is created.
+        If `loop` is None, this method must be called in the running event loop.
+
+        Parameters
+        ----------
+        base_url: str
+            base url of the API. (for example, https://api.yhs.kr)
+        pool_config: Optional[PoolConfig]
+            Configuration of the connection pool. It is ignored when `connector` is in session keyword arguments.
+        loop: Optional[asyncio.AbstractEventLoop]
+            The event loop of the session. If it is None, the running event loop is used.
+        **session_kwargs
+            Keyword argument used in `aiohttp.ClientSession`
+
+        Returns
+        -------
+        aiohttp.ClientSession
+            The shared session. It must be returned with :meth:`release`.
+        """
+        if loop is None:
+            loop = asyncio.get_running_loop()
+        self._purge_closed_loop()
+
+        key = self._make_key(base_url, loop, pool_config, session_kwargs)
+        pooled_session = self._sessions.get(key)
+        if pooled_session is not None and pooled_session.session.closed:
+            self._remove(key)
+            pooled_session = None
+
+        if pooled_session is None:
+            _log.debug("Create pooled session: %s" % base_url)
+            if pool_config is not None and "connector" not in session_kwargs:
+                session_kwargs["connector"] = pool_config.create_connector(loop)
+            pooled_session = _PooledSession(aiohttp.ClientSession(base_url, loop=loop, **session_kwargs), loop)
+            self._sessions[key] = pooled_session
+            self._keys[id(pooled_session.session)] = key
+
+        if pooled_session.expire_handle is not None:
+            pooled_session.expire_handle.cancel()
+            pooled_session.expire_handle = None
+
+        pooled_session.reference_count += 1
+        return pooled_session.session
+
+    def release(self, session: aiohttp.ClientSession) -> None:
+        """Return the shared session to the pool.
+        When no one uses the session, the session is closed after `idle_timeout` seconds.
+
+        Parameters
+        ----------
+        session: aiohttp.ClientSession
+            The session returned by :meth:`acquire`.
+        """
+        key = self._keys.get(id(session))
+        if key is None:
+            return
+
+        pooled_session = self._sessions[key]
+        pooled_session.reference_count -= 1
+        if pooled_session.reference_count > 0:
+            return
+
+        pooled_session.reference_count = 0
+        if not pooled_session.loop.is_closed():
+            pooled_session.expire_handle = pooled_session.loop.call_later(self.idle_timeout, self._expire, key)
+
+    def _expire(self, key: Hashable) -> None:
+        pooled_session = self._sessions.get(key)
+        if pooled_session is None or pooled_session.reference_count > 0:
+            return
+
+        self._remove(key)
+        _log.debug("Close idle pooled session: %s" % key[0])
+        task = pooled_session.loop.create_task(pooled_session.session.close())
+        self._closing_tasks.add(task)
+        task.add_done_callback(self._closing_tasks.discard)
+
+    async def close(self) -> None:
+        """Close all shared sessions of the running event loop.
+        This method is a shutdown hook. Call it before the event loop is closed.
+        """
+        loop = asyncio.get_running_loop()
+        self._purge_closed_loop()
+
+        sessions = []
+        for key, pooled_session in list(self._sessions.items()):
+            if pooled_session.loop is not loop:
+                continue
+            self._remove(key)
+            sessions.append(pooled_session.session.close())
+
+        closing_tasks = [task for task in self._closing_tasks if task.get_loop() is loop]
+        await asyncio.gather(*sessions, *closing_tasks)
+
+
+default_pool = SessionPool()
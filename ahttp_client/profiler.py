@@ -0,0 +1,164 @@
+"""MIT License
+
+Copyright (c) 2023-present gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any, Optional
+
+# The phases of a request call measured by Profiler.
+PHASES = (
+    "bind",
+    "fill_parameter",
+    "format_path",
+    "before_hook",
+    "before_request",
+    "request_kwargs",
+    "network",
+    "after_request",
+    "after_hook",
+    "function",
+    "total",
+)
+(
+    BIND,
+    FILL_PARAMETER,
+    FORMAT_PATH,
+    BEFORE_HOOK,
+    BEFORE_REQUEST,
+    REQUEST_KWARGS,
+    NETWORK,
+    AFTER_REQUEST,
+    AFTER_HOOK,
+    FUNCTION,
+    TOTAL,
+) = range(len(PHASES))
+
+
+class ProfileStats:
+    """Monotonic counters of the phases of a request. The counters are allocated when the stats are created.
+
+    Attributes
+    ----------
+    counts: list[int]
+        Number of samples for each phase.
+    totals: list[int]
+        Total time for each phase in nanoseconds.
+    maxima: list[int]
+        The longest time for each phase in nanoseconds.
+    """
+
+    __slots__ = ("counts", "totals", "maxima")
+
+    def __init__(self):
+        self.counts = [0] * len(PHASES)
+        self.totals = [0] * len(PHASES)
+        self.maxima = [0] * len(PHASES)
+
+    def record(self, phase: int, elapsed: int) -> None:
+        """Record the elapsed time of the phase in nanoseconds."""
+        self.counts[phase] += 1
+        self.totals[phase] += elapsed
+        if elapsed > self.maxima[phase]:
+            self.maxima[phase] = elapsed
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns the aggregates of the phases in seconds. The phases without samples are omitted."""
+        result = dict()
+        for index, phase in enumerate(PHASES):
+            count = self.counts[index]
+            if count == 0:
+                continue
+            result[phase] = {
+                "count": count,
+                "total": self.totals[index] / 1e9,
+                "mean": self.totals[index] / count / 1e9,
+                "max": self.maxima[index] / 1e9,
+            }
+        return result
+
+
+class Profiler:
+    """A profiler measuring the time spent inside ahttp_client for each call of requests.
+
+    The argument binding, the HTTP components (parameter filling and path formatting),
+    `get_request_kwargs`, the pre-invoke and post-invoke hooks, the session hooks
+    and the function body are measured by the name of request (:attr:`RequestCore.name`).
+    The network phase (from the rate limiters to the response headers) is measured to compare with the total.
+
+    Only one of `1 / sample_rate` calls is measured, and the other calls check only a counter.
+
+    Parameters
+    ----------
+    sample_rate: float
+        Ratio of measured calls between 0 and 1.
+
+    Examples
+    --------
+    >>> class MetroAPI(Session):
+    ...     profiler = Profiler(sample_rate=0.01)
+    ...
+    >>> async with MetroAPI("https://api.yhs.kr") as client:
+    ...     await client.station_search_with_query(name="Gangnam")
+    ...     client.stats()["station_search_with_query"]["bind"]["mean"]
+    """
+
+    def __init__(self, sample_rate: float = 1.0):
+        if not 0 < sample_rate <= 1:
+            raise ValueError("sample_rate must be greater than 0 and less than or equal to 1.")
+        self.sample_rate = sample_rate
+        self._interval = round(1 / sample_rate)
+        self._counter = 0
+        self._stats: dict[str, ProfileStats] = dict()
+
+    def sample(self, name: str) -> Optional[ProfileStats]:
+        """Returns the stats of the request, if the call is sampled. Otherwise, returns None."""
+        self._counter += 1
+        if self._counter < self._interval:
+            return None
+        self._counter = 0
+
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = ProfileStats()
+        return stats
+
+    def stats(self, name: Optional[str] = None) -> dict[str, Any]:
+        """Returns the aggregates of the phases. (count, total, mean and max in seconds)
+
+        Parameters
+        ----------
+        name: Optional[str]
+            The request name. If it is None, the aggregates of all requests are returned by the name.
+        """
+        if name is not None:
+            stats = self._stats.get(name)
+            return stats.snapshot() if stats is not None else dict()
+        return {_name: stats.snapshot() for _name, stats in self._stats.items()}
+
+    def reset(self) -> None:
+        """Remove all samples."""
+        self._stats.clear()
+        self._counter = 0
@@ -0,0 +1,335 @@
+"""MIT License
+
+Copyright (c) 2023-present gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import logging
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Mapping
+    from typing import Any, Awaitable, Callable, Literal, Optional
+
+    import aiohttp
+    from yarl import URL
+
+    from .response import BufferedResponse
+
+    SendFunction = Callable[..., Awaitable[aiohttp.ClientResponse | BufferedResponse]]
+
+_log = logging.getLogger(__name__)
+
+_REMAINING_HEADERS = ("X-RateLimit-Remaining", "RateLimit-Remaining")
+_RESET_HEADERS = ("X-RateLimit-Reset", "RateLimit-Reset")
+
+# The reset value greater than this is regarded as a unix timestamp. (Otherwise, seconds until the reset.)
+_TIMESTAMP_THRESHOLD = 10**9
+
+
+class TokenBucket:
+    """A token bucket. Tokens are refilled at `rate` per second up to `capacity`.
+
+    The callers waiting for tokens are served in FIFO order.
+    A waiting caller is woken by a timer scheduled at the time the tokens are refilled, without polling.
+
+    Parameters
+    ----------
+    rate: float
+        Tokens refilled per second.
+    capacity: Optional[float]
+        Maximum number of tokens. (Burst size) If it is None, the capacity is same as the rate.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0.")
+        if capacity is None:
+            capacity = max(rate, 1)
+        if capacity <= 0:
+            raise ValueError("capacity must be greater than 0.")
+
+        self.rate = rate
+        self.capacity = capacity
+
+        self._tokens: float = capacity
+        self._updated_at: float = time.monotonic()
+        self._waiters: collections.deque[tuple[float, asyncio.Future]] = collections.deque()
+        self._wakeup_handle: Optional[asyncio.TimerHandle] = None
+
+    def __repr__(self) -> str:
+        return "<TokenBucket rate=%s capacity=%s tokens=%.2f>" % (self.rate, self.capacity, self.tokens)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        # The updated time can be in the future, when the bucket is exhausted until the reset of server.
+        if now > self._updated_at:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+    @property
+    def tokens(self) -> float:
+        """Returns the number of available tokens."""
+        self._refill()
+        return self._tokens
+
+    @property
+    def waiters(self) -> int:
+        """Returns the number of callers waiting for tokens."""
+        return len(self._waiters)
+
+    def _delay(self, weight: float) -> float:
+        delay = max(0.0, self._updated_at - time.monotonic())
+        return delay + max(0.0, weight - self._tokens) / self.rate
+
+    def _wakeup(self) -> None:
+        self._wakeup_handle = None
+        self._refill()
+        while self._waiters:
+            weight, future = self._waiters[0]
+            if future.done():
+                self._waiters.popleft()
+                continue
+            if self._tokens < weight or self._updated_at > time.monotonic():
+                break
+            self._waiters.popleft()
+            self._tokens -= weight
+            future.set_result(None)
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self._wakeup_handle is not None:
+            self._wakeup_handle.cancel()
+            self._wakeup_handle = None
+        if not self._waiters:
+            return
+
+        weight, _ = self._waiters[0]
+        loop = asyncio.get_running_loop()
+        self._wakeup_handle = loop.call_later(self._delay(weight), self._wakeup)
+
+    def try_acquire(self, weight: float = 1) -> bool:
+        """Take tokens without waiting. Returns False if the tokens are not enough or other callers are waiting.
+
+        Parameters
+        ----------
+        weight: float
+            Number of tokens to take.
+        """
+        self._refill()
+        if self._waiters or self._tokens < weight or self._updated_at > time.monotonic():
+            return False
+        self._tokens -= weight
+        return True
+
+    async def acquire(self, weight: float = 1) -> None:
+        """Take tokens. If the tokens are not enough, wait until the tokens are refilled.
+
+        Parameters
+        ----------
+        weight: float
+            Number of tokens to take.
+
+        Raises
+        ------
+        ValueError
+            The weight is greater than the capacity of bucket.
+        """
+        if weight > self.capacity:
+            raise ValueError("weight (%s) must not be greater than the capacity (%s)." % (weight, self.capacity))
+        if self.try_acquire(weight):
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((weight, future))
+        if len(self._waiters) == 1:
+            self._schedule()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The tokens were taken for the cancelled caller. Return it to the bucket.
+                self._tokens = min(self.capacity, self._tokens + weight)
+            self._schedule()
+            raise
+
+    def update(self, remaining: float, reset_after: Optional[float] = None) -> None:
+        """Reduce the tokens to the remaining quota reported by the server.
+
+        Parameters
+        ----------
+        remaining: float
+            Remaining quota of the server.
+        reset_after: Optional[float]
+            Seconds until the quota of the server is reset.
+            If the remaining quota is exhausted, no tokens are refilled until the reset.
+        """
+        self._refill()
+        self._tokens = min(self._tokens, max(remaining, 0))
+        if remaining <= 0 and reset_after is not None and reset_after > 0:
+            self._updated_at = max(self._updated_at, time.monotonic() + reset_after)
+        if self._waiters:
+            self._schedule()
+
+
+class RateLimiter:
+    """Limit the request rate with token buckets.
+    It can be attached to :class:`Session` (`rate_limiter`), or to a request (`rate_limiter` of decorators).
+
+    Parameters
+    ----------
+    rate: float
+        Number of requests allowed in `per` seconds.
+    per: float
+        Period of the rate in seconds.
+    burst: Optional[float]
+        Maximum number of requests sent at once. If it is None, the burst is same as the rate.
+    scope: Literal['session', 'host', 'endpoint']
+        The unit of token bucket.
+        When it is 'session', all requests share one bucket.
+        When it is 'host', a bucket is created per host. When it is 'endpoint', a bucket is created per request name.
+    respect_headers: bool
+        If it is True, the remaining quota of `X-RateLimit-Remaining` and `X-RateLimit-Reset`
+        (or `RateLimit-Remaining` and `RateLimit-Reset`) response headers is applied to the bucket.
+
+    Examples
+    --------
+    >>> class MetroAPI(Session):
+    ...     rate_limiter = RateLimiter(10, per=1.0, burst=20)
+    ...
+    ...     @request("GET", "/bus/station", rate_limit_weight=2)
+    ...     async def station_query(self, name: Query | str) -> aiohttp.ClientResponse:
+    ...         pass
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        per: float = 1.0,
+        *,
+        burst: Optional[float] = None,
+        scope: Literal["session", "host", "endpoint"] = "session",
+        respect_headers: bool = True,
+    ):
+        if per <= 0:
+            raise ValueError("per must be greater than 0.")
+        if scope not in ("session", "host", "endpoint"):
+            raise ValueError("scope must be one of 'session', 'host' or 'endpoint'.")
+
+        self.rate = rate / per
+        self.burst = burst if burst is not None else rate
+        self.scope = scope
+        self.respect_headers = respect_headers
+
+        # Validate the parameters before the first request.
+        TokenBucket(self.rate, self.burst)
+        self._buckets: dict[Hashable, TokenBucket] = dict()
+
+    def make_key(self, url: Optional[URL] = None, endpoint: Optional[str] = None) -> Hashable:
+        """Returns the key of token bucket following the scope."""
+        if self.scope == "host":
+            return url.host if url is not None else None
+        elif self.scope == "endpoint":
+            return endpoint
+        return None
+
+    def bucket(self, key: Hashable = None) -> TokenBucket:
+        """Returns the token bucket of the key. If it doesn't exist, a new bucket is created."""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.burst)
+        return bucket
+
+    async def acquire(self, key: Hashable = None, weight: float = 1) -> None:
+        """Wait until the request of the key can be sent.
+
+        Parameters
+        ----------
+        key: Hashable
+            The key of token bucket. (See :meth:`make_key`)
+        weight: float
+            Number of tokens used by the request.
+        """
+        await self.bucket(key).acquire(weight)
+
+    def update_from_headers(self, key: Hashable, headers: Mapping[str, str]) -> None:
+        """Apply the rate limit headers of response to the token bucket of the key."""
+        remaining = _parse_number(headers, _REMAINING_HEADERS)
+        if remaining is None:
+            return
+
+        reset = _parse_number(headers, _RESET_HEADERS)
+        if reset is not None and reset > _TIMESTAMP_THRESHOLD:
+            reset = reset - time.time()
+        _log.debug("Rate Limit Updated: %s (remaining=%s, reset=%s)" % (key, remaining, reset))
+        self.bucket(key).update(remaining, reset)
+
+    async def request(
+        self,
+        send: SendFunction,
+        method: str,
+        url: URL,
+        *,
+        endpoint: Optional[str] = None,
+        weight: float = 1,
+        **request_kwargs,
+    ) -> aiohttp.ClientResponse | BufferedResponse:
+        """Send the HTTP request after the tokens are taken.
+
+        Parameters
+        ----------
+        send: Callable[..., Awaitable[aiohttp.ClientResponse]]
+            A coroutine function sending the HTTP request. (ex. `aiohttp.ClientSession.request`)
+        method: str
+            HTTP method (example. GET, POST)
+        url: yarl.URL
+            URL of the request.
+        endpoint: Optional[str]
+            Name of the request. It is used when the scope is 'endpoint'.
+        weight: float
+            Number of tokens used by the request.
+        **request_kwargs
+            Keyword arguments of the `send` function.
+        """
+        key = self.make_key(url, endpoint)
+        await self.acquire(key, weight)
+        response = await send(method, url, **request_kwargs)
+        if self.respect_headers:
+            self.update_from_headers(key, response.headers)
+        return response
+
+
+def _parse_number(headers: Mapping[str, str], names: tuple[str, ...]) -> Optional[float]:
+    for name in names:
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            # The draft of IETF allows a list of quota policies. (ex. "10, 100;w=60")
+            return float(value.split(",")[0].split(";")[0].strip())
+        except ValueError:
+            return None
+    return None
@@ -23,38 +23,68 @@ SOFTWARE.
 
 from __future__ import annotations
 
-import copy
 import inspect
+import time
 from asyncio import iscoroutinefunction
+from types import MappingProxyType
 from typing import TypeVar, TYPE_CHECKING
 
 import aiohttp
 
+from ._codegen import compile_bind
+from .batch import as_completed, gather, make_call
 from .body import Body
 from .body_json import BodyJson
 from .component import Component, EmptyComponent
 from .body_form import BodyForm
 from .header import Header
 from .path import Path
+from .path_template import PathTemplate
+from . import profiler as _profiler
+from .payload import BINARY_BODY_TYPES, add_form_field, is_binary_body
 from .query import Query
+from .request_state import RequestState
+from .response import is_response
+from .sse import EventStream, LAST_EVENT_ID_HEADER
+from .stream import Stream
 from .utils import *
 
 if TYPE_CHECKING:
-    from collections.abc import Collection
-    from typing import Optional, NoReturn, Any, Literal
+    from collections.abc import AsyncIterator, Collection, Iterable, Sequence
+    from typing import Optional, NoReturn, Any, Awaitable, Callable, Literal
     from typing_extensions import Self
     from ._types import (
+        Middleware,
         RequestFunction,
         RequestBeforeHookFunction,
         RequestAfterHookFunction,
     )
+    from ._codegen import BindFunction
+    from .circuit import CircuitBreaker
+    from .hedge import HedgePolicy
+    from .profiler import ProfileStats
+    from .ratelimit import RateLimiter
+    from .retry import RetryPolicy
     from .session import Session
+    from .sse import EventSource
 
 T = TypeVar("T")
 
 
+def _bind_middleware(
+    middleware: Middleware, call_next: Callable[[RequestState], Awaitable[Any]]
+) -> Callable[[RequestState], Awaitable[Any]]:
+    # The handler returns the coroutine of the middleware without awaiting it. (No extra await for each layer)
+    def handler(request: RequestState) -> Awaitable[Any]:
+        return middleware(request, call_next)
+
+    return handler
+
+
 class RequestCore:
     """A class that implements functions for HTTP requests.
+    RequestCore is an endpoint template. When the setup is finished, the HTTP components can't be changed.
+    The HTTP components of each call are stored in :class:`RequestState`.
 
     Attributes
     ----------
@@ -66,14 +96,33 @@ class RequestCore:
         HTTP method (example. GET, POST)
     path: str
         Request path. Path connects to the base url.
+    path_template: PathTemplate
+        Request path compiled at setup.
     directly_response: bool
         Returns a `aiohttp.ClientResponse` without executing the function's body statement.
-    params: Optional[dict[str, Any]]
-        Request parameters.
-    headers: Optional[dict[str, Any]]
-        Request headers.
+    cache: bool
+        Whether the response is cached with :class:`ResponseCache` of the session.
+    coalesce: bool | Collection[str]
+        Whether identical in-flight requests are coalesced into a single HTTP request.
+        If it is a collection of header names, only the headers are compared. Otherwise, all headers are compared.
+    rate_limiter: Optional[RateLimiter]
+        The rate limiter of the request. It is used with :attr:`Session.rate_limiter`.
+    rate_limit_weight: float
+        Number of tokens used by the request in the rate limiters.
+    retry_policy: Optional[RetryPolicy]
+        The retry policy of the request. If it is None, :attr:`Session.retry_policy` is used.
+    circuit_breaker: Optional[CircuitBreaker]
+        The circuit breaker of the request. It is used with :attr:`Session.circuit_breaker`.
+    hedge_policy: Optional[HedgePolicy]
+        The policy sending hedged requests when the response is delayed.
+    middlewares: tuple[Middleware, ...]
+        Middlewares of the request. They are invoked inside the middlewares of :attr:`Session.middlewares`.
+    params: Mapping[str, Any]
+        Default request parameters.
+    headers: Mapping[str, Any]
+        Default request headers.
     body: Optional[Any | aiohttp.FormData]
-        Request body.
+        Default request body.
     header_parameter: dict[str, inspect.Parameter]
         Function parameters used in the header
     query_parameter: dict[str, inspect.Parameter]
@@ -93,10 +142,54 @@ class RequestCore:
         Else `body_parameter_type` is `Collection`, the `body_parameter_type` is 'json'.
     response_parameter: list[str]
         Function parameter name to store the HTTP result in.
+    stream_parameter: dict[str, Stream]
+        Function parameters to store the streaming body of the HTTP result in. (`AsyncIterator[bytes]`)
+        When the item type is not bytes (ex. `AsyncIterator[Model]`), the records of NDJSON are streamed.
+    response_stream: Optional[Stream]
+        When the return annotation is `AsyncIterator[bytes]` (or `AsyncIterator[Model]`), the request returns
+        a :class:`ResponseStream` (or :class:`JsonLinesStream`) without executing the function's body statement.
+    event_stream: Optional[EventStream]
+        Configuration of Server-Sent Events. When it exists, the request returns an :class:`EventSource`
+        without executing the function's body statement. (See :func:`sse`)
     request_kwargs: dict[str, Any]
         Keyword Arguments are passed directly request method.
+    compiled_call: bool
+        Whether the request is called with the compiled function.
+        If it is False, the arguments are bound with `inspect.Signature.bind`. (It is useful for debugging.)
     """
 
+    compiled_call: bool = True
+
+    _FROZEN_ATTRIBUTES = frozenset(
+        {
+            "method",
+            "path",
+            "path_template",
+            "params",
+            "headers",
+            "body",
+            "header_parameter",
+            "query_parameter",
+            "path_parameter",
+            "body_form_parameter",
+            "body_json_parameter",
+            "body_parameter_type",
+            "body_parameter",
+            "stream_parameter",
+            "response_stream",
+            "event_stream",
+            "request_kwargs",
+            "cache",
+            "coalesce",
+            "rate_limiter",
+            "rate_limit_weight",
+            "retry_policy",
+            "circuit_breaker",
+            "hedge_policy",
+            "middlewares",
+        }
+    )
+
     def __init__(
         self,
         func: RequestFunction,
@@ -105,14 +198,26 @@ class RequestCore:
         *,
         name: str = None,
         directly_response: bool = False,
+        cache: bool = False,
+        coalesce: bool | Collection[str] = False,
+        rate_limiter: Optional[RateLimiter] = None,
+        rate_limit_weight: float = 1,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        middlewares: Optional[Sequence[Middleware]] = None,
+        event_stream: Optional[EventStream] = None,
         params: Optional[dict[str, Any]] = None,
         headers: Optional[dict[str, Any]] = None,
         body: Optional[Any | aiohttp.FormData] = None,
         response_parameter: Optional[list[str]] = None,
         **kwargs,
     ):
+        self._frozen = False
         self.func = func
-        self.session: Session = NotImplemented
+        self._session: Session = NotImplemented
+        # The middlewares are flattened into a handler when the request is bound to a session.
+        self._handler: Optional[Callable[[RequestState], Awaitable[Any]]] = None
         self.method = method
 
         # Function Wrapper
@@ -126,7 +231,19 @@ class RequestCore:
 
         self.name = name or self.func.__name__
         self.path = path
+        self.path_template = PathTemplate(path)
         self.directly_response = directly_response
+        self.cache = cache
+        self.coalesce = coalesce
+        self.rate_limiter = rate_limiter
+        self.rate_limit_weight = rate_limit_weight
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.hedge_policy = hedge_policy
+        self.middlewares: tuple[Middleware, ...] = tuple(middlewares or ())
+        self.event_stream = event_stream
+        if rate_limit_weight <= 0:
+            raise ValueError("rate_limit_weight must be greater than 0.")
 
         self._signature = inspect.signature(self.func)
 
@@ -153,10 +270,14 @@ class RequestCore:
         self.body_parameter: Optional[inspect.Parameter] = None
 
         self.response_parameter: list[str] = response_parameter or list()
+        self.stream_parameter: dict[str, Stream] = dict()
+        self.response_stream: Optional[Stream] = None
 
         self._before_hook: Optional[RequestBeforeHookFunction] = None
         self._after_hook: Optional[RequestAfterHookFunction] = None
 
+        self._compiled_bind: Optional[BindFunction] = None
+
     @classmethod
     def from_decorator(
         cls,
@@ -185,6 +306,8 @@ class RequestCore:
         )
         new_cls._add_private_key()
         new_cls._delete_response_annotation()
+        new_cls._freeze()
+        new_cls._compiled_bind = compile_bind(new_cls)
         return new_cls
 
     def copy(self) -> Self:
@@ -201,6 +324,15 @@ class RequestCore:
             self.path,
             name=self.name,
             directly_response=self.directly_response,
+            cache=self.cache,
+            coalesce=self.coalesce,
+            rate_limiter=self.rate_limiter,
+            rate_limit_weight=self.rate_limit_weight,
+            retry_policy=self.retry_policy,
+            circuit_breaker=self.circuit_breaker,
+            hedge_policy=self.hedge_policy,
+            middlewares=self.middlewares,
+            event_stream=self.event_stream,
             headers=self.headers,
             params=self.params,
             body=self.body,
@@ -216,13 +348,48 @@ class RequestCore:
 
         new_cls.body_parameter_type = self.body_parameter_type
         new_cls.body_parameter = self.body_parameter
+        new_cls.stream_parameter = self.stream_parameter
+        new_cls.response_stream = self.response_stream
 
         new_cls._before_hook = self._before_hook
         new_cls._after_hook = self._after_hook
 
         new_cls._delete_response_annotation()
+        new_cls._freeze()
+        new_cls._compiled_bind = compile_bind(new_cls)
         return new_cls
 
+    def _freeze(self) -> None:
+        """Make the HTTP components of the request read-only.
+
+        This method used at the end of setup."""
+        self.headers = MappingProxyType(dict(self.headers))
+        self.params = MappingProxyType(dict(self.params))
+        self.request_kwargs = MappingProxyType(dict(self.request_kwargs))
+
+        self.header_parameter = MappingProxyType(dict(self.header_parameter))
+        self.query_parameter = MappingProxyType(dict(self.query_parameter))
+        self.path_parameter = MappingProxyType(dict(self.path_parameter))
+        self.body_form_parameter = MappingProxyType(dict(self.body_form_parameter))
+        self.body_json_parameter = MappingProxyType(dict(self.body_json_parameter))
+        self.stream_parameter = MappingProxyType(dict(self.stream_parameter))
+        self._frozen = True
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        if key in self._FROZEN_ATTRIBUTES and self.__dict__.get("_frozen", False):
+            raise AttributeError("Cannot assign to attribute '%s'. RequestCore is immutable after setup." % key)
+        super().__setattr__(key, value)
+
+    @property
+    def session(self) -> Session:
+        """The session bound to the request. When it is bound, the middlewares are flattened into a handler."""
+        return self._session
+
+    @session.setter
+    def session(self, session: Session) -> None:
+        self._session = session
+        self._handler = None if session is NotImplemented else self._compile_handler(session)
+
     def before_hook(self, func: RequestBeforeHookFunction) -> RequestBeforeHookFunction:
         """A decorator that registers a coroutine as a pre-invoke hook.
         A pre-invoke hook is called directly before the HTTP request is called.
@@ -230,7 +397,7 @@ class RequestCore:
 
         Parameters
         ----------
-        func: Callable[[RequestCore, str], Coroutine[Any, Any, RequestCore]]
+        func: Callable[[Session, RequestState, str], Coroutine[Any, Any, tuple[RequestState, str]]]
             The coroutine to register as the pre-invoke hook.
         """
         if not inspect.iscoroutinefunction(func):
@@ -291,7 +458,7 @@ class RequestCore:
         if self.body_parameter_type is not None:
             return self.body_parameter_type
 
-        if isinstance(self.body, Collection):
+        if isinstance(self.body, Collection) and not is_binary_body(self.body):
             return "json"
         return "data"
 
@@ -426,7 +593,14 @@ class RequestCore:
                 self._duplicated_check_body()
             elif issubclass(component_type, Body) or parameter.name == body_parameter:
                 self._duplicated_check_body_parameter(True)
-                if is_subclass_safe(instance_origin, Collection):
+                is_json = is_subclass_safe(
+                    [t for t in instance_origin if not is_subclass_safe(t, BINARY_BODY_TYPES)], Collection
+                )
+                is_binary = is_subclass_safe(instance_origin, BINARY_BODY_TYPES)
+                if is_json and is_binary:
+                    # The body type is decided by the argument. (ex. dict | bytes)
+                    self.body_parameter_type = None
+                elif is_json:
                     self.body_parameter_type = "json"
                 else:
                     self.body_parameter_type = "data"
@@ -437,6 +611,10 @@ class RequestCore:
                 instance_origin, aiohttp.ClientResponse
             ):
                 self.response_parameter.append(parameter.name)
+            elif (stream := Stream.from_annotation(parameter.annotation)) is not None:
+                self.stream_parameter[parameter.name] = stream
+
+        self.response_stream = Stream.from_annotation(self._signature.return_annotation)
 
     def _delete_response_annotation(self) -> None:
         """Delete the response parameter in signature.
@@ -446,75 +624,69 @@ class RequestCore:
         """
         parameter_without_return_annotation = []
         for parameter in self._signature.parameters.values():
-            if parameter.name in self.response_parameter:
+            if parameter.name in self.response_parameter or parameter.name in self.stream_parameter:
                 continue
 
             parameter_without_return_annotation.append(parameter)
 
         self._signature = self._signature.replace(parameters=parameter_without_return_annotation)
-        for parameter_name in self.response_parameter:
+        for parameter_name in [*self.response_parameter, *self.stream_parameter.keys()]:
             if parameter_name not in self.func.__annotations__.keys():
                 continue
 
             del self.func.__annotations__[parameter_name]
         self.__annotations__ = self.func.__annotations__
 
-    def _fill_parameter(self, bounded_argument: dict[str, Any] | inspect.BoundArguments) -> None:
-        """Fill HTTP request component from bounded argument
+    def _fill_parameter(self, bounded_argument: dict[str, Any] | inspect.BoundArguments) -> RequestState:
+        """Create HTTP request component from bounded argument
 
         Parameters
         ----------
         bounded_argument: dict[str, Any] | inspect.BoundArguments
             bounded argument of the method.
+
+        Returns
+        -------
+        RequestState
+            A new state filled with the HTTP request component.
         """
         if isinstance(bounded_argument, inspect.BoundArguments):
             bounded_argument = bounded_argument.arguments
 
+        state = RequestState(self, self.headers.copy(), self.params.copy(), self.body)
+
         # Header
         for _name, _parameter in self.header_parameter.items():
             # When method argument is None, it can cause an exception during the parsing process.
             if bounded_argument.get(_parameter.name) is None:
                 continue
-            self.headers[_name] = bounded_argument.get(_parameter.name)
+            state.headers[_name] = bounded_argument.get(_parameter.name)
 
         # Parameter
         for _name, _parameter in self.query_parameter.items():
             # When method argument is None, it can cause an exception during the parsing process.
             if bounded_argument.get(_parameter.name) is None:
                 continue
-            self.params[_name] = bounded_argument.get(_parameter.name)
+            state.params[_name] = bounded_argument.get(_parameter.name)
 
         # Body
         self._duplicated_check_body()
         if self.is_formal_form and self.body_parameter is None:  # self.is_body
             form_data = aiohttp.FormData()
             for _name, _parameter in self.body_form_parameter.items():
-                form_data.add_field(_name, bounded_argument.get(_parameter.name))
-            self.body = form_data
+                add_form_field(form_data, _name, bounded_argument.get(_parameter.name))
+            state.body = form_data
         elif len(self.body_json_parameter) > 0 and self.body_parameter is None:
-            self.body = {
+            state.body = {
                 _name: bounded_argument.get(_parameter.name) for _name, _parameter in self.body_json_parameter.items()
             }
         elif self.body_parameter is not None:
-            self.body = bounded_argument.get(self.body_parameter.name)
+            state.body = bounded_argument.get(self.body_parameter.name)
+        return state
 
     def get_request_kwargs(self) -> dict[str, Any]:
-        """Get keyword arguments to call request method"""
-        request_kwargs = copy.deepcopy(self.request_kwargs)
-
-        # Header
-        if len(self.headers) > 0:
-            request_kwargs["headers"] = self.headers
-
-        # Parameter
-        if len(self.params) > 0:
-            request_kwargs["params"] = self.params
-
-        # Body
-        if self.is_body:
-            request_kwargs[str(self.body_type)] = self.body
-
-        return request_kwargs
+        """Get keyword arguments to call request method with default HTTP components."""
+        return RequestState(self, self.headers.copy(), self.params.copy(), self.body).get_request_kwargs()
 
     def _get_request_path(self, bounded_argument: dict[str, Any] | inspect.BoundArguments) -> str:
         """Get final HTTP path from bounded argument
@@ -530,7 +702,7 @@ class RequestCore:
         formatted_argument = dict()
         for _name, _parameter in self.path_parameter.items():
             formatted_argument[_name] = bounded_argument.get(_parameter.name)
-        formatted_path = self.path.format(**formatted_argument)
+        formatted_path = self.path_template.format(formatted_argument)
         return formatted_path
 
     def __eq__(self, other):
@@ -544,6 +716,15 @@ class RequestCore:
             and other.headers == self.headers
             and other.body == self.body
             and other.directly_response == self.directly_response
+            and other.cache == self.cache
+            and other.coalesce == self.coalesce
+            and other.rate_limiter == self.rate_limiter
+            and other.rate_limit_weight == self.rate_limit_weight
+            and other.retry_policy == self.retry_policy
+            and other.circuit_breaker == self.circuit_breaker
+            and other.hedge_policy == self.hedge_policy
+            and other.middlewares == self.middlewares
+            and other.event_stream == self.event_stream
             and other.header_parameter == self.header_parameter
             and other.query_parameter == self.query_parameter
             and other.path_parameter == self.path_parameter
@@ -551,6 +732,8 @@ class RequestCore:
             and other.body_json_parameter == self.body_json_parameter
             and other.body_parameter_type == self.body_parameter_type
             and other.body_parameter == self.body_parameter
+            and other.stream_parameter == self.stream_parameter
+            and other.response_stream == self.response_stream
             and other._before_hook == self._before_hook
             and other._after_hook == self._after_hook
         )
@@ -561,34 +744,248 @@ class RequestCore:
     def __copy__(self) -> Self:
         return self.copy()
 
-    async def __call__(self, *args, **kwargs):
-        if self.session is NotImplemented:
+    def __call__(self, *args, **kwargs):
+        # The coroutine is returned without awaiting it. (No extra await for each call)
+        return self._call(self.session, *args, **kwargs)
+
+    async def _call(self, session: Session, *args, **kwargs):
+        """Call the request with the session. The session is bound to the :class:`RequestState` of this call,
+        so the calls with different sessions (ex. :meth:`Session.single_session`) don't change this request."""
+        if session is NotImplemented:
             raise TypeError("Class must inherit from class Session")
 
-        bound_argument = self._signature.bind(self.session, *args, **kwargs)
-        bound_argument.apply_defaults()
+        # When the call is not sampled by the profiler, the profile is None and nothing is measured.
+        profile = None
+        if session.profiler is not None:
+            profile = session.profiler.sample(self.name)
+        if profile is not None:
+            started_at = measured_at = time.perf_counter_ns()
+
+        try:
+            if self.compiled_call and self._compiled_bind is not None:
+                req_obj, formatted_path, arguments = self._compiled_bind(session, *args, **kwargs)
+                if profile is not None:
+                    profile.record(_profiler.BIND, time.perf_counter_ns() - measured_at)
+            else:
+                bound_argument = self._signature.bind(session, *args, **kwargs)
+                bound_argument.apply_defaults()
+                if profile is not None:
+                    bound_at = time.perf_counter_ns()
+                    profile.record(_profiler.BIND, bound_at - measured_at)
+
+                req_obj = self._fill_parameter(bound_argument)
+                if profile is not None:
+                    measured_at = time.perf_counter_ns()
+                    profile.record(_profiler.FILL_PARAMETER, measured_at - bound_at)
+
+                formatted_path = self._get_request_path(bound_argument)
+                arguments = bound_argument.arguments
+                if profile is not None:
+                    profile.record(_profiler.FORMAT_PATH, time.perf_counter_ns() - measured_at)
+            req_obj.session = session
+            req_obj.profile = profile
+
+            # Detect Server-Sent Events
+            if self.event_stream is not None:
+                return await self._open_event_source(req_obj, formatted_path)
+
+            response = await self._request(req_obj, formatted_path)
+
+            # Detect streaming response
+            if self.response_stream is not None and is_response(response):
+                return self.response_stream.open(response, session.json_codec)
+
+            # Detect directly response
+            if self.directly_response or session.directly_response:
+                if is_response(response):
+                    await response.read()  # Content-Read.
+                return response
+
+            for _parameter in self.response_parameter:
+                kwargs[_parameter] = response
+            if len(self.stream_parameter) == 0:
+                kwargs.update(arguments)
+                if profile is None:
+                    return await self.func(**kwargs)
+
+                measured_at = time.perf_counter_ns()
+                try:
+                    return await self.func(**kwargs)
+                finally:
+                    profile.record(_profiler.FUNCTION, time.perf_counter_ns() - measured_at)
+
+            streams = [_stream.open(response, session.json_codec) for _stream in self.stream_parameter.values()]
+            kwargs.update(zip(self.stream_parameter.keys(), streams))
+            kwargs.update(arguments)
+            try:
+                result = await self.func(**kwargs)
+            except BaseException:
+                for stream in streams:
+                    stream.close()
+                raise
+
+            # The stream which is not returned is closed, when the function is finished.
+            for stream in streams:
+                if stream is not result:
+                    stream.close()
+            return result
+        finally:
+            if profile is not None:
+                profile.record(_profiler.TOTAL, time.perf_counter_ns() - started_at)
+
+    async def _request(self, request: RequestState, path: str):
+        """Send the HTTP request through the middlewares, and return the result of post-invoke hooks."""
+        request.path = request.formatted_path = path
+        session = request.session
+        # The handler is flattened for the bound session. Other sessions flatten their middlewares for the call.
+        handler = self._handler if session is self._session else self._compile_handler(session)
+        if handler is None:
+            response = await self._dispatch(request)
+        else:
+            response = await handler(request)
+        if request.profile is not None:
+            return await self._after_request_profiled(session, request.profile, response)
+
+        if session._is_after_request_overridden:
+            response = await session.after_request(response)
+        if self._after_hook is not None:
+            response = await self._after_hook(session, response)
+        return response
+
+    async def _after_request_profiled(self, session: Session, profile: ProfileStats, response: Any):
+        """Call the post-invoke hooks, measuring them with the profiler."""
+        if session._is_after_request_overridden:
+            measured_at = time.perf_counter_ns()
+            response = await session.after_request(response)
+            profile.record(_profiler.AFTER_REQUEST, time.perf_counter_ns() - measured_at)
+        if self._after_hook is not None:
+            measured_at = time.perf_counter_ns()
+            response = await self._after_hook(session, response)
+            profile.record(_profiler.AFTER_HOOK, time.perf_counter_ns() - measured_at)
+        return response
+
+    async def _dispatch(self, request: RequestState):
+        """Send the HTTP request with the retry policy. It is the innermost handler of the middlewares."""
+        session = request.session
+        retry_policy = self.retry_policy if self.retry_policy is not None else session.retry_policy
+        if retry_policy is None:
+            return await self._send(request, request.path)
+
+        # Every attempt replays the pre-invoke hooks with a copy of the state.
+        return await retry_policy.run(
+            lambda state: self._send(state, state.path),
+            request,
+            budget=session.retry_budget,
+            metrics=session.metrics,
+        )
 
-        req_obj = self.copy()
+    def _compile_handler(self, session: Session) -> Optional[Callable[[RequestState], Awaitable[Any]]]:
+        """Flatten the middlewares of the session and the request into a handler.
+        If there are no middlewares, None is returned and the request is dispatched directly."""
+        middlewares = (*getattr(session, "middlewares", ()), *self.middlewares)
+        if len(middlewares) == 0:
+            return None
+
+        handler = self._dispatch
+        for middleware in reversed(middlewares):
+            handler = _bind_middleware(middleware, handler)
+        return handler
+
+    async def _open_event_source(self, request: RequestState, path: str) -> EventSource:
+        """Open the event source. The request is sent again with `Last-Event-ID` header to reconnect."""
+
+        async def connect(last_event_id: Optional[str]):
+            state = request.copy()
+            if last_event_id is not None:
+                state.headers[LAST_EVENT_ID_HEADER] = last_event_id
+            response = await self._request(state, path)
+            if not is_response(response):
+                raise TypeError("The post-invoke hook of Server-Sent Events request must return the response.")
+            return response
 
-        req_obj._fill_parameter(bound_argument)
-        formatted_path = req_obj._get_request_path(bound_argument)
+        event_source = self.event_stream.open(
+            connect, request.headers.get(LAST_EVENT_ID_HEADER), request.session.json_codec
+        )
+        await event_source.connect()
+        return event_source
 
+    async def _send(self, request: RequestState, path: str):
+        """Send the HTTP request after the pre-invoke hooks. The post-invoke hooks are not called."""
+        session = request.session
         if self._before_hook is not None:
-            req_obj, formatted_path = await self._before_hook(self.session, req_obj, formatted_path)
-        response = await self.session._make_request(req_obj, formatted_path)
-        if self._after_hook is not None:
-            response = await self._after_hook(self.session, response)
+            if request.profile is None:
+                request, path = await self._before_hook(session, request, path)
+            else:
+                profile = request.profile
+                measured_at = time.perf_counter_ns()
+                request, path = await self._before_hook(session, request, path)
+                profile.record(_profiler.BEFORE_HOOK, time.perf_counter_ns() - measured_at)
+        return await session._send_request(request, path)
+
+    async def map(
+        self,
+        arguments: Iterable[Any],
+        *,
+        concurrency: int = 10,
+        return_exceptions: bool = False,
+        timeout: Optional[float] = None,
+    ) -> list[Any]:
+        """Call the request for each item of arguments with bounded concurrency.
+        The results are returned in the order of arguments.
 
-        # Detect directly response
-        if self.directly_response or self.session.directly_response:
-            if isinstance(response, aiohttp.ClientResponse):
-                await response.read()  # Content-Read.
-            return response
+        Parameters
+        ----------
+        arguments: Iterable[Any]
+            Arguments of each call. A mapping is used as keyword arguments, a tuple is used as positional arguments,
+            and others are used as a single positional argument.
+        concurrency: int
+            Maximum number of calls running at the same time.
+        return_exceptions: bool
+            If it is True, an exception of the call is returned as the result.
+            Otherwise, the first exception cancels the remaining calls and is raised.
+        timeout: Optional[float]
+            Deadline of the whole batch in seconds.
+
+        Examples
+        --------
+        >>> results = await client.station_search_with_query.map(
+        ...     [{"name": "Gangnam"}, {"name": "Jamsil"}], concurrency=5
+        ... )
+        """
+        return await gather(
+            (make_call(self, argument) for argument in arguments),
+            concurrency=concurrency,
+            return_exceptions=return_exceptions,
+            timeout=timeout,
+        )
 
-        for _parameter in self.response_parameter:
-            kwargs[_parameter] = response
-        kwargs.update(bound_argument.arguments)
-        return await self.func(**kwargs)
+    def map_as_completed(
+        self,
+        arguments: Iterable[Any],
+        *,
+        concurrency: int = 10,
+        return_exceptions: bool = False,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[tuple[int, Any]]:
+        """Call the request for each item of arguments with bounded concurrency.
+        The parameters are same as :meth:`map`, but the results are yielded in the order of completion.
+
+        Yields
+        ------
+        tuple[int, Any]
+            Index of arguments and the result.
+
+        Examples
+        --------
+        >>> async for index, result in client.station_search_with_query.map_as_completed(names):
+        ...     print(names[index], result)
+        """
+        return as_completed(
+            (make_call(self, argument) for argument in arguments),
+            concurrency=concurrency,
+            return_exceptions=return_exceptions,
+            timeout=timeout,
+        )
 
     @property
     def __request_path__(self) -> str:
@@ -605,6 +1002,14 @@ def request(
     *,
     name: Optional[str] = None,
     directly_response: bool = False,
+    cache: bool = False,
+    coalesce: bool | Collection[str] = False,
+    rate_limiter: Optional[RateLimiter] = None,
+    rate_limit_weight: float = 1,
+    retry_policy: Optional[RetryPolicy] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None,
+    hedge_policy: Optional[HedgePolicy] = None,
+    middlewares: Optional[Sequence[Middleware]] = None,
     params: Optional[dict[str, Any]] = None,
     headers: Optional[dict[str, Any]] = None,
     body: Optional[aiohttp.FormData | Any] = None,
@@ -636,6 +1041,29 @@ def request(
         Request body.
     directly_response: bool
         Returns a `aiohttp.ClientResponse` without executing the function's body statement.
+    cache: bool
+        Cache the response following HTTP caching semantics (`Cache-Control`, `Expires`, `ETag`, `Last-Modified`).
+        The response is stored in :attr:`Session.response_cache`.
+    coalesce: bool | Collection[str]
+        Coalesce identical in-flight requests (GET, HEAD and OPTIONS) into a single HTTP request.
+        The requests are identical when the method, final path, params and headers are same.
+        If it is a collection of header names, only the headers are compared.
+    rate_limiter: Optional[RateLimiter]
+        Limit the request rate of this request. It is applied with :attr:`Session.rate_limiter`.
+        Responses served from the cache or coalesced requests don't use tokens.
+    rate_limit_weight: float
+        Number of tokens used by this request in the rate limiters of the request and the session.
+    retry_policy: Optional[RetryPolicy]
+        Retry the failed request following the policy instead of :attr:`Session.retry_policy`.
+        To disable retries of this request, give `RetryPolicy(attempts=1)`.
+    circuit_breaker: Optional[CircuitBreaker]
+        Fail fast with :class:`CircuitOpenError` while the circuit of this request is open.
+        It is applied with :attr:`Session.circuit_breaker`.
+    hedge_policy: Optional[HedgePolicy]
+        Send an identical request when the response is not returned until the delay of policy,
+        and return the first response. Only idempotent methods are hedged.
+    middlewares: Optional[Sequence[Middleware]]
+        Middlewares wrapping the call of this request. (See :attr:`Session.middlewares`)
     header_parameter: list[str]
         Function parameter names used in the header
     query_parameter: list[str]
@@ -668,6 +1096,14 @@ def request(
             headers=headers,
             body=body,
             directly_response=directly_response,
+            cache=cache,
+            coalesce=coalesce,
+            rate_limiter=rate_limiter,
+            rate_limit_weight=rate_limit_weight,
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+            hedge_policy=hedge_policy,
+            middlewares=middlewares,
             header_parameter=header_parameter,
             query_parameter=query_parameter,
             form_parameter=form_parameter,
@@ -686,6 +1122,14 @@ def get(
     *,
     name: Optional[str] = None,
     directly_response: bool = False,
+    cache: bool = False,
+    coalesce: bool | Collection[str] = False,
+    rate_limiter: Optional[RateLimiter] = None,
+    rate_limit_weight: float = 1,
+    retry_policy: Optional[RetryPolicy] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None,
+    hedge_policy: Optional[HedgePolicy] = None,
+    middlewares: Optional[Sequence[Middleware]] = None,
     params: Optional[dict[str, Any]] = None,
     headers: Optional[dict[str, Any]] = None,
     body: Optional[aiohttp.FormData | Any] = None,
@@ -708,6 +1152,14 @@ def get(
             headers=headers,
             body=body,
             directly_response=directly_response,
+            cache=cache,
+            coalesce=coalesce,
+            rate_limiter=rate_limiter,
+            rate_limit_weight=rate_limit_weight,
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+            hedge_policy=hedge_policy,
+            middlewares=middlewares,
             header_parameter=header_parameter,
             query_parameter=query_parameter,
             form_parameter=form_parameter,
@@ -726,6 +1178,14 @@ def post(
     *,
     name: Optional[str] = None,
     directly_response: bool = False,
+    cache: bool = False,
+    coalesce: bool | Collection[str] = False,
+    rate_limiter: Optional[RateLimiter] = None,
+    rate_limit_weight: float = 1,
+    retry_policy: Optional[RetryPolicy] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None,
+    hedge_policy: Optional[HedgePolicy] = None,
+    middlewares: Optional[Sequence[Middleware]] = None,
     params: Optional[dict[str, Any]] = None,
     headers: Optional[dict[str, Any]] = None,
     body: Optional[aiohttp.FormData | Any] = None,
@@ -748,6 +1208,14 @@ def post(
             headers=headers,
             body=body,
             directly_response=directly_response,
+            cache=cache,
+            coalesce=coalesce,
+            rate_limiter=rate_limiter,
+            rate_limit_weight=rate_limit_weight,
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+            hedge_policy=hedge_policy,
+            middlewares=middlewares,
             header_parameter=header_parameter,
             query_parameter=query_parameter,
             form_parameter=form_parameter,
@@ -766,6 +1234,14 @@ def options(
     *,
     name: Optional[str] = None,
     directly_response: bool = False,
+    cache: bool = False,
+    coalesce: bool | Collection[str] = False,
+    rate_limiter: Optional[RateLimiter] = None,
+    rate_limit_weight: float = 1,
+    retry_policy: Optional[RetryPolicy] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None,
+    hedge_policy: Optional[HedgePolicy] = None,
+    middlewares: Optional[Sequence[Middleware]] = None,
     params: Optional[dict[str, Any]] = None,
     headers: Optional[dict[str, Any]] = None,
     body: Optional[aiohttp.FormData | Any] = None,
@@ -788,6 +1264,14 @@ def options(
             headers=headers,
             body=body,
             directly_response=directly_response,
+            cache=cache,
+            coalesce=coalesce,
+            rate_limiter=rate_limiter,
+            rate_limit_weight=rate_limit_weight,
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+            hedge_policy=hedge_policy,
+            middlewares=middlewares,
             header_parameter=header_parameter,
             query_parameter=query_parameter,
             form_parameter=form_parameter,
@@ -806,6 +1290,14 @@ def put(
     *,
     name: Optional[str] = None,
     directly_response: bool = False,
+    cache: bool = False,
+    coalesce: bool | Collection[str] = False,
+    rate_limiter: Optional[RateLimiter] = None,
+    rate_limit_weight: float = 1,
+    retry_policy: Optional[RetryPolicy] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None,
+    hedge_policy: Optional[HedgePolicy] = None,
+    middlewares: Optional[Sequence[Middleware]] = None,
     params: Optional[dict[str, Any]] = None,
     headers: Optional[dict[str, Any]] = None,
     body: Optional[aiohttp.FormData | Any] = None,
@@ -828,6 +1320,14 @@ def put(
             headers=headers,
             body=body,
             directly_response=directly_response,
+            cache=cache,
+            coalesce=coalesce,
+            rate_limiter=rate_limiter,
+            rate_limit_weight=rate_limit_weight,
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+            hedge_policy=hedge_policy,
+            middlewares=middlewares,
             header_parameter=header_parameter,
             query_parameter=query_parameter,
             form_parameter=form_parameter,
@@ -846,6 +1346,14 @@ def delete(
     *,
     name: Optional[str] = None,
     directly_response: bool = False,
+    cache: bool = False,
+    coalesce: bool | Collection[str] = False,
+    rate_limiter: Optional[RateLimiter] = None,
+    rate_limit_weight: float = 1,
+    retry_policy: Optional[RetryPolicy] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None,
+    hedge_policy: Optional[HedgePolicy] = None,
+    middlewares: Optional[Sequence[Middleware]] = None,
     params: Optional[dict[str, Any]] = None,
     headers: Optional[dict[str, Any]] = None,
     body: Optional[aiohttp.FormData | Any] = None,
@@ -868,6 +1376,14 @@ def delete(
             headers=headers,
             body=body,
             directly_response=directly_response,
+            cache=cache,
+            coalesce=coalesce,
+            rate_limiter=rate_limiter,
+            rate_limit_weight=rate_limit_weight,
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+            hedge_policy=hedge_policy,
+            middlewares=middlewares,
             header_parameter=header_parameter,
             query_parameter=query_parameter,
             form_parameter=form_parameter,
@@ -879,3 +1395,100 @@ def delete(
         )
 
     return decorator
+
+
+def sse(
+    path: str,
+    *,
+    method: str = aiohttp.hdrs.METH_GET,
+    name: Optional[str] = None,
+    retry: float = 3.0,
+    heartbeat_timeout: Optional[float] = None,
+    max_reconnects: Optional[int] = None,
+    chunk_size: int = 64 * 1024,
+    rate_limiter: Optional[RateLimiter] = None,
+    rate_limit_weight: float = 1,
+    retry_policy: Optional[RetryPolicy] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None,
+    middlewares: Optional[Sequence[Middleware]] = None,
+    params: Optional[dict[str, Any]] = None,
+    headers: Optional[dict[str, Any]] = None,
+    body: Optional[aiohttp.FormData | Any] = None,
+    header_parameter: list[str] = None,
+    query_parameter: list[str] = None,
+    form_parameter: list[str] = None,
+    body_json_parameter: list[str] = None,
+    path_parameter: list[str] = None,
+    body_parameter: Optional[str] = None,
+    **request_kwargs,
+):
+    """A decoration for making Server-Sent Events request.
+    The decorated function returns an :class:`EventSource` yielding :class:`ServerSentEvent`,
+    without executing the function's body statement.
+
+    Parameters
+    ----------
+    path: str
+        Request path. Path connects to the base url.
+    method: str
+        HTTP method (example. GET, POST)
+    name: Optional[str]
+        The name of the Request
+    retry: float
+        Seconds to wait before reconnecting. The `retry` field of the server overrides it.
+    heartbeat_timeout: Optional[float]
+        When no bytes (including comments) are received for this seconds, the stream is reconnected.
+    max_reconnects: Optional[int]
+        Maximum number of consecutive reconnections. If it is None, the stream reconnects without limit.
+    chunk_size: int
+        Maximum size of bytes read at once.
+
+    The other parameters are same as :func:`request`.
+    The default timeout of request is `aiohttp.ClientTimeout(total=None, sock_connect=30)`,
+    because the stream is not finished.
+
+    Examples
+    --------
+    >>> class NotificationAPI(Session):
+    ...     @sse("/notifications", heartbeat_timeout=30)
+    ...     async def notifications(self, channel: Query | str) -> EventSource:
+    ...         pass
+    ...
+    >>> async with NotificationAPI("https://api.yhs.kr") as client:
+    ...     async for event in await client.notifications(channel="metro"):
+    ...         print(event.event, event.data)
+    """
+    _headers = {aiohttp.hdrs.ACCEPT: "text/event-stream", aiohttp.hdrs.CACHE_CONTROL: "no-cache"}
+    _headers.update(headers or dict())
+    request_kwargs.setdefault("timeout", aiohttp.ClientTimeout(total=None, sock_connect=30))
+
+    def decorator(func):
+        return RequestCore.from_decorator(
+            func,
+            method,
+            path,
+            name=name,
+            params=params,
+            headers=_headers,
+            body=body,
+            rate_limiter=rate_limiter,
+            rate_limit_weight=rate_limit_weight,
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+            middlewares=middlewares,
+            event_stream=EventStream(
+                retry=retry,
+                heartbeat_timeout=heartbeat_timeout,
+                max_reconnects=max_reconnects,
+                chunk_size=chunk_size,
+            ),
+            header_parameter=header_parameter,
+            query_parameter=query_parameter,
+            form_parameter=form_parameter,
+            body_json_parameter=body_json_parameter,
+            path_parameter=path_parameter,
+            body_parameter=body_parameter,
+            **request_kwargs,
+        )
+
+    return decorator
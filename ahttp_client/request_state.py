@@ -0,0 +1,188 @@
+"""MIT License
+
+Copyright (c) 2023-present gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Collection
+from typing import TYPE_CHECKING
+
+from .payload import is_binary_body, make_payload
+
+if TYPE_CHECKING:
+    import aiohttp
+
+    from typing import Any, Literal, Optional
+    from typing_extensions import Self
+
+    from .codec import JsonCodec
+    from .profiler import ProfileStats
+    from .request import RequestCore
+    from .session import Session
+
+
+class RequestState:
+    """HTTP components of a single request call.
+    A RequestState is created every time the :class:`RequestCore` is called,
+    and it is passed to the pre-invoke hooks instead of the RequestCore.
+
+    Attributes
+    ----------
+    core: RequestCore
+        The request (endpoint template) that created this state.
+    session: Optional[Session]
+        The session sending this call. It is set when the request is called.
+    headers: dict[str, Any]
+        Request headers.
+    params: dict[str, Any]
+        Request parameters.
+    body: Optional[Any | aiohttp.FormData]
+        Request body.
+    body_parameter_type: Literal['json', 'data'] | None
+        The type of body parameter. When it is None, the type follows the type of body.
+    path: Optional[str]
+        The final path of the request. It is set before the middlewares are invoked.
+    formatted_path: Optional[str]
+        The percent-encoded path formatted by the path template.
+        If the path of request is changed by hooks, the changed path is encoded again.
+    profile: Optional[ProfileStats]
+        The stats of :class:`Profiler`, when the call is sampled. Otherwise, it is None.
+    """
+
+    __slots__ = (
+        "core",
+        "session",
+        "headers",
+        "params",
+        "body",
+        "body_parameter_type",
+        "path",
+        "formatted_path",
+        "profile",
+    )
+
+    def __init__(
+        self,
+        core: RequestCore,
+        headers: dict[str, Any],
+        params: dict[str, Any],
+        body: Optional[Any | aiohttp.FormData] = None,
+    ):
+        self.core = core
+        self.session: Optional[Session] = None
+        self.headers = headers
+        self.params = params
+        self.body = body
+        self.body_parameter_type: Optional[Literal["json", "data"]] = core.body_parameter_type
+        self.path: Optional[str] = None
+        self.formatted_path: Optional[str] = None
+        self.profile: Optional[ProfileStats] = None
+
+    @property
+    def name(self) -> str:
+        """The name of the request."""
+        return self.core.name
+
+    @property
+    def method(self) -> str:
+        """HTTP method (example. GET, POST)"""
+        return self.core.method
+
+    @property
+    def is_body(self) -> bool:
+        """Returns whether the HTTP request has a body element.
+
+        Returns
+        -------
+        :class:`bool`
+        """
+        return (
+            self.body is not None
+            or self.core.body_parameter is not None
+            or self.core.is_formal_form
+            or len(self.core.body_json_parameter) > 0
+        )
+
+    @property
+    def body_type(self) -> Literal["json", "data"]:
+        """Returns the final body type
+
+        Returns
+        -------
+        :class:`Literal`['json', 'data']
+        """
+        if self.body_parameter_type is not None:
+            return self.body_parameter_type
+
+        if isinstance(self.body, Collection) and not is_binary_body(self.body):
+            return "json"
+        return "data"
+
+    def copy(self) -> Self:
+        """Creates a copy of this state. The headers and params are copied, but the body is shared.
+
+        Returns
+        -------
+        :class:`RequestState`
+            A new instance of this state.
+        """
+        new_state = RequestState(self.core, self.headers.copy(), self.params.copy(), self.body)
+        new_state.session = self.session
+        new_state.body_parameter_type = self.body_parameter_type
+        new_state.path = self.path
+        new_state.formatted_path = self.formatted_path
+        new_state.profile = self.profile
+        return new_state
+
+    def get_request_kwargs(self, json_codec: Optional[JsonCodec] = None) -> dict[str, Any]:
+        """Get keyword arguments to call request method
+
+        Parameters
+        ----------
+        json_codec: Optional[JsonCodec]
+            The codec encoding the JSON body. If it is given, the JSON body is encoded to bytes
+            and passed as `data` instead of `json`.
+        """
+        request_kwargs = self.core.request_kwargs.copy()
+
+        # Header
+        if len(self.headers) > 0:
+            request_kwargs["headers"] = self.headers
+
+        # Parameter
+        if len(self.params) > 0:
+            request_kwargs["params"] = self.params
+
+        # Body
+        if self.is_body:
+            body_type = self.body_type
+            # A path, memoryview or mmap is streamed as a payload.
+            if body_type == "data":
+                request_kwargs["data"] = make_payload(self.body)
+            elif json_codec is not None and self.body is not None:
+                request_kwargs["data"] = json_codec.encode(self.body)
+                if not any(key.lower() == "content-type" for key in self.headers.keys()):
+                    request_kwargs["headers"] = {**self.headers, "Content-Type": json_codec.content_type}
+            else:
+                request_kwargs["json"] = self.body
+
+        return request_kwargs
@@ -0,0 +1,200 @@
+"""MIT License
+
+Copyright (c) 2023-present gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from .codec import default_codec
+
+if TYPE_CHECKING:
+    from types import TracebackType
+    from typing import Any, Callable, Optional
+    from typing_extensions import Self
+
+    from .codec import JsonCodec
+
+
+def _parse_content_type(value: str) -> tuple[str, dict[str, str]]:
+    mimetype, *parameters = value.split(";")
+    parsed_parameters = dict()
+    for parameter in parameters:
+        key, _, parameter_value = parameter.partition("=")
+        parsed_parameters[key.strip().lower()] = parameter_value.strip().strip('"')
+    return mimetype.strip().lower(), parsed_parameters
+
+
+class BufferedResponse:
+    """An HTTP response whose body has already been read into memory.
+    It supports the reading interface of `aiohttp.ClientResponse`,
+    and is returned when a response is replayed. (For example, a response from the cache)
+
+    Attributes
+    ----------
+    method: str
+        HTTP method of the request.
+    url: yarl.URL
+        URL of the request.
+    status: int
+        HTTP status code of the response.
+    reason: Optional[str]
+        HTTP status reason of the response.
+    headers: CIMultiDictProxy[str]
+        HTTP headers of the response.
+    from_cache: bool
+        Whether the response is served from the response cache.
+    json_codec: Optional[JsonCodec]
+        The JSON codec decoding the body in :meth:`json`. (:attr:`Session.json_codec` for the response of request)
+        If it is None, the default JSON codec is used.
+    """
+
+    __slots__ = ("method", "url", "status", "reason", "headers", "from_cache", "json_codec", "_body")
+
+    def __init__(
+        self,
+        method: str,
+        url: URL | str,
+        status: int,
+        reason: Optional[str],
+        headers: CIMultiDictProxy[str] | CIMultiDict[str] | list[tuple[str, str]],
+        body: bytes,
+        json_codec: Optional[JsonCodec] = None,
+    ):
+        self.method = method
+        self.url = URL(url)
+        self.status = status
+        self.reason = reason
+        self.headers: CIMultiDictProxy[str] = CIMultiDictProxy(CIMultiDict(headers))
+        self.from_cache = False
+        self.json_codec = json_codec
+        self._body = body
+
+    @classmethod
+    async def from_response(cls, response: aiohttp.ClientResponse, json_codec: Optional[JsonCodec] = None) -> Self:
+        """Read the body of `aiohttp.ClientResponse` and create a buffered response."""
+        body = await response.read()
+        return cls(response.method, response.url, response.status, response.reason, response.headers, body, json_codec)
+
+    @property
+    def ok(self) -> bool:
+        return 400 > self.status
+
+    @property
+    def closed(self) -> bool:
+        return True
+
+    @property
+    def content_type(self) -> str:
+        mimetype, _ = _parse_content_type(self.headers.get(aiohttp.hdrs.CONTENT_TYPE, "application/octet-stream"))
+        return mimetype
+
+    @property
+    def charset(self) -> Optional[str]:
+        _, parameters = _parse_content_type(self.headers.get(aiohttp.hdrs.CONTENT_TYPE, ""))
+        return parameters.get("charset")
+
+    @property
+    def content_length(self) -> int:
+        return len(self._body)
+
+    @property
+    def request_info(self) -> aiohttp.RequestInfo:
+        return aiohttp.RequestInfo(self.url, self.method, CIMultiDictProxy(CIMultiDict()), self.url)
+
+    @property
+    def history(self) -> tuple:
+        return ()
+
+    def get_encoding(self) -> str:
+        return self.charset or "utf-8"
+
+    def raise_for_status(self) -> None:
+        if self.ok:
+            return
+        raise aiohttp.ClientResponseError(
+            self.request_info,
+            self.history,
+            status=self.status,
+            message=self.reason or "",
+            headers=self.headers,
+        )
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self, encoding: Optional[str] = None, errors: str = "strict") -> str:
+        return self._body.decode(encoding or self.get_encoding(), errors=errors)
+
+    async def json(
+        self,
+        *,
+        encoding: Optional[str] = None,
+        loads: Optional[Callable[[str], Any]] = None,
+        content_type: Optional[str] = "application/json",
+    ) -> Any:
+        if content_type and content_type not in self.content_type:
+            raise aiohttp.ContentTypeError(
+                self.request_info,
+                self.history,
+                status=self.status,
+                message="Attempt to decode JSON with unexpected mimetype: %s" % self.content_type,
+                headers=self.headers,
+            )
+
+        stripped = self._body.strip()
+        if not stripped:
+            return None
+        if loads is None:
+            # The JSON codec decodes straight from bytes.
+            return (self.json_codec or default_codec()).decode(
+                stripped if encoding is None else stripped.decode(encoding)
+            )
+        return loads(stripped.decode(encoding or self.get_encoding()))
+
+    def release(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        pass
+
+
+def is_response(response: Any) -> bool:
+    """
+    Return `True` if response is `aiohttp.ClientResponse` or :class:`BufferedResponse`
+    """
+    return isinstance(response, (aiohttp.ClientResponse, BufferedResponse))
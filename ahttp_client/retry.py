@@ -0,0 +1,339 @@
+"""MIT License
+
+Copyright (c) 2023-present gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import email.utils
+import logging
+import random
+import time
+import uuid
+from typing import TYPE_CHECKING
+
+import aiohttp
+
+from .payload import is_replayable_body
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+    from typing import Awaitable, Callable, Optional
+
+    from .metrics import MetricsRegistry
+    from .request_state import RequestState
+    from .response import BufferedResponse
+
+    Response = aiohttp.ClientResponse | BufferedResponse
+
+_log = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset(
+    {
+        aiohttp.hdrs.METH_GET,
+        aiohttp.hdrs.METH_HEAD,
+        aiohttp.hdrs.METH_OPTIONS,
+        aiohttp.hdrs.METH_TRACE,
+        aiohttp.hdrs.METH_PUT,
+        aiohttp.hdrs.METH_DELETE,
+    }
+)
+RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+RETRY_EXCEPTIONS = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Returns seconds to wait from the value of `Retry-After` header. (delay-seconds or HTTP-date)
+
+    Parameters
+    ----------
+    value: Optional[str]
+        The value of `Retry-After` header.
+
+    Returns
+    -------
+    Optional[float]
+        Seconds to wait. If the value is invalid, it returns None.
+    """
+    if value is None:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, (retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+
+class RetryBudget:
+    """Limit the ratio of retries to requests, so that the retries don't amplify an outage.
+
+    Requests and retries are counted in one second buckets of the sliding window.
+    A retry is allowed when the retries in the window are fewer than `min_retries + ratio * requests`.
+
+    Parameters
+    ----------
+    ratio: float
+        Ratio of retries allowed to requests.
+    min_retries: int
+        Number of retries allowed in the window regardless of the ratio. (It is useful for low traffic.)
+    window: int
+        Length of the sliding window in seconds.
+    """
+
+    def __init__(self, ratio: float = 0.2, *, min_retries: int = 10, window: int = 10):
+        if ratio < 0:
+            raise ValueError("ratio must be greater than or equal to 0.")
+        if min_retries < 0:
+            raise ValueError("min_retries must be greater than or equal to 0.")
+        if window < 1:
+            raise ValueError("window must be greater than or equal to 1.")
+
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = int(window)
+
+        self._seconds: list[int] = [0] * self.window
+        self._requests: list[int] = [0] * self.window
+        self._retries: list[int] = [0] * self.window
+
+    def _bucket(self) -> int:
+        second = int(time.monotonic())
+        index = second % self.window
+        if self._seconds[index] != second:
+            self._seconds[index] = second
+            self._requests[index] = 0
+            self._retries[index] = 0
+        return index
+
+    def _sum(self, counter: list[int]) -> int:
+        oldest = int(time.monotonic()) - self.window
+        return sum(count for second, count in zip(self._seconds, counter) if second > oldest)
+
+    @property
+    def requests(self) -> int:
+        """Number of requests in the window."""
+        return self._sum(self._requests)
+
+    @property
+    def retries(self) -> int:
+        """Number of retries in the window."""
+        return self._sum(self._retries)
+
+    def record_request(self) -> None:
+        self._requests[self._bucket()] += 1
+
+    def record_retry(self) -> None:
+        self._retries[self._bucket()] += 1
+
+    def can_retry(self) -> bool:
+        """Returns whether a retry is allowed now."""
+        return self.retries < self.min_retries + self.ratio * self.requests
+
+
+class RetryPolicy:
+    """A policy to retry failed requests with exponential backoff and decorrelated jitter.
+    It can be configured to :class:`Session` (`retry_policy`), and overridden by a request.
+
+    Each attempt replays the pre-invoke hooks (:meth:`RequestCore.before_hook` and :meth:`Session.before_request`)
+    with a copy of the original :class:`RequestState`.
+
+    Parameters
+    ----------
+    attempts: int
+        Maximum number of attempts including the first request. If it is 1, the request is not retried.
+    backoff_base: float
+        The minimum delay between attempts in seconds.
+    backoff_max: float
+        The maximum delay between attempts in seconds.
+    statuses: Collection[int]
+        Response statuses to retry.
+    exceptions: tuple[type[BaseException], ...]
+        Exceptions to retry.
+    methods: Collection[str]
+        HTTP methods to retry. A request of other methods is retried only when `Idempotency-Key` header exists.
+    idempotency_key: bool
+        If it is True, a generated `Idempotency-Key` header is attached to requests of non-idempotent methods
+        (ex. POST), and the requests are retried with the same key.
+    respect_retry_after: bool
+        If it is True, the delay follows the `Retry-After` response header.
+    max_retry_after: float
+        When the `Retry-After` is longer than this, the request is not retried.
+
+    Examples
+    --------
+    >>> class MetroAPI(Session):
+    ...     retry_policy = RetryPolicy(attempts=3, backoff_base=0.2)
+    ...
+    ...     @request("POST", "/payment", retry_policy=RetryPolicy(attempts=5, idempotency_key=True))
+    ...     async def payment(self, amount: BodyJson | int) -> aiohttp.ClientResponse:
+    ...         pass
+    """
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        *,
+        backoff_base: float = 0.1,
+        backoff_max: float = 10.0,
+        statuses: Collection[int] = RETRY_STATUSES,
+        exceptions: tuple[type[BaseException], ...] = RETRY_EXCEPTIONS,
+        methods: Collection[str] = IDEMPOTENT_METHODS,
+        idempotency_key: bool = False,
+        respect_retry_after: bool = True,
+        max_retry_after: float = 60.0,
+    ):
+        if attempts < 1:
+            raise ValueError("attempts must be greater than or equal to 1.")
+        if backoff_base < 0 or backoff_max < backoff_base:
+            raise ValueError("backoff_max must be greater than or equal to backoff_base, and both must be positive.")
+
+        self.attempts = attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.statuses = frozenset(statuses)
+        self.exceptions = tuple(exceptions)
+        self.methods = frozenset(method.upper() for method in methods)
+        self.idempotency_key = idempotency_key
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+
+    def __repr__(self) -> str:
+        return "<RetryPolicy attempts=%s backoff_base=%s backoff_max=%s>" % (
+            self.attempts,
+            self.backoff_base,
+            self.backoff_max,
+        )
+
+    def next_delay(self, previous_delay: Optional[float] = None) -> float:
+        """Returns the next delay with decorrelated jitter. (`min(max, uniform(base, previous * 3))`)
+
+        Parameters
+        ----------
+        previous_delay: Optional[float]
+            The previous delay. If it is None, the delay of first retry is returned.
+        """
+        previous_delay = previous_delay or self.backoff_base
+        return min(self.backoff_max, random.uniform(self.backoff_base, previous_delay * 3))
+
+    @staticmethod
+    def _has_idempotency_key(request: RequestState) -> bool:
+        return any(str(key).lower() == IDEMPOTENCY_KEY_HEADER.lower() for key in request.headers.keys())
+
+    def is_retryable(self, request: RequestState) -> bool:
+        """Returns whether the request can be retried following the method and `Idempotency-Key` header.
+        The request with a body which can't be sent again (ex. async iterable) is not retried."""
+        if not is_replayable_body(request.body):
+            return False
+        return request.method.upper() in self.methods or self._has_idempotency_key(request)
+
+    def _get_delay(self, previous_delay: Optional[float], response: Optional[Response]) -> Optional[float]:
+        delay = self.next_delay(previous_delay)
+        if response is None or not self.respect_retry_after:
+            return delay
+
+        retry_after = parse_retry_after(response.headers.get(aiohttp.hdrs.RETRY_AFTER))
+        if retry_after is None:
+            return delay
+        if retry_after > self.max_retry_after:
+            return None
+        return max(delay, retry_after)
+
+    async def run(
+        self,
+        send: Callable[[RequestState], Awaitable[Response]],
+        request: RequestState,
+        *,
+        budget: Optional[RetryBudget] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> Response:
+        """Call the `send` function with a copy of request until it succeeds or the retries are exhausted.
+
+        Parameters
+        ----------
+        send: Callable[[RequestState], Awaitable[aiohttp.ClientResponse]]
+            A coroutine function sending the request.
+        request: RequestState
+            The original state of request.
+        budget: Optional[RetryBudget]
+            The retry budget shared by requests.
+        metrics: Optional[MetricsRegistry]
+            The metrics registry counting the retries.
+
+        Returns
+        -------
+        aiohttp.ClientResponse
+            The response of last attempt. If the last attempt raised an exception, the exception is raised.
+        """
+        if (
+            self.idempotency_key
+            and request.method.upper() not in self.methods
+            and not self._has_idempotency_key(request)
+        ):
+            request.headers[IDEMPOTENCY_KEY_HEADER] = str(uuid.uuid4())
+        retryable = self.attempts > 1 and self.is_retryable(request)
+        if budget is not None:
+            budget.record_request()
+
+        delay = None
+        attempt = 1
+        while True:
+            try:
+                response = await send(request.copy())
+            except self.exceptions as exc:
+                if not retryable or attempt >= self.attempts or not self._allowed_by(budget):
+                    raise
+                delay = self._get_delay(delay, None)
+                reason = type(exc).__name__
+            else:
+                if not retryable or attempt >= self.attempts or response.status not in self.statuses:
+                    return response
+
+                next_delay = self._get_delay(delay, response)
+                if next_delay is None or not self._allowed_by(budget):
+                    return response
+                delay = next_delay
+                reason = response.status
+                response.release()
+
+            if budget is not None:
+                budget.record_retry()
+            if metrics is not None:
+                metrics.record_retry(request.name)
+            _log.debug(
+                "Request Retried: [%s] %s (attempt=%d, reason=%s, delay=%.3f)"
+                % (request.method, request.name, attempt, reason, delay)
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _allowed_by(budget: Optional[RetryBudget]) -> bool:
+        return budget is None or budget.can_retry()
@@ -27,25 +27,104 @@ import asyncio
 import functools
 import inspect
 import logging
+import time
 from typing import TYPE_CHECKING, TypeVar
 
 import aiohttp
-
+from yarl import URL
+
+from . import batch
+from .cache import ResponseCache, SAFE_METHODS
+from .circuit import CircuitBreaker
+from .codec import JsonCodec, default_codec
+from .coalesce import RequestCoalescer
+from .pool import PoolConfig, SessionPool, default_pool
+from .metrics import MetricsRegistry
+from .profiler import Profiler, NETWORK, BEFORE_REQUEST, REQUEST_KWARGS
+from .ratelimit import RateLimiter
+from .retry import RetryBudget, RetryPolicy
 from .request import RequestCore
+from .response import BufferedResponse
+from .trace import NetworkTracer
 
 if TYPE_CHECKING:
+    from .request_state import RequestState
     from typing_extensions import Self
     from types import TracebackType
-    from typing import Optional
+    from collections.abc import Awaitable, Sequence
+    from typing import Any, Optional
 
-    from ._types import RequestFunction
+    from ._types import Middleware, RequestFunction
 
 T = TypeVar("T")
 _log = logging.getLogger(__name__)
 
 
 class Session:
-    """A class to manage session for managing decoration functions."""
+    """A class to manage session for managing decoration functions.
+
+    Attributes
+    ----------
+    pool_config: Optional[PoolConfig]
+        Configuration of the connection pool. It can be defined as a class attribute or a constructor argument.
+        If it is None or `connector` is given, the connection pool follows the `aiohttp.ClientSession`.
+    response_cache: Optional[ResponseCache]
+        The HTTP cache for requests with `cache` enabled.
+        If it is None, an in-memory cache is created when a cached request is called first.
+    rate_limiter: Optional[RateLimiter]
+        The rate limiter applied to every request of the session.
+    retry_policy: Optional[RetryPolicy]
+        The retry policy applied to requests of the session. A request can override it with `retry_policy`.
+    retry_budget: Optional[RetryBudget]
+        The budget limiting the ratio of retries to requests of the session.
+        If it is None, a :class:`RetryBudget` with default values is created for each session.
+    circuit_breaker: Optional[CircuitBreaker]
+        The circuit breaker applied to every request of the session.
+    json_codec: Optional[JsonCodec]
+        The JSON codec encoding the JSON body of requests and decoding the JSON records of responses.
+        If it is None, the codec of the standard library is used. A faster codec is opt-in.
+        (ex. `OrjsonCodec()` or :func:`fastest_codec`)
+    middlewares: Sequence[Middleware]
+        Middlewares wrapping every request of the session. A middleware is a coroutine function
+        taking the :class:`RequestState` and `call_next`, and it returns the response of `await call_next(request)`.
+        It can change the request, wrap the call (ex. timing, authorization) or return a response without calling.
+        The middlewares of the session are invoked in order, and the middlewares of the request are invoked inside.
+        They are flattened into a single handler when the request is bound to the session.
+    tracer: Optional[NetworkTracer]
+        The tracer recording the network phases (DNS, connection queue, connect, send, TTFB and body)
+        of each request. The timings are returned by :meth:`network_timings`.
+    profiler: Optional[Profiler]
+        The profiler measuring the time spent inside ahttp_client for each call. The aggregates are returned by
+        :meth:`stats`.
+    metrics: Optional[MetricsRegistry]
+        The registry recording the request counts, in-flight requests, latency, response size, retries,
+        cache hits and errors of each request. The metrics are labeled by the name of request,
+        and exported by :meth:`MetricsRegistry.render` in the text format of Prometheus.
+
+    Examples
+    --------
+    >>> async def timing(request: RequestState, call_next):
+    ...     started_at = time.perf_counter()
+    ...     try:
+    ...         return await call_next(request)
+    ...     finally:
+    ...         print(request.name, time.perf_counter() - started_at)
+    ...
+    >>> class MetroAPI(Session):
+    ...     middlewares = (timing,)
+    """
+
+    pool_config: Optional[PoolConfig] = PoolConfig()
+    response_cache: Optional[ResponseCache] = None
+    rate_limiter: Optional[RateLimiter] = None
+    retry_policy: Optional[RetryPolicy] = None
+    retry_budget: Optional[RetryBudget] = None
+    circuit_breaker: Optional[CircuitBreaker] = None
+    json_codec: Optional[JsonCodec] = None
+    middlewares: Sequence[Middleware] = ()
+    tracer: Optional[NetworkTracer] = None
+    profiler: Optional[Profiler] = None
+    metrics: Optional[MetricsRegistry] = None
 
     def __init__(
         self,
@@ -53,14 +132,73 @@ class Session:
         *,
         directly_response: bool = False,
         loop: asyncio.AbstractEventLoop = None,
+        pool_config: Optional[PoolConfig] = None,
+        response_cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        json_codec: Optional[JsonCodec] = None,
+        middlewares: Optional[Sequence[Middleware]] = None,
+        tracer: Optional[NetworkTracer] = None,
+        profiler: Optional[Profiler] = None,
+        metrics: Optional[MetricsRegistry] = None,
         _is_single_session: bool = False,
+        _session_pool: Optional[SessionPool] = None,
         **kwargs,
     ):
         self.directly_response = directly_response
         self.base_url = base_url
         self.loop = loop
 
-        self.session = aiohttp.ClientSession(self.base_url, loop=self.loop, **kwargs)
+        # The base url is parsed once, and the URL of request is joined with it.
+        self._base_url: Optional[URL] = URL(base_url) if base_url else None
+
+        if pool_config is not None:
+            self.pool_config = pool_config
+        if response_cache is not None:
+            self.response_cache = response_cache
+        if rate_limiter is not None:
+            self.rate_limiter = rate_limiter
+        if retry_policy is not None:
+            self.retry_policy = retry_policy
+        if retry_budget is not None:
+            self.retry_budget = retry_budget
+        elif self.retry_budget is None:
+            self.retry_budget = RetryBudget()
+        if circuit_breaker is not None:
+            self.circuit_breaker = circuit_breaker
+        if json_codec is not None:
+            self.json_codec = json_codec
+        elif self.json_codec is None:
+            self.json_codec = default_codec()
+        if middlewares is not None:
+            self.middlewares = tuple(middlewares)
+        if tracer is not None:
+            self.tracer = tracer
+        if profiler is not None:
+            self.profiler = profiler
+        if metrics is not None:
+            self.metrics = metrics
+        if self.tracer is not None:
+            kwargs["trace_configs"] = [*kwargs.get("trace_configs", ()), self.tracer.trace_config]
+
+        self._request_coalescer = RequestCoalescer()
+
+        self._session_pool = _session_pool
+        self._is_released = False
+        if self._session_pool is not None:
+            self.session = self._session_pool.acquire(
+                self.base_url, pool_config=self.pool_config, loop=self.loop, **kwargs
+            )
+        else:
+            if self.pool_config is not None and "connector" not in kwargs:
+                kwargs["connector"] = self.pool_config.create_connector(self.loop)
+            self.session = aiohttp.ClientSession(self.base_url, loop=self.loop, **kwargs)
+
+        # Detect the session hooks once, instead of every request.
+        self._is_before_request_overridden = self._has_overridden_method(self.before_request)
+        self._is_after_request_overridden = self._has_overridden_method(self.after_request)
 
         if not _is_single_session:
             for name, func in inspect.getmembers(self):
@@ -92,9 +230,17 @@ class Session:
 
     @property
     def closed(self) -> bool:
+        if self._session_pool is not None and self._is_released:
+            return True
         return self.session.closed
 
     async def close(self):
+        # The pooled session is shared with other sessions. It is returned to the pool instead of closing.
+        if self._session_pool is not None:
+            if not self._is_released:
+                self._is_released = True
+                self._session_pool.release(self.session)
+            return
         return await self.session.close()
 
     async def request(self, method: str, path: str, **kwargs):
@@ -112,23 +258,155 @@ class Session:
     async def delete(self, path: str, **kwargs):
         return await self.session.delete(path, **kwargs)
 
-    async def _make_request(self, request: RequestCore, path: str, **kwargs):
+    async def gather(
+        self,
+        *awaitables: Awaitable[Any],
+        concurrency: int = 10,
+        return_exceptions: bool = False,
+        timeout: Optional[float] = None,
+    ) -> list[Any]:
+        """Run the calls of requests with bounded concurrency. The results are returned in the order of calls.
+
+        Parameters
+        ----------
+        *awaitables: Awaitable[Any]
+            Calls of requests. (The coroutines are not started until the concurrency allows.)
+        concurrency: int
+            Maximum number of calls running at the same time.
+        return_exceptions: bool
+            If it is True, an exception of the call is returned as the result.
+            Otherwise, the first exception cancels the remaining calls and is raised.
+        timeout: Optional[float]
+            Deadline of the whole batch in seconds.
+
+        Examples
+        --------
+        >>> async with MetroAPI() as client:
+        ...     results = await client.gather(
+        ...         client.station_search_with_query(name="Gangnam"),
+        ...         client.station_search_with_query(name="Jamsil"),
+        ...         concurrency=2,
+        ...     )
+        """
+        try:
+            return await batch.gather(
+                [lambda _awaitable=awaitable: _awaitable for awaitable in awaitables],
+                concurrency=concurrency,
+                return_exceptions=return_exceptions,
+                timeout=timeout,
+            )
+        finally:
+            for awaitable in awaitables:
+                batch.close_awaitable(awaitable)
+
+    def network_timings(self, name: Optional[str] = None) -> dict[str, Any]:
+        """Returns the summaries of network phases recorded by :attr:`tracer`.
+        If the tracer is not installed, an empty dictionary is returned.
+
+        Parameters
+        ----------
+        name: Optional[str]
+            The request name. If it is None, the summaries of all requests are returned by the name.
+
+        Returns
+        -------
+        dict[str, Any]
+            The summaries (count, sum, min, max, mean, p50, p90 and p99) by the phase.
+        """
+        if self.tracer is None:
+            return dict()
+        return self.tracer.snapshot(name)
+
+    def stats(self, name: Optional[str] = None) -> dict[str, Any]:
+        """Returns the aggregates of the time spent inside ahttp_client, measured by :attr:`profiler`.
+        If the profiler is not installed, an empty dictionary is returned.
+
+        Parameters
+        ----------
+        name: Optional[str]
+            The request name. If it is None, the aggregates of all requests are returned by the name.
+
+        Returns
+        -------
+        dict[str, Any]
+            The aggregates (count, total, mean and max in seconds) by the phase.
+        """
+        if self.profiler is None:
+            return dict()
+        return self.profiler.stats(name)
+
+    async def _send_request(self, request: RequestState, path: str):
+        """Send the HTTP request after :meth:`before_request`. The :meth:`after_request` is not called."""
         _req_obj = request
         _path = path
+        profile = request.profile
 
-        if self._has_overridden_method(self.before_request):
+        if profile is not None:
+            measured_at = time.perf_counter_ns()
+        if self._is_before_request_overridden:
             _req_obj, _path = await self.before_request(request, path)
-
-        request_kwargs = _req_obj.get_request_kwargs()
+            if profile is not None:
+                before_request_at = time.perf_counter_ns()
+                profile.record(BEFORE_REQUEST, before_request_at - measured_at)
+                measured_at = before_request_at
+
+        request_kwargs = _req_obj.get_request_kwargs(self.json_codec)
+        if profile is not None:
+            profile.record(REQUEST_KWARGS, time.perf_counter_ns() - measured_at)
         _log.debug("Request Called: [%s] %s" % (_req_obj.method, _path))
-        response = await self.session.request(_req_obj.method, _path, **request_kwargs)
-
-        if self._has_overridden_method(self.after_request):
-            response = await self.after_request(response)
+        if self.tracer is not None:
+            # The network phases are recorded by the name of request.
+            request_kwargs["trace_request_ctx"] = _req_obj.name
+        # Only the path formatted by the template is percent-encoded. The path returned by hooks is encoded again.
+        url = _req_obj.core.path_template.url(self._base_url, _path, encoded=_path == _req_obj.formatted_path)
+        if _req_obj.core.cache and self.response_cache is None:
+            self.response_cache = ResponseCache()
+
+        send = self.session.request
+        # The rate limiters are applied closest to the network. Cached or coalesced responses don't use tokens.
+        # The tokens of the session are taken after the tokens of the request.
+        for rate_limiter in (self.rate_limiter, _req_obj.core.rate_limiter):
+            if rate_limiter is None:
+                continue
+            send = functools.partial(
+                rate_limiter.request, send, endpoint=_req_obj.name, weight=_req_obj.core.rate_limit_weight
+            )
+        # The circuit breakers reject the request before waiting for the rate limiters.
+        for circuit_breaker in (self.circuit_breaker, _req_obj.core.circuit_breaker):
+            if circuit_breaker is None:
+                continue
+            send = functools.partial(circuit_breaker.request, send, endpoint=_req_obj.name)
+
+        # Each hedged request passes through the circuit breakers and the rate limiters.
+        if _req_obj.core.hedge_policy is not None:
+            send = functools.partial(_req_obj.core.hedge_policy.request, send, endpoint=_req_obj.name)
+
+        # Unsafe method requests pass through the cache to invalidate the stored response.
+        if self.response_cache is not None and (_req_obj.core.cache or _req_obj.method not in SAFE_METHODS):
+            send = functools.partial(self.response_cache.request, send)
+
+        if _req_obj.core.coalesce:
+            selected_headers = None if isinstance(_req_obj.core.coalesce, bool) else _req_obj.core.coalesce
+            send = functools.partial(self._request_coalescer.request, send, selected_headers=selected_headers)
+
+        # Every caller is recorded, including the followers of coalesced requests and cached responses.
+        if self.metrics is not None:
+            send = functools.partial(
+                self.metrics.request, send, endpoint=_req_obj.name, cache=bool(_req_obj.core.cache)
+            )
+
+        if profile is not None:
+            measured_at = time.perf_counter_ns()
+        response = await send(_req_obj.method, url, **request_kwargs)
+        if isinstance(response, BufferedResponse):
+            # The replayed responses (cache and coalescing) are decoded with the codec of this session.
+            response.json_codec = self.json_codec
+        if profile is not None:
+            profile.record(NETWORK, time.perf_counter_ns() - measured_at)
         return response
 
     @_special_method
-    async def before_request(self, request: RequestCore, path: str) -> tuple[RequestCore, str]:
+    async def before_request(self, request: RequestState, path: str) -> tuple[RequestState, str]:
         """A special method that acts as a session local pre-invoke hook.
         This is similar to :meth:`RequestCore.before_request`.
 
@@ -137,14 +415,14 @@ class Session:
 
         Parameters
         ----------
-        request: RequestCore
-            The instance of RequestCore.
+        request: RequestState
+            The HTTP components of the request call.
         path: str
             The final string of the request url.
 
         Returns
         -------
-        Tuple[RequestCore, str]
+        Tuple[RequestState, str]
             The return type must be the same as the parameter.
         """
         pass
@@ -172,7 +450,14 @@ class Session:
         pass
 
     @classmethod
-    def single_session(cls, base_url: str, loop: asyncio.AbstractEventLoop = None, **session_kwargs):
+    def single_session(
+        cls,
+        base_url: str,
+        loop: asyncio.AbstractEventLoop = None,
+        *,
+        pooled: bool | SessionPool = False,
+        **session_kwargs,
+    ):
         """A single session for one request.
 
         Parameters
@@ -182,6 +467,18 @@ class Session:
         loop: asyncio.AbstractEventLoop
             [event loop](https://docs.python.org/3/library/asyncio-eventloop.html#asyncio-event-loop)
              used for processing HTTP requests.
+        pooled: bool | SessionPool
+            If it is True, the `aiohttp.ClientSession` is shared through :data:`ahttp_client.pool.default_pool`
+            and keep-alive connections are reused between calls. A :class:`SessionPool` can be given instead.
+            The pool outlives the event loop, so call :meth:`SessionPool.close` explicitly before the loop is closed.
+            (ex. at the end of the coroutine given to `asyncio.run`)
+            A streamed response (:class:`Stream` or Server-Sent Events) requires it, because the non-pooled session
+            is closed before the stream is consumed.
+
+        Raises
+        ------
+        TypeError
+            The streamed response is returned from the non-pooled session.
 
         Examples
         --------
@@ -193,15 +490,28 @@ class Session:
         ...     pass
 
         """
+        session_pool: Optional[SessionPool] = None
+        if isinstance(pooled, SessionPool):
+            session_pool = pooled
+        elif pooled:
+            session_pool = default_pool
 
         def decorator(func: RequestFunction):
+            if session_pool is None and (func.response_stream is not None or func.event_stream is not None):
+                raise TypeError(
+                    "%s returns the streamed response, which is consumed after the single session is closed. "
+                    "Use pooled=True or a Session instead." % func.name
+                )
+
             @functools.wraps(func)
             async def wrapper(*args, **kwargs):
-                client = cls(base_url, loop=loop, _is_single_session=True, **session_kwargs)
-                func.session = client
-                response = await func(*args, **kwargs)
-                if not client.closed:
-                    await client.close()
+                client = cls(base_url, loop=loop, _is_single_session=True, _session_pool=session_pool, **session_kwargs)
+                try:
+                    # The client is bound to this call only. The request is shared by concurrent calls.
+                    response = await func._call(client, *args, **kwargs)
+                finally:
+                    if not client.closed:
+                        await client.close()
                 return response
 
             wrapper.__core__ = func
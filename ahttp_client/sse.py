@@ -0,0 +1,451 @@
+"""MIT License
+
+Copyright (c) 2023-present gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import logging
+import re
+from typing import TYPE_CHECKING
+
+import aiohttp
+
+from .codec import default_codec
+
+if TYPE_CHECKING:
+    from types import TracebackType
+    from typing import Any, Awaitable, Callable, Optional
+
+    from typing_extensions import Self
+
+    from .codec import JsonCodec
+    from .response import BufferedResponse
+
+    Response = aiohttp.ClientResponse | BufferedResponse
+    ConnectFunction = Callable[[Optional[str]], Awaitable[Response]]
+
+_log = logging.getLogger(__name__)
+
+_LINE_END = re.compile(rb"\r\n|\r|\n")
+EVENT_STREAM_CONTENT_TYPE = "text/event-stream"
+LAST_EVENT_ID_HEADER = "Last-Event-ID"
+
+
+class ServerSentEvent:
+    """An event of Server-Sent Events.
+
+    Attributes
+    ----------
+    event: str
+        Type of the event. The default type is 'message'.
+    data: str
+        Data of the event. Multiple data lines are joined with a newline.
+    id: str
+        The last event ID when the event is dispatched.
+    retry: Optional[int]
+        The reconnection time in milliseconds, if the event has the retry field.
+    json_codec: Optional[JsonCodec]
+        The JSON codec decoding the data. (:attr:`Session.json_codec` for the events of request)
+        It is not compared with other events.
+    """
+
+    __slots__ = ("event", "data", "id", "retry", "json_codec")
+
+    def __init__(
+        self,
+        event: str,
+        data: str,
+        id: str = "",
+        retry: Optional[int] = None,
+        json_codec: Optional[JsonCodec] = None,
+    ):
+        self.event = event
+        self.data = data
+        self.id = id
+        self.retry = retry
+        self.json_codec = json_codec
+
+    def __repr__(self) -> str:
+        return "ServerSentEvent(event=%r, data=%r, id=%r, retry=%r)" % (self.event, self.data, self.id, self.retry)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, ServerSentEvent) and (self.event, self.data, self.id, self.retry) == (
+            other.event,
+            other.data,
+            other.id,
+            other.retry,
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.event, self.data, self.id, self.retry))
+
+    def json(self, loads: Optional[Callable[[str], Any]] = None) -> Any:
+        """Decode the data of the event as JSON.
+        If loads is None, the JSON codec of the event (or the default JSON codec) is used."""
+        if loads is None:
+            loads = (self.json_codec or default_codec()).decode
+        return loads(self.data)
+
+
+class EventStreamParser:
+    """An incremental parser of the `text/event-stream` format.
+    The bytes are fed as they arrive, and the complete events are returned.
+    Only the incomplete line is kept in the buffer.
+
+    Attributes
+    ----------
+    last_event_id: str
+        The last event ID. It is kept after :meth:`reset`.
+    retry: Optional[int]
+        The last reconnection time in milliseconds sent by the server.
+    json_codec: Optional[JsonCodec]
+        The JSON codec of the dispatched events.
+    """
+
+    def __init__(self, json_codec: Optional[JsonCodec] = None):
+        self.last_event_id = ""
+        self.json_codec = json_codec
+        self.retry: Optional[int] = None
+
+        self._buffer = bytearray()
+        # The length of buffer already searched for the line end.
+        self._scanned = 0
+        self._skip_lf = False
+        self._first_line = True
+        self._event_type = ""
+        self._data: list[str] = list()
+        self._event_retry: Optional[int] = None
+
+    def reset(self) -> None:
+        """Discard the incomplete event for a new connection. The last event ID is kept."""
+        self._buffer = bytearray()
+        self._scanned = 0
+        self._skip_lf = False
+        self._first_line = True
+        self._event_type = ""
+        self._data = list()
+        self._event_retry = None
+
+    def feed(self, data: bytes) -> list[ServerSentEvent]:
+        """Parse the bytes and return the dispatched events."""
+        if self._skip_lf and data.startswith(b"\n"):
+            data = data[1:]
+        self._skip_lf = False
+
+        buffer = self._buffer
+        buffer += data
+        events: list[ServerSentEvent] = list()
+        position = 0
+        # The incomplete line isn't searched again. (A CR at the end is always consumed as a line end)
+        search_from = self._scanned
+        while (match := _LINE_END.search(buffer, search_from)) is not None:
+            # CR at the end of the buffer can be the first half of CRLF.
+            if match.end() == len(buffer) and match.group() == b"\r":
+                self._skip_lf = True
+
+            line = buffer[slice(position, match.start())].decode("utf-8", errors="replace")
+            position = search_from = match.end()
+            if self._first_line:
+                self._first_line = False
+                line = line.removeprefix("\ufeff")
+
+            event = self._process_line(line)
+            if event is not None:
+                events.append(event)
+        # The consumed lines are deleted in place.
+        del buffer[slice(position)]
+        self._scanned = len(buffer)
+        return events
+
+    def _process_line(self, line: str) -> Optional[ServerSentEvent]:
+        if not line:
+            return self._dispatch()
+        if line.startswith(":"):
+            # Comment (It is usually used as a heartbeat)
+            return None
+
+        field, colon, value = line.partition(":")
+        if colon and value.startswith(" "):
+            value = value[1:]
+
+        if field == "event":
+            self._event_type = value
+        elif field == "data":
+            self._data.append(value)
+        elif field == "id":
+            if "\0" not in value:
+                self.last_event_id = value
+        elif field == "retry":
+            if value.isascii() and value.isdigit():
+                self.retry = self._event_retry = int(value)
+        return None
+
+    def _dispatch(self) -> Optional[ServerSentEvent]:
+        data, event_type, retry = self._data, self._event_type, self._event_retry
+        self._data = list()
+        self._event_type = ""
+        self._event_retry = None
+        if len(data) == 0:
+            return None
+        return ServerSentEvent(event_type or "message", "\n".join(data), self.last_event_id, retry, self.json_codec)
+
+
+class EventStream:
+    """Configuration of the Server-Sent Events request. (See :func:`sse`)
+
+    Parameters
+    ----------
+    retry: float
+        Seconds to wait before reconnecting. The `retry` field of the server overrides it.
+    heartbeat_timeout: Optional[float]
+        When no bytes (including comments) are received for this seconds, the connection is regarded as dead
+        and reconnected. If it is None, the heartbeat isn't checked.
+    max_reconnects: Optional[int]
+        Maximum number of consecutive reconnections. If it is None, the stream reconnects without limit.
+    chunk_size: int
+        Maximum size of bytes read at once.
+    """
+
+    __slots__ = ("retry", "heartbeat_timeout", "max_reconnects", "chunk_size")
+
+    def __init__(
+        self,
+        *,
+        retry: float = 3.0,
+        heartbeat_timeout: Optional[float] = None,
+        max_reconnects: Optional[int] = None,
+        chunk_size: int = 64 * 1024,
+    ):
+        if retry < 0:
+            raise ValueError("retry must be greater than or equal to 0.")
+        if heartbeat_timeout is not None and heartbeat_timeout <= 0:
+            raise ValueError("heartbeat_timeout must be greater than 0.")
+        if max_reconnects is not None and max_reconnects < 0:
+            raise ValueError("max_reconnects must be greater than or equal to 0.")
+
+        self.retry = retry
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_reconnects = max_reconnects
+        self.chunk_size = chunk_size
+
+    def __repr__(self) -> str:
+        return "<EventStream retry=%s heartbeat_timeout=%s max_reconnects=%s>" % (
+            self.retry,
+            self.heartbeat_timeout,
+            self.max_reconnects,
+        )
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, EventStream) and all(
+            getattr(other, name) == getattr(self, name) for name in self.__slots__
+        )
+
+    def __hash__(self) -> int:
+        return hash(tuple(getattr(self, name) for name in self.__slots__))
+
+    def open(
+        self,
+        connect: ConnectFunction,
+        last_event_id: Optional[str] = None,
+        json_codec: Optional[JsonCodec] = None,
+    ) -> EventSource:
+        """Returns an event source. The connection is opened when the event source is connected or iterated."""
+        return EventSource(connect, self, last_event_id, json_codec)
+
+
+class EventSource:
+    """An async iterator yielding :class:`ServerSentEvent`.
+
+    When the connection is lost (the end of body, a connection error or the heartbeat timeout),
+    the event source reconnects after the reconnection time with `Last-Event-ID` header.
+    When the server responds with 204 No Content, the iteration is stopped.
+    When the server responds with other than 200 OK or `text/event-stream`, `aiohttp.ClientResponseError` is raised.
+
+    Attributes
+    ----------
+    config: EventStream
+        Configuration of the event source.
+    response: Optional[aiohttp.ClientResponse]
+        The response of current connection.
+    retry: float
+        Seconds to wait before reconnecting.
+    """
+
+    def __init__(
+        self,
+        connect: ConnectFunction,
+        config: EventStream,
+        last_event_id: Optional[str] = None,
+        json_codec: Optional[JsonCodec] = None,
+    ):
+        self.config = config
+        self.response: Optional[Response] = None
+        self.retry = config.retry
+
+        self._connect = connect
+        self._parser = EventStreamParser(json_codec)
+        if last_event_id is not None:
+            self._parser.last_event_id = last_event_id
+        self._events: collections.deque[ServerSentEvent] = collections.deque()
+        self._reconnects = 0
+        self._closed = False
+
+    def __repr__(self) -> str:
+        return "<EventSource last_event_id=%r closed=%s>" % (self.last_event_id, self._closed)
+
+    @property
+    def last_event_id(self) -> str:
+        return self._parser.last_event_id
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    async def connect(self) -> bool:
+        """Open a new connection. Returns False if the server asks to stop with 204 No Content.
+
+        Raises
+        ------
+        aiohttp.ClientResponseError
+            The response is not a valid event stream.
+        """
+        self._drop_response(release=False)
+        response = await self._connect(self.last_event_id or None)
+        if response.status == 204:
+            response.release()
+            self.close()
+            return False
+
+        if response.status != 200 or response.content_type != EVENT_STREAM_CONTENT_TYPE:
+            response.release()
+            self.close()
+            raise aiohttp.ClientResponseError(
+                response.request_info,
+                response.history,
+                status=response.status,
+                message="Attempt to open the event stream with unexpected response: %s (%s)"
+                % (response.status, response.content_type),
+                headers=response.headers,
+            )
+
+        self.response = response
+        self._parser.reset()
+        return True
+
+    def _drop_response(self, release: bool = True) -> None:
+        if self.response is None:
+            return
+        if release:
+            self.response.release()
+        else:
+            self.response.close()
+        self.response = None
+
+    async def _reconnect(self) -> bool:
+        if self.config.max_reconnects is not None and self._reconnects >= self.config.max_reconnects:
+            self.close()
+            return False
+
+        self._reconnects += 1
+        _log.debug("Event Stream Reconnecting: %s (last_event_id=%r)" % (self._reconnects, self.last_event_id))
+        await asyncio.sleep(self.retry)
+        try:
+            return await self.connect()
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as exc:
+            _log.debug("Event Stream Reconnection Failed: %s" % exc)
+            return True
+
+    async def _read(self) -> bytes:
+        content = getattr(self.response, "content", None)
+        if content is None:
+            body = await self.response.read()
+            # The buffered response has no more bytes after the body.
+            self.response = None
+            return body
+
+        read = content.read(self.config.chunk_size)
+        if self.config.heartbeat_timeout is None:
+            return await read
+        return await asyncio.wait_for(read, self.config.heartbeat_timeout)
+
+    def __aiter__(self) -> Self:
+        return self
+
+    async def __anext__(self) -> ServerSentEvent:
+        while not self._events:
+            if self._closed:
+                raise StopAsyncIteration
+            if self.response is None:
+                if not await self._reconnect():
+                    raise StopAsyncIteration
+                continue
+
+            try:
+                chunk = await self._read()
+            except asyncio.TimeoutError:
+                _log.debug("Event Stream Heartbeat Timeout: %s seconds" % self.config.heartbeat_timeout)
+                self._drop_response(release=False)
+                continue
+            except aiohttp.ClientError as exc:
+                _log.debug("Event Stream Disconnected: %s" % exc)
+                self._drop_response(release=False)
+                continue
+            except BaseException:
+                self.close()
+                raise
+
+            if not chunk:
+                self._drop_response()
+                continue
+
+            self._events.extend(self._parser.feed(chunk))
+            if self._parser.retry is not None:
+                self.retry = self._parser.retry / 1000
+            if self._events:
+                self._reconnects = 0
+        return self._events.popleft()
+
+    def close(self) -> None:
+        """Close the connection and stop the iteration."""
+        self._closed = True
+        self._drop_response(release=False)
+
+    async def aclose(self) -> None:
+        self.close()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        # The abandoned event source must not leak the connection.
+        if self.response is not None:
+            self.response.close()
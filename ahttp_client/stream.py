@@ -0,0 +1,367 @@
+"""MIT License
+
+Copyright (c) 2023-present gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import collections
+import collections.abc
+from typing import TYPE_CHECKING, Any, get_args, get_origin
+
+from .codec import default_codec
+from .utils import is_annotated_parameter
+
+if TYPE_CHECKING:
+    from types import TracebackType
+    from typing import Callable, Optional
+
+    import aiohttp
+    from typing_extensions import Self
+
+    from .codec import JsonCodec
+    from .response import BufferedResponse
+
+_ASYNC_ITERATOR_TYPES = (
+    collections.abc.AsyncIterator,
+    collections.abc.AsyncIterable,
+    collections.abc.AsyncGenerator,
+)
+
+# The types returned by the JSON codec without validation.
+_JSON_TYPES = (Any, object, dict, list, str, int, float, bool)
+
+_UNRESOLVED = object()
+
+
+def _make_validator(item_type: Any) -> Optional[Callable[[bytes], Any]]:
+    """Returns the function validating a line into the item type. If it is None, the JSON codec is used."""
+    if item_type in _JSON_TYPES or get_origin(item_type) in (dict, list):
+        return None
+
+    from .extension.pydantic import get_type_adapter, is_pydantic
+
+    if not is_pydantic:
+        return None
+    # The line is validated straight from bytes.
+    return get_type_adapter(item_type).validate_json
+
+
+class Stream:
+    """An annotation to configure the streaming response.
+    When the return annotation (or a parameter annotation) of the request is `AsyncIterator[bytes]`,
+    the body of response is streamed in chunks instead of reading the whole body.
+
+    When the item type is not bytes (ex. `AsyncIterator[Model]`), the body is decoded as newline-delimited JSON
+    (NDJSON, JSON Lines). Each line is decoded when it arrives. If pydantic is installed,
+    the line is validated into the item type. Otherwise, the decoded JSON value is returned.
+
+    Parameters
+    ----------
+    chunk_size: int
+        Maximum size of chunk in bytes.
+    item_type: Any
+        Type of items. If it is bytes, the chunks of body are yielded.
+
+    Examples
+    --------
+    >>> class ExportAPI(Session):
+    ...     @request("GET", "/export")
+    ...     async def export(self) -> Annotated[AsyncIterator[bytes], Stream(chunk_size=1024 * 1024)]:
+    ...         pass
+    ...
+    >>> async with ExportAPI("https://api.yhs.kr") as client:
+    ...     async for chunk in await client.export():
+    ...         file.write(chunk)
+
+    The records of NDJSON are yielded as the models.
+
+    >>> class LogAPI(Session):
+    ...     @request("GET", "/logs")
+    ...     async def logs(self) -> AsyncIterator[LogModel]:
+    ...         pass
+    """
+
+    __slots__ = ("chunk_size", "item_type", "_validator")
+
+    DEFAULT_CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE, item_type: Any = bytes):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be greater than or equal to 1.")
+        self.chunk_size = chunk_size
+        self.item_type = item_type
+        self._validator: Optional[Callable[[bytes], Any]] | object = _UNRESOLVED
+
+    def __repr__(self) -> str:
+        return "<Stream chunk_size=%d item_type=%r>" % (self.chunk_size, self.item_type)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Stream) and other.chunk_size == self.chunk_size and other.item_type == self.item_type
+
+    def __hash__(self) -> int:
+        return hash((self.chunk_size, self.item_type))
+
+    @property
+    def decoder(self) -> Callable[[bytes], Any]:
+        """The function decoding a line of NDJSON into the item type with the default JSON codec."""
+        return self.get_decoder()
+
+    def get_decoder(self, json_codec: Optional[JsonCodec] = None) -> Callable[[bytes], Any]:
+        """Returns the function decoding a line of NDJSON into the item type.
+        The validator is created at the first use, because the item type can be a forward reference at setup.
+
+        Parameters
+        ----------
+        json_codec: Optional[JsonCodec]
+            The codec decoding the line, when the item type is not validated. (ex. dict)
+            If it is None, the default codec is used.
+        """
+        if self._validator is _UNRESOLVED:
+            self._validator = _make_validator(self.item_type)
+        if self._validator is not None:
+            return self._validator
+        return (json_codec or default_codec()).decode
+
+    @classmethod
+    def from_annotation(cls, annotation: Any) -> Optional[Self]:
+        """Returns the stream configuration of the annotation.
+        If the annotation is not `AsyncIterator[T]` (or `AsyncIterable`, `AsyncGenerator`), it returns None.
+        """
+        chunk_size = cls.DEFAULT_CHUNK_SIZE
+        if is_annotated_parameter(annotation):
+            for metadata in annotation.__metadata__:
+                if isinstance(metadata, cls):
+                    chunk_size = metadata.chunk_size
+            annotation = annotation.__origin__
+
+        if get_origin(annotation) not in _ASYNC_ITERATOR_TYPES:
+            return None
+
+        arguments = get_args(annotation)
+        item_type = arguments[0] if len(arguments) > 0 else bytes
+        return cls(chunk_size, item_type)
+
+    def open(
+        self, response: aiohttp.ClientResponse | BufferedResponse, json_codec: Optional[JsonCodec] = None
+    ) -> ResponseStream:
+        """Returns an async iterator of the response body.
+
+        Parameters
+        ----------
+        response: aiohttp.ClientResponse | BufferedResponse
+            The response to stream.
+        json_codec: Optional[JsonCodec]
+            The codec decoding the records of NDJSON. If it is None, the default codec is used.
+        """
+        if self.item_type is bytes:
+            return ResponseStream(response, self.chunk_size)
+        return JsonLinesStream(response, self.get_decoder(json_codec), self.chunk_size)
+
+
+class ResponseStream:
+    """An async iterator yielding the body of response in chunks.
+
+    The chunks are read from `response.content` when they are requested.
+    While the chunks are not consumed, aiohttp stops reading from the socket. (Backpressure)
+
+    When the body is read to the end, the connection is released to the pool.
+    When the iteration is stopped (:meth:`aclose`, an exception or garbage collection),
+    the connection is closed, because the rest of body remains.
+
+    Attributes
+    ----------
+    response: aiohttp.ClientResponse | BufferedResponse
+        The streamed response.
+    chunk_size: int
+        Maximum size of chunk in bytes.
+    """
+
+    __slots__ = ("response", "chunk_size", "_closed", "_body", "_offset")
+
+    def __init__(
+        self, response: aiohttp.ClientResponse | BufferedResponse, chunk_size: int = Stream.DEFAULT_CHUNK_SIZE
+    ):
+        self.response = response
+        self.chunk_size = chunk_size
+        self._closed = False
+
+        # BufferedResponse (ex. cached response) doesn't have a stream reader.
+        self._body: Optional[bytes] = None
+        self._offset = 0
+
+    def __repr__(self) -> str:
+        return "<ResponseStream response=%r chunk_size=%d closed=%s>" % (self.response, self.chunk_size, self._closed)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def status(self) -> int:
+        return self.response.status
+
+    @property
+    def headers(self):
+        return self.response.headers
+
+    async def _read(self) -> bytes:
+        content = getattr(self.response, "content", None)
+        if content is not None:
+            return await content.read(self.chunk_size)
+
+        if self._body is None:
+            self._body = await self.response.read()
+        if self._offset == 0 and len(self._body) <= self.chunk_size:
+            # The body fits in a chunk. It is returned without copying.
+            self._offset = len(self._body)
+            return self._body
+
+        # The chunks are copied from the body, because the chunks are yielded as bytes.
+        chunk = self._body[slice(self._offset, self._offset + self.chunk_size)]
+        self._offset += len(chunk)
+        return chunk
+
+    def __aiter__(self) -> Self:
+        return self
+
+    async def _next_chunk(self) -> bytes:
+        try:
+            return await self._read()
+        except BaseException:
+            self.close()
+            raise
+
+    async def __anext__(self) -> bytes:
+        if self._closed:
+            raise StopAsyncIteration
+
+        chunk = await self._next_chunk()
+        if not chunk:
+            self.release()
+            raise StopAsyncIteration
+        return chunk
+
+    async def read(self) -> bytes:
+        """Read the rest of body. (It buffers the body in memory)"""
+        return b"".join([chunk async for chunk in self])
+
+    def release(self) -> None:
+        """Release the connection to the pool. The unread body is discarded by aiohttp."""
+        if self._closed:
+            return
+        self._closed = True
+        self.response.release()
+
+    def close(self) -> None:
+        """Close the connection."""
+        if self._closed:
+            return
+        self._closed = True
+        self.response.close()
+
+    async def aclose(self) -> None:
+        self.close()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        # The abandoned stream must not leak the connection.
+        if not self._closed:
+            self.close()
+
+
+class JsonLinesStream(ResponseStream):
+    """An async iterator yielding the records of newline-delimited JSON (NDJSON, JSON Lines) response.
+    Only the incomplete line is kept in memory, so the memory usage doesn't depend on the length of stream.
+    Empty lines are skipped.
+
+    Attributes
+    ----------
+    decoder: Callable[[bytes], Any]
+        The function decoding a line into a record.
+    """
+
+    __slots__ = ("decoder", "_buffer", "_lines", "_eof")
+
+    def __init__(
+        self,
+        response: aiohttp.ClientResponse | BufferedResponse,
+        decoder: Optional[Callable[[bytes], Any]] = None,
+        chunk_size: int = Stream.DEFAULT_CHUNK_SIZE,
+    ):
+        super().__init__(response, chunk_size)
+        self.decoder = decoder or default_codec().decode
+        self._buffer = bytearray()
+        self._lines: collections.deque[bytes] = collections.deque()
+        self._eof = False
+
+    async def _next_line(self) -> Optional[bytes]:
+        while not self._lines:
+            if self._eof:
+                line = bytes(self._buffer)
+                self._buffer.clear()
+                return line if line.strip() else None
+
+            chunk = await self._next_chunk()
+            if not chunk:
+                self._eof = True
+                continue
+
+            end = chunk.rfind(b"\n")
+            if end == -1:
+                # The line isn't complete. The chunk is appended in place. (No copy of the incomplete line)
+                self._buffer += chunk
+                continue
+
+            self._buffer += chunk[slice(end)]
+            lines = self._buffer.split(b"\n")
+            self._lines.extend(bytes(line) for line in lines if line.strip())
+            self._buffer = bytearray(chunk[slice(end + 1, None)])
+        return self._lines.popleft()
+
+    async def __anext__(self) -> Any:
+        if self._closed:
+            raise StopAsyncIteration
+
+        line = await self._next_line()
+        if line is None:
+            self.release()
+            raise StopAsyncIteration
+
+        try:
+            return self.decoder(line)
+        except BaseException:
+            self.close()
+            raise
+
+    async def read(self) -> list[Any]:
+        """Read the rest of records. (It buffers the records in memory)"""
+        return [record async for record in self]
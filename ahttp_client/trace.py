@@ -0,0 +1,207 @@
+"""MIT License
+
+Copyright (c) 2023-present gunyu1019
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+import aiohttp
+
+from .histogram import Histogram
+
+if TYPE_CHECKING:
+    from types import SimpleNamespace
+    from typing import Any, Optional
+
+# The phases of HTTP request recorded by NetworkTracer.
+PHASES = ("dns", "queue", "connect", "send", "ttfb", "body", "total")
+
+
+class _TraceContext:
+    """Timestamps of a single HTTP request. (The context of `aiohttp.TraceConfig`)"""
+
+    __slots__ = (
+        "trace_request_ctx",
+        "started_at",
+        "dns_started_at",
+        "dns",
+        "queue_started_at",
+        "connect_started_at",
+        "connected_at",
+        "sent_at",
+        "ended_at",
+    )
+
+    def __init__(self, trace_request_ctx: Any = None):
+        self.trace_request_ctx = trace_request_ctx
+        self.started_at = 0.0
+        self.dns_started_at = 0.0
+        self.dns = 0.0
+        self.queue_started_at = 0.0
+        self.connect_started_at = 0.0
+        self.connected_at = 0.0
+        self.sent_at = 0.0
+        self.ended_at = 0.0
+
+
+class NetworkTracer:
+    """Records the network phases of requests with `aiohttp.TraceConfig`.
+    The timings are aggregated into a :class:`Histogram` for each request name (:attr:`RequestCore.name`) and phase.
+
+    Phases
+    ------
+    dns
+        DNS resolution. (Not recorded on a DNS cache hit)
+    queue
+        Waiting for a free connection of the pool. (Pool starvation)
+    connect
+        Creating a new connection, excluding DNS resolution.
+        It includes the TLS handshake, because aiohttp doesn't signal the handshake separately.
+    send
+        Sending the headers and the body of request.
+    ttfb
+        Waiting for the headers of response after the request is sent. (Time to first byte)
+    body
+        Reading the body of response with `response.read()`. A streamed body is not recorded.
+    total
+        From the start of request to the headers of response.
+
+    Parameters
+    ----------
+    significant_bits: int
+        Significant bits of the histograms.
+    max_value: float
+        The largest latency distinguished by the histograms in seconds.
+
+    Examples
+    --------
+    >>> class MetroAPI(Session):
+    ...     tracer = NetworkTracer()
+    ...
+    >>> async with MetroAPI("https://api.yhs.kr") as client:
+    ...     await client.station_search_with_query(name="Gangnam")
+    ...     client.network_timings()["station_search_with_query"]["queue"]["p99"]
+    """
+
+    def __init__(self, *, significant_bits: int = 4, max_value: float = 3600.0):
+        self.significant_bits = significant_bits
+        self.max_value = max_value
+        self._histograms: dict[str, dict[str, Histogram]] = dict()
+
+        self.trace_config = aiohttp.TraceConfig(trace_config_ctx_factory=_TraceContext)
+        self.trace_config.on_request_start.append(self._on_request_start)
+        self.trace_config.on_dns_resolvehost_start.append(self._on_dns_resolvehost_start)
+        self.trace_config.on_dns_resolvehost_end.append(self._on_dns_resolvehost_end)
+        self.trace_config.on_connection_queued_start.append(self._on_connection_queued_start)
+        self.trace_config.on_connection_queued_end.append(self._on_connection_queued_end)
+        self.trace_config.on_connection_create_start.append(self._on_connection_create_start)
+        self.trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        self.trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        self.trace_config.on_request_headers_sent.append(self._on_request_sent)
+        self.trace_config.on_request_chunk_sent.append(self._on_request_sent)
+        self.trace_config.on_request_end.append(self._on_request_end)
+        self.trace_config.on_response_chunk_received.append(self._on_response_chunk_received)
+
+    def histogram(self, name: str, phase: str) -> Histogram:
+        """Returns the histogram of the request name and the phase. If it does not exist, it is created."""
+        histograms = self._histograms.get(name)
+        if histograms is None:
+            histograms = self._histograms[name] = dict()
+        histogram = histograms.get(phase)
+        if histogram is None:
+            histogram = histograms[phase] = Histogram(significant_bits=self.significant_bits, max_value=self.max_value)
+        return histogram
+
+    def _record(self, context: _TraceContext, phase: str, value: float) -> None:
+        # A request without name (ex. `session.request`) is not recorded.
+        if context.trace_request_ctx is None:
+            return
+        self.histogram(context.trace_request_ctx, phase).record(value)
+
+    @property
+    def names(self) -> list[str]:
+        """Names of the recorded requests."""
+        return list(self._histograms.keys())
+
+    def snapshot(self, name: Optional[str] = None) -> dict[str, Any]:
+        """Returns the summaries of histograms. (See :meth:`Histogram.snapshot`)
+
+        Parameters
+        ----------
+        name: Optional[str]
+            The request name. If it is None, the summaries of all requests are returned by the name.
+        """
+        if name is not None:
+            return {phase: histogram.snapshot() for phase, histogram in self._histograms.get(name, {}).items()}
+        return {_name: self.snapshot(_name) for _name in self._histograms.keys()}
+
+    def reset(self) -> None:
+        """Remove all recorded timings."""
+        self._histograms.clear()
+
+    async def _on_request_start(self, _, context: _TraceContext, params: aiohttp.TraceRequestStartParams):
+        context.started_at = context.connected_at = time.perf_counter()
+
+    async def _on_dns_resolvehost_start(self, _, context: _TraceContext, params: SimpleNamespace):
+        context.dns_started_at = time.perf_counter()
+
+    async def _on_dns_resolvehost_end(self, _, context: _TraceContext, params: SimpleNamespace):
+        context.dns = time.perf_counter() - context.dns_started_at
+        self._record(context, "dns", context.dns)
+
+    async def _on_connection_queued_start(self, _, context: _TraceContext, params: SimpleNamespace):
+        context.queue_started_at = time.perf_counter()
+
+    async def _on_connection_queued_end(self, _, context: _TraceContext, params: SimpleNamespace):
+        now = context.connected_at = time.perf_counter()
+        self._record(context, "queue", now - context.queue_started_at)
+
+    async def _on_connection_create_start(self, _, context: _TraceContext, params: SimpleNamespace):
+        context.connect_started_at = time.perf_counter()
+        context.dns = 0.0
+
+    async def _on_connection_create_end(self, _, context: _TraceContext, params: SimpleNamespace):
+        now = context.connected_at = time.perf_counter()
+        self._record(context, "connect", now - context.connect_started_at - context.dns)
+
+    async def _on_connection_reuseconn(self, _, context: _TraceContext, params: SimpleNamespace):
+        context.connected_at = time.perf_counter()
+
+    async def _on_request_sent(self, _, context: _TraceContext, params: Any):
+        context.sent_at = time.perf_counter()
+
+    async def _on_request_end(self, _, context: _TraceContext, params: aiohttp.TraceRequestEndParams):
+        now = context.ended_at = time.perf_counter()
+        sent_at = context.sent_at or context.connected_at
+        self._record(context, "send", sent_at - context.connected_at)
+        self._record(context, "ttfb", now - sent_at)
+        self._record(context, "total", now - context.started_at)
+
+    async def _on_response_chunk_received(
+        self, _, context: _TraceContext, params: aiohttp.TraceResponseChunkReceivedParams
+    ):
+        # aiohttp signals the whole body once, when `response.read()` is finished.
+        if context.ended_at:
+            self._record(context, "body", time.perf_counter() - context.ended_at)
+            context.ended_at = 0.0
@@ -0,0 +1,21 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+
+@pytest.fixture
+def run_with_server():
+    """Run the test coroutine with the test server serving the routes."""
+
+    def run(routes, test):
+        async def main():
+            app = web.Application()
+            app.add_routes(routes)
+            async with TestServer(app) as server:
+                await test(server)
+
+        asyncio.run(main())
+
+    return run
@@ -0,0 +1,74 @@
+import aiohttp
+import asyncio
+
+import pytest
+from aiohttp import web
+from typing import Annotated
+
+from ahttp_client import *
+from ahttp_client.batch import as_completed, gather
+
+
+class BatchSession(Session):
+    @request("GET", "/items/{item_id}")
+    async def item(self, response: aiohttp.ClientResponse, item_id: Annotated[int, Path]) -> str:
+        response.raise_for_status()
+        return await response.text()
+
+
+def test_request_map(run_with_server):
+    in_flight = []
+    max_in_flight = []
+
+    async def handler(request: web.Request):
+        in_flight.append(None)
+        max_in_flight.append(len(in_flight))
+        await asyncio.sleep(0.01 * (5 - int(request.match_info["item_id"]) % 5))
+        in_flight.pop()
+        return web.Response(text=request.match_info["item_id"])
+
+    async def test(server):
+        async with BatchSession(str(server.make_url("/"))) as client:
+            results = await client.item.map(range(10), concurrency=3)
+            assert results == [str(x) for x in range(10)]
+            assert max(max_in_flight) <= 3
+
+            completed = [index async for index, _ in client.item.map_as_completed([{"item_id": 1}, (2,)])]
+            assert sorted(completed) == [0, 1]
+
+            results = await client.gather(client.item(1), client.item(item_id=2), concurrency=1)
+            assert results == ["1", "2"]
+
+    run_with_server([web.get("/items/{item_id}", handler)], test)
+
+
+def test_fail_fast():
+    started = []
+
+    async def call(index):
+        started.append(index)
+        await asyncio.sleep(0.01)
+        if index == 1:
+            raise ValueError(index)
+        return index
+
+    async def main():
+        with pytest.raises(ValueError):
+            await gather([lambda index=index: call(index) for index in range(10)], concurrency=2)
+        assert len(started) < 10
+
+        results = await gather(
+            [lambda index=index: call(index) for index in range(3)], concurrency=2, return_exceptions=True
+        )
+        assert results[0] == 0 and isinstance(results[1], ValueError) and results[2] == 2
+
+    asyncio.run(main())
+
+
+def test_deadline():
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            async for _ in as_completed([lambda: asyncio.sleep(1)] * 4, concurrency=2, timeout=0.05):
+                pass
+
+    asyncio.run(main())
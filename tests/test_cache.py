@@ -0,0 +1,106 @@
+import asyncio
+
+from aiohttp import web
+from yarl import URL
+
+from ahttp_client import *
+from ahttp_client.cache import CacheEntry, MemoryCacheBackend, SQLiteCacheBackend
+from ahttp_client.response import BufferedResponse
+
+
+def test_fresh_response(run_with_server):
+    called = []
+
+    async def handler(_):
+        called.append(None)
+        return web.Response(text=str(len(called)), headers={"Cache-Control": "max-age=60"})
+
+    class TestSession(Session):
+        @request("GET", "/fresh", directly_response=True, cache=True)
+        async def fresh(self) -> None:
+            pass
+
+    async def test(server):
+        async with TestSession(str(server.make_url("/"))) as client:
+            response_1 = await client.fresh()
+            response_2 = await client.fresh()
+            assert await response_1.text() == "1"
+            assert await response_2.text() == "1"
+            assert isinstance(response_2, BufferedResponse)
+            assert len(called) == 1
+
+    run_with_server([web.get("/fresh", handler)], test)
+
+
+def test_revalidated_response(run_with_server):
+    called = []
+
+    async def handler(request: web.Request):
+        called.append(None)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304, headers={"ETag": '"v1"'})
+        return web.Response(text="BODY", headers={"Cache-Control": "no-cache", "ETag": '"v1"'})
+
+    class TestSession(Session):
+        @request("GET", "/etag", directly_response=True, cache=True)
+        async def etag(self) -> None:
+            pass
+
+    async def test(server):
+        async with TestSession(str(server.make_url("/"))) as client:
+            response_1 = await client.etag()
+            response_2 = await client.etag()
+            assert await response_1.text() == "BODY"
+            assert response_2.status == 200
+            assert await response_2.text() == "BODY"
+            assert len(called) == 2
+
+    run_with_server([web.get("/etag", handler)], test)
+
+
+def test_revalidated_response_headers():
+    async def send(method, url, **kwargs):
+        if kwargs.get("headers", {}).get("If-None-Match") == '"v1"':
+            return BufferedResponse(method, url, 304, "Not Modified", [("ETag", '"v1"'), ("Content-Length", "0")], b"")
+        headers = [("Cache-Control", "no-cache"), ("ETag", '"v1"'), ("Content-Length", "4")]
+        return BufferedResponse(method, url, 200, "OK", headers, b"BODY")
+
+    async def main():
+        cache = ResponseCache()
+        await cache.request(send, "GET", URL("https://test_base_url/"))
+        response = await cache.request(send, "GET", URL("https://test_base_url/"))
+        assert response.from_cache
+        assert response.headers.getall("Content-Length") == ["4"]
+        assert response.headers.getall("ETag") == ['"v1"']
+        assert await response.read() == b"BODY"
+
+    asyncio.run(main())
+
+
+def test_memory_backend_eviction():
+    async def main():
+        backend = MemoryCacheBackend(max_size=300)
+        for index in range(3):
+            await backend.set(str(index), CacheEntry("/", 200, "OK", [], b"0" * 100, 0, 0))
+        assert await backend.get("0") is None
+        assert await backend.get("2") is not None
+        assert backend.size <= 300
+
+    asyncio.run(main())
+
+
+def test_sqlite_backend(tmp_path):
+    async def main():
+        backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite"))
+        entry = CacheEntry("https://test_base_url/", 200, "OK", [("ETag", '"v1"')], b"BODY", 1.0, 2.0)
+        await backend.set("GET https://test_base_url/", entry)
+
+        stored_entry = await backend.get("GET https://test_base_url/")
+        assert stored_entry.body == b"BODY"
+        assert stored_entry.get_header("etag") == '"v1"'
+
+        await backend.delete("GET https://test_base_url/")
+        assert await backend.get("GET https://test_base_url/") is None
+        await backend.close()
+
+    asyncio.run(main())
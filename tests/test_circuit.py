@@ -0,0 +1,144 @@
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from ahttp_client import *
+
+
+class _Response:
+    def __init__(self, status: int):
+        self.status = status
+
+
+def test_circuit_breaker_transition():
+    transitions = []
+    breaker = CircuitBreaker(minimum_calls=2, open_duration=0.05, half_open_probes=1)
+    breaker.add_listener(lambda key, previous, state: transitions.append((key, previous, state)))
+
+    async def send(status):
+        return _Response(status)
+
+    async def main():
+        await breaker.request(lambda *_, **__: send(500), "GET", None, endpoint="a")
+        await breaker.request(lambda *_, **__: send(500), "GET", None, endpoint="a")
+        assert breaker.state("a") == CircuitState.OPEN
+        assert breaker.state("b") == CircuitState.CLOSED
+
+        with pytest.raises(CircuitOpenError) as exc_info:
+            await breaker.request(lambda *_, **__: send(200), "GET", None, endpoint="a")
+        assert exc_info.value.key == "a"
+
+        await asyncio.sleep(0.06)
+        assert breaker.state("a") == CircuitState.HALF_OPEN
+        await breaker.request(lambda *_, **__: send(200), "GET", None, endpoint="a")
+        assert breaker.state("a") == CircuitState.CLOSED
+
+    asyncio.run(main())
+    assert [state for _, _, state in transitions] == [CircuitState.OPEN, CircuitState.HALF_OPEN, CircuitState.CLOSED]
+
+
+def test_circuit_breaker_half_open_failure():
+    breaker = CircuitBreaker(minimum_calls=1, open_duration=0.0, half_open_probes=2)
+
+    async def fail(*_, **__):
+        raise aiohttp.ServerDisconnectedError()
+
+    async def main():
+        with pytest.raises(aiohttp.ServerDisconnectedError):
+            await breaker.request(fail, "GET", None, endpoint="a")
+        assert breaker.state("a") == CircuitState.HALF_OPEN
+        with pytest.raises(aiohttp.ServerDisconnectedError):
+            await breaker.request(fail, "GET", None, endpoint="a")
+        assert breaker._circuits["a"].state == CircuitState.OPEN
+
+    asyncio.run(main())
+
+
+def test_circuit_breaker_stale_call():
+    breaker = CircuitBreaker(minimum_calls=1, open_duration=0.0, half_open_probes=1)
+    released = asyncio.Event()
+
+    async def slow(*_, **__):
+        await released.wait()
+        return _Response(200)
+
+    async def fail(*_, **__):
+        return _Response(500)
+
+    async def main():
+        # The call is admitted while the circuit is closed.
+        task = asyncio.ensure_future(breaker.request(slow, "GET", None, endpoint="a"))
+        await asyncio.sleep(0)
+        await breaker.request(fail, "GET", None, endpoint="a")
+        assert breaker.state("a") == CircuitState.HALF_OPEN
+
+        # The call finished in the half-open state is not counted as a probe.
+        released.set()
+        await task
+        assert breaker.state("a") == CircuitState.HALF_OPEN
+        assert breaker._circuits["a"].probe_successes == 0
+
+    asyncio.run(main())
+
+
+def test_circuit_breaker_async_listener():
+    transitions = []
+    breaker = CircuitBreaker(minimum_calls=1, open_duration=60)
+
+    @breaker.add_listener
+    async def listener(key, previous, state):
+        await asyncio.sleep(0)
+        transitions.append(state)
+
+    async def fail(*_, **__):
+        return _Response(500)
+
+    async def main():
+        await breaker.request(fail, "GET", None, endpoint="a")
+        assert len(breaker._listener_tasks) == 1
+        await asyncio.gather(*breaker._listener_tasks)
+        await asyncio.sleep(0)
+        assert len(breaker._listener_tasks) == 0
+
+    asyncio.run(main())
+    assert transitions == [CircuitState.OPEN]
+
+
+class CircuitSession(Session):
+    circuit_breaker = CircuitBreaker(minimum_calls=2, open_duration=60)
+
+    @request("GET", "/broken")
+    async def broken(self, response: aiohttp.ClientResponse):
+        return response.status
+
+    @request("GET", "/healthy")
+    async def healthy(self, response: aiohttp.ClientResponse):
+        return response.status
+
+
+def test_session_circuit_breaker():
+    calls = []
+
+    async def broken(_: web.Request):
+        calls.append(None)
+        return web.Response(status=503)
+
+    async def healthy(_: web.Request):
+        return web.Response(text="ok")
+
+    async def main():
+        app = web.Application()
+        app.add_routes([web.get("/broken", broken), web.get("/healthy", healthy)])
+        async with TestServer(app) as server:
+            async with CircuitSession(str(server.make_url("/"))) as client:
+                assert await client.broken() == 503
+                assert await client.broken() == 503
+                with pytest.raises(CircuitOpenError):
+                    await client.broken()
+                assert len(calls) == 2
+                assert await client.healthy() == 200
+
+    asyncio.run(main())
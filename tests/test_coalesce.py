@@ -0,0 +1,53 @@
+import asyncio
+
+from aiohttp import web
+
+from ahttp_client import *
+
+
+class CoalesceSession(Session):
+    @request("GET", "/slow", directly_response=True, coalesce=True)
+    async def slow(self) -> None:
+        pass
+
+
+def test_coalesced_request(run_with_server):
+    called = []
+
+    async def handler(_):
+        called.append(None)
+        await asyncio.sleep(0.05)
+        return web.Response(text="OK")
+
+    async def test(server):
+        async with CoalesceSession(str(server.make_url("/"))) as client:
+            responses = await asyncio.gather(*[client.slow() for _ in range(5)])
+            assert [await response.text() for response in responses] == ["OK"] * 5
+            assert len(called) == 1
+            assert len(client._request_coalescer) == 0
+
+    run_with_server([web.get("/slow", handler)], test)
+
+
+def test_cancelled_leader(run_with_server):
+    called = []
+
+    async def handler(_):
+        called.append(None)
+        await asyncio.sleep(0.05)
+        return web.Response(text="OK")
+
+    async def test(server):
+        async with CoalesceSession(str(server.make_url("/"))) as client:
+            leader = asyncio.create_task(client.slow())
+            await asyncio.sleep(0.01)
+            follower = asyncio.create_task(client.slow())
+            await asyncio.sleep(0.01)
+            leader.cancel()
+
+            response = await follower
+            assert await response.text() == "OK"
+            assert leader.cancelled()
+            assert len(called) == 1
+
+    run_with_server([web.get("/slow", handler)], test)
@@ -0,0 +1,135 @@
+import asyncio
+import importlib.util
+from collections.abc import AsyncIterator
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from ahttp_client import *
+
+
+class CountingCodec(JsonCodec):
+    def __init__(self):
+        self.encoded = 0
+        self.decoded = 0
+
+    def encode(self, obj):
+        self.encoded += 1
+        return super().encode(obj)
+
+    def decode(self, data):
+        self.decoded += 1
+        return super().decode(data)
+
+
+@pytest.mark.parametrize(
+    "codec_type, module", [(JsonCodec, "json"), (OrjsonCodec, "orjson"), (MsgspecCodec, "msgspec")]
+)
+def test_codec(codec_type: type[JsonCodec], module: str):
+    pytest.importorskip(module)
+    codec = codec_type()
+    data = {"name": "강남", "lines": [2, "신분당"], "transfer": True, "exit": None}
+    assert codec.decode(codec.encode(data)) == data
+    assert codec.decode(memoryview(codec.encode(data))) == data
+    assert codec.decode('{"a": 1}') == {"a": 1}
+
+
+def test_default_codec():
+    assert default_codec() is default_codec()
+    assert type(default_codec()) is JsonCodec
+    assert fastest_codec() is fastest_codec()
+    assert fastest_codec().name == next(
+        (name for name in ("orjson", "msgspec") if importlib.util.find_spec(name)), "json"
+    )
+
+
+@pytest.mark.parametrize("codec", [default_codec(), fastest_codec()])
+def test_non_str_keys(codec: JsonCodec):
+    # The keys which aren't str are encoded like the `json=` argument of aiohttp.
+    assert codec.decode(codec.encode({1: "x", "a": [1]})) == {"1": "x", "a": [1]}
+
+
+class CodecSession(Session):
+    @request("POST", "/echo")
+    async def echo(self, response: aiohttp.ClientResponse, name: BodyJson | str | dict) -> dict:
+        return {"content_type": response.headers["X-Content-Type"], "body": await self.json_codec.read(response)}
+
+    @request("GET", "/records")
+    async def records(self) -> AsyncIterator[dict]:
+        pass
+
+
+def test_session_codec():
+    async def echo(request: web.Request):
+        return web.Response(body=await request.read(), headers={"X-Content-Type": request.content_type})
+
+    async def records(_):
+        return web.Response(body=b'{"id": 1}\n{"id": 2}\n')
+
+    async def main():
+        app = web.Application()
+        app.router.add_post("/echo", echo)
+        app.router.add_get("/records", records)
+        async with TestServer(app) as server:
+            codec = CountingCodec()
+            async with CodecSession(str(server.make_url("")), json_codec=codec) as session:
+                assert await session.echo("Gangnam") == {
+                    "content_type": "application/json",
+                    "body": {"name": "Gangnam"},
+                }
+                assert [record async for record in await session.records()] == [{"id": 1}, {"id": 2}]
+            assert codec.encoded == 1
+            assert codec.decoded == 3
+
+            async with CodecSession(str(server.make_url(""))) as session:
+                assert session.json_codec is default_codec()
+                assert (await session.echo({1: "x"}))["body"] == {"name": {"1": "x"}}
+
+    asyncio.run(main())
+
+
+class ReplayedCodecSession(Session):
+    @request("GET", "/record", cache=True)
+    async def record(self, response: aiohttp.ClientResponse) -> dict:
+        return await response.json()
+
+    @sse("/events")
+    async def events(self) -> EventSource:
+        pass
+
+
+def test_replayed_response_codec():
+    async def record(_):
+        return web.json_response({"id": 1}, headers={"Cache-Control": "max-age=60"})
+
+    async def events(request: web.Request):
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        await response.write(b'data: {"id": 2}\n\n')
+        return response
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/record", record)
+        app.router.add_get("/events", events)
+        async with TestServer(app) as server:
+            codec = CountingCodec()
+            async with ReplayedCodecSession(str(server.make_url("")), json_codec=codec) as session:
+                assert await session.record() == {"id": 1}
+                assert codec.decoded == 0
+
+                # The cached response is decoded with the codec of session.
+                assert await session.record() == {"id": 1}
+                assert codec.decoded == 1
+
+                event_source = await session.events()
+                async for event in event_source:
+                    assert event.json() == {"id": 2}
+                    assert event == ServerSentEvent("message", '{"id": 2}')
+                    break
+                event_source.close()
+                assert codec.decoded == 2
+
+    asyncio.run(main())
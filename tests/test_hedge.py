@@ -0,0 +1,121 @@
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from ahttp_client import *
+from ahttp_client.hedge import LatencyWindow
+
+
+def test_latency_window():
+    window = LatencyWindow(size=100)
+    assert window.percentile(0.95) is None
+    for latency in range(1, 201):
+        window.record(latency)
+    assert len(window) == 100
+    assert window.percentile(0.95) == 195
+    assert window.percentile(1.0) == 200
+
+
+def test_hedge_delay():
+    policy = HedgePolicy(min_samples=2)
+    assert policy.get_delay("a") is None
+    policy.latency("a").record(0.1)
+    policy.latency("a").record(0.2)
+    assert policy.get_delay("a") == 0.2
+    assert HedgePolicy(0.5).get_delay("a") == 0.5
+
+    with pytest.raises(ValueError):
+        HedgePolicy(max_hedges=0)
+
+
+class HedgeSession(Session):
+    @request("GET", "/slow", hedge_policy=HedgePolicy(0.05, max_hedges=2))
+    async def slow(self, response: aiohttp.ClientResponse):
+        return await response.text()
+
+    @request("POST", "/slow", hedge_policy=HedgePolicy(0.05))
+    async def create(self, response: aiohttp.ClientResponse):
+        return await response.text()
+
+
+def test_session_hedge():
+    calls = []
+
+    async def handler(request: web.Request):
+        calls.append(request.method)
+        # The first request is delayed.
+        if len(calls) == 1:
+            await asyncio.sleep(1)
+        return web.Response(text=str(len(calls)))
+
+    async def main():
+        app = web.Application()
+        app.add_routes([web.get("/slow", handler), web.post("/slow", handler)])
+        async with TestServer(app) as server:
+            async with HedgeSession(str(server.make_url("/"))) as client:
+                assert await client.slow() == "2"
+                assert len(calls) == 2
+
+                # The request of non-idempotent method is not hedged.
+                calls.clear()
+                calls.append("GET")
+                assert await client.create() == "2"
+                assert len(calls) == 2
+
+    asyncio.run(main())
+
+
+def test_hedge_release_tied_response():
+    class FakeResponse:
+        released = False
+
+        def release(self):
+            self.released = True
+
+    responses = []
+    started = asyncio.Event()
+
+    async def send(method, url, **kwargs):
+        response = FakeResponse()
+        responses.append(response)
+        if len(responses) == 2:
+            started.set()
+        # Both attempts are completed at the same time.
+        await started.wait()
+        return response
+
+    async def main():
+        policy = HedgePolicy(0.0)
+        response = await policy.request(send, "GET", "http://localhost/", endpoint="a")
+        assert len(responses) == 2
+        assert [x.released for x in responses if x is not response] == [True]
+        assert not response.released
+        assert len(policy.latency("a")) == 2
+
+    asyncio.run(main())
+
+
+def test_hedge_record_cancelled_latency():
+    calls = 0
+
+    async def send(method, url, **kwargs):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(1)
+        return None
+
+    async def main():
+        policy = HedgePolicy(0.05)
+        await policy.request(send, "GET", "http://localhost/", endpoint="a")
+        await asyncio.sleep(0)
+
+        # The latency of the cancelled attempt is recorded as a lower bound.
+        window = policy.latency("a")
+        assert len(window) == 2
+        assert window.percentile(1.0) >= 0.05
+
+    asyncio.run(main())
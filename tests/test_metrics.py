@@ -0,0 +1,113 @@
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from ahttp_client import *
+
+
+def test_metrics_cardinality():
+    metrics = MetricsRegistry(max_endpoints=2)
+    assert metrics.label("a") == "a"
+    assert metrics.label("b") == "b"
+    assert metrics.label("c") == "__other__"
+    assert metrics.label("a") == "a"
+    assert metrics.label(None) == "__other__"
+
+    with pytest.raises(ValueError):
+        MetricsRegistry(max_endpoints=0)
+
+
+def test_metrics_render():
+    async def send(method, url, **kwargs):
+        if method == "DELETE":
+            raise aiohttp.ClientConnectionError()
+        return BufferedResponse(method, url, 200, "OK", [], b"x" * 300)
+
+    async def main():
+        metrics = MetricsRegistry(latency_buckets=(0.5, 1.0), size_buckets=(100, 1000))
+        await metrics.request(send, "GET", "http://localhost/a", endpoint='say "hi"')
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await metrics.request(send, "DELETE", "http://localhost/a", endpoint='say "hi"')
+        metrics.record_retry('say "hi"')
+        return metrics
+
+    metrics = asyncio.run(main())
+    text = metrics.render()
+    assert 'ahttp_client_requests_total{endpoint="say \\"hi\\"",method="GET",status="200"} 1\n' in text
+    assert 'ahttp_client_requests_in_flight{endpoint="say \\"hi\\""} 0\n' in text
+    assert 'ahttp_client_request_duration_seconds_bucket{endpoint="say \\"hi\\"",le="0.5"} 1\n' in text
+    assert 'ahttp_client_request_duration_seconds_count{endpoint="say \\"hi\\""} 1\n' in text
+    assert 'ahttp_client_response_size_bytes_bucket{endpoint="say \\"hi\\"",le="100"} 0\n' in text
+    assert 'ahttp_client_response_size_bytes_bucket{endpoint="say \\"hi\\"",le="1000"} 1\n' in text
+    assert 'ahttp_client_response_size_bytes_bucket{endpoint="say \\"hi\\"",le="+Inf"} 1\n' in text
+    assert 'ahttp_client_response_size_bytes_sum{endpoint="say \\"hi\\""} 300.0\n' in text
+    assert 'ahttp_client_retries_total{endpoint="say \\"hi\\""} 1\n' in text
+    assert 'ahttp_client_errors_total{endpoint="say \\"hi\\"",error="ClientConnectionError"} 1\n' in text
+    assert "# TYPE ahttp_client_requests_in_flight gauge\n" in text
+    assert "# TYPE ahttp_client_request_duration_seconds histogram\n" in text
+
+    metrics.reset()
+    assert metrics.snapshot() == {
+        'say "hi"': {
+            "requests": {},
+            "in_flight": 0,
+            "latency": None,
+            "response_size": None,
+            "retries": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "errors": {},
+        }
+    }
+
+
+class MeasuredSession(Session):
+    metrics = None
+
+    @request("GET", "/hello/{name}", cache=True)
+    async def hello(self, response: aiohttp.ClientResponse, name: Path | str) -> str:
+        return await response.text()
+
+    @request("GET", "/flaky", retry_policy=RetryPolicy(attempts=2, backoff_base=0.0, backoff_max=0.0))
+    async def flaky(self, response: aiohttp.ClientResponse) -> int:
+        return response.status
+
+
+def test_session_metrics():
+    attempts = 0
+
+    async def hello(request: web.Request):
+        return web.Response(text="Hello, %s" % request.match_info["name"], headers={"Cache-Control": "max-age=60"})
+
+    async def flaky(request: web.Request):
+        nonlocal attempts
+        attempts += 1
+        return web.Response(status=503 if attempts == 1 else 200)
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/hello/{name}", hello)
+        app.router.add_get("/flaky", flaky)
+        async with TestServer(app) as server:
+            async with MeasuredSession(str(server.make_url("")), metrics=MetricsRegistry()) as session:
+                assert await session.hello("world") == "Hello, world"
+                assert await session.hello("world") == "Hello, world"
+                assert await session.hello("python") == "Hello, python"
+                assert await session.flaky() == 200
+
+                snapshot = session.metrics.snapshot()
+                # The formatted paths are labeled by the name of request.
+                assert list(snapshot.keys()) == ["hello", "flaky"]
+                assert snapshot["hello"]["requests"] == {"GET": {200: 3}}
+                assert snapshot["hello"]["cache_hits"] == 1
+                assert snapshot["hello"]["cache_misses"] == 2
+                assert snapshot["hello"]["latency"]["count"] == 3
+                assert snapshot["hello"]["response_size"]["count"] == 3
+                assert snapshot["flaky"]["requests"] == {"GET": {503: 1, 200: 1}}
+                assert snapshot["flaky"]["retries"] == 1
+                assert snapshot["flaky"]["in_flight"] == 0
+
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from ahttp_client import *
+
+CALLS = []
+
+
+async def outer(request: RequestState, call_next):
+    CALLS.append("outer")
+    request.headers["X-Token"] = "token"
+    response = await call_next(request)
+    CALLS.append("outer-end")
+    return response
+
+
+async def inner(request: RequestState, call_next):
+    CALLS.append("inner:%s" % request.path)
+    return await call_next(request)
+
+
+async def short_circuit(request: RequestState, call_next):
+    return BufferedResponse(request.method, "http://cache", 200, "OK", [], b"cached")
+
+
+class MiddlewareSession(Session):
+    middlewares = (outer,)
+
+    @request("GET", "/token/{name}", directly_response=True, middlewares=[inner])
+    async def token(self, name: Path | str) -> str:
+        pass
+
+    @request("GET", "/token/{name}", directly_response=True, middlewares=[short_circuit])
+    async def cached(self, name: Path | str) -> str:
+        pass
+
+    @token.after_hook
+    async def read_text(self, response):
+        return await response.text()
+
+    @cached.after_hook
+    async def read_cached(self, response):
+        return await response.text()
+
+
+class PlainSession(Session):
+    @request("GET", "/token/{name}")
+    async def token(self, name: Path | str):
+        pass
+
+
+def test_middleware_handler():
+    async def main():
+        async with PlainSession("http://localhost"):
+            # Without middlewares, the request is dispatched directly.
+            assert PlainSession.token._handler is None
+
+        async with PlainSession("http://localhost", middlewares=[outer]) as session:
+            assert session.middlewares == (outer,)
+            assert PlainSession.token._handler is not None
+
+    asyncio.run(main())
+
+
+def test_middleware():
+    async def token(request: web.Request):
+        return web.Response(text="%s:%s" % (request.match_info["name"], request.headers.get("X-Token")))
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/token/{name}", token)
+        async with TestServer(app) as server:
+            async with MiddlewareSession(str(server.make_url(""))) as session:
+                assert await session.token("a") == "a:token"
+                assert CALLS == ["outer", "inner:/token/a", "outer-end"]
+
+                assert await session.cached("a") == "cached"
+
+    asyncio.run(main())
@@ -0,0 +1,124 @@
+import asyncio
+
+import aiohttp
+import msgspec
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from ahttp_client import *
+from ahttp_client.extension import get_msgspec_decoder, msgspec_request_model, msgspec_response_model
+
+
+class Station(msgspec.Struct):
+    id: int
+    name: str
+
+
+class MsgspecSession(Session):
+    @msgspec_response_model(index=0)
+    @request("GET", "/station", directly_response=True)
+    async def station(self) -> Station:
+        pass
+
+    @msgspec_response_model(index=0)
+    @request("GET", "/stations", directly_response=True)
+    async def stations(self) -> Station:
+        pass
+
+    @msgspec_response_model(list[Station], index=0)
+    @request("GET", "/stations", directly_response=True)
+    async def station_list(self) -> list[Station]:
+        pass
+
+    @msgspec_response_model(list[Station], index=0)
+    @request("GET", "/station", directly_response=True)
+    async def station_object(self) -> list[Station]:
+        pass
+
+    @msgspec_response_model(index=0)
+    @request("GET", "/empty", directly_response=True)
+    async def empty(self) -> Station:
+        pass
+
+
+class RequestModelSession(Session):
+    @msgspec_request_model(index=0)
+    @request("POST", "/echo")
+    async def create(
+        self, response: aiohttp.ClientResponse, body: Body | Station, filter: Query | Station | None = None
+    ) -> dict:
+        return {
+            "content_type": response.headers.get("X-Content-Type"),
+            "filter": response.headers.get("X-Filter"),
+            "body": await response.json(),
+        }
+
+    @msgspec_request_model(index=0)
+    @request("POST", "/echo")
+    async def create_many(self, response: aiohttp.ClientResponse, body: Body | list[Station]) -> dict:
+        return await response.json()
+
+
+def test_decoder_cache():
+    assert get_msgspec_decoder(Station) is get_msgspec_decoder(Station)
+    assert get_msgspec_decoder(list[Station]) is get_msgspec_decoder(list[Station])
+    assert get_msgspec_decoder(Station).decode(b'{"id": 1, "name": "Seoul"}') == Station(id=1, name="Seoul")
+
+
+def test_invalid_model():
+    with pytest.raises(TypeError):
+
+        @msgspec_response_model()
+        @request("GET", "/station")
+        async def station(self):
+            pass
+
+
+def test_msgspec_response_model():
+    async def station(_):
+        return web.Response(body=b'{"id": 1, "name": "Seoul"}', content_type="application/json")
+
+    async def stations(_):
+        return web.Response(body=b' [{"id": 1, "name": "Seoul"}, {"id": 2, "name": "Busan"}]')
+
+    async def empty(_):
+        return web.Response(body=b"")
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/station", station)
+        app.router.add_get("/stations", stations)
+        app.router.add_get("/empty", empty)
+        async with TestServer(app) as server:
+            async with MsgspecSession(str(server.make_url(""))) as session:
+                assert await session.station() == Station(id=1, name="Seoul")
+                assert await session.stations() == [Station(id=1, name="Seoul"), Station(id=2, name="Busan")]
+                assert await session.station_list() == [Station(id=1, name="Seoul"), Station(id=2, name="Busan")]
+                assert await session.station_object() == Station(id=1, name="Seoul")
+                assert await session.empty() is None
+
+    asyncio.run(main())
+
+
+def test_msgspec_request_model():
+    async def echo(request: web.Request):
+        return web.json_response(
+            await request.json(),
+            headers={"X-Filter": request.query.get("filter", ""), "X-Content-Type": request.content_type},
+        )
+
+    async def main():
+        app = web.Application()
+        app.router.add_post("/echo", echo)
+        async with TestServer(app) as server:
+            async with RequestModelSession(str(server.make_url(""))) as session:
+                result = await session.create(Station(id=1, name="Seoul"), filter=Station(id=2, name="Busan"))
+                assert result["body"] == {"id": 1, "name": "Seoul"}
+                assert result["content_type"] == "application/json"
+                assert result["filter"] == '{"id":2,"name":"Busan"}'
+
+                assert await session.create_many([Station(id=1, name="Seoul")]) == [{"id": 1, "name": "Seoul"}]
+                assert await session.create_many([]) == []
+
+    asyncio.run(main())
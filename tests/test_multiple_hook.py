@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from ahttp_client import *
+from ahttp_client.extension import get_hook_chain, multiple_hook
+
+CALLS = []
+
+
+class HookSession(Session):
+    @request("GET", "/hello", directly_response=True)
+    async def hello(self, name: Query | str) -> str:
+        pass
+
+    @multiple_hook(hello.before_hook, index=None)
+    async def before_last(self, request, path):
+        CALLS.append("last")
+        return request, path
+
+    @multiple_hook(hello.before_hook, index=2)
+    async def before_second(self, request, path):
+        CALLS.append("second")
+        request.params["name"] = request.params["name"].upper()
+        return request, path
+
+    @multiple_hook(hello.before_hook, index=1)
+    async def before_first(self, request, path):
+        CALLS.append("first")
+        return request, path
+
+    @multiple_hook(hello.after_hook)
+    async def read_text(self, response):
+        return await response.text()
+
+    @multiple_hook(hello.after_hook, index=None)
+    async def exclaim(self, text):
+        return text + "!"
+
+
+def test_hook_chain_order():
+    chain = get_hook_chain(HookSession.hello.before_hook)
+    assert chain.hooks == [HookSession.before_first, HookSession.before_second, HookSession.before_last]
+    assert [index for index, _ in chain.order] == [1, 2, None]
+    assert HookSession.before_first in chain
+    assert get_hook_chain(HookSession.hello.after_hook).hooks == [HookSession.read_text, HookSession.exclaim]
+
+
+def test_hook_chain_remove():
+    @request("GET", "/hello")
+    async def hello(self):
+        pass
+
+    async def hook(self, request, path):
+        return request, path
+
+    chain = get_hook_chain(hello.before_hook)
+    assert len(chain) == 0
+
+    multiple_hook(hello.before_hook)(hook)
+    # A single hook is registered directly.
+    assert hello._before_hook is hook
+
+    chain.remove(hook)
+    # An empty chain removes the hook of the request.
+    assert hello._before_hook is None
+    with pytest.raises(ValueError):
+        chain.remove(hook)
+
+
+def test_multiple_hook():
+    async def hello(request: web.Request):
+        return web.Response(text="Hello, %s" % request.query["name"])
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/hello", hello)
+        async with TestServer(app) as server:
+            async with HookSession(str(server.make_url(""))) as session:
+                assert await session.hello("world") == "Hello, WORLD!"
+                assert CALLS == ["first", "second", "last"]
+
+    asyncio.run(main())
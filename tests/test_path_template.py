@@ -0,0 +1,78 @@
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from yarl import URL
+
+from ahttp_client import *
+from ahttp_client.path_template import PathTemplate
+
+
+def test_static_path():
+    template = PathTemplate("/metro/station")
+    assert template.is_static is True
+    assert template.format({}) == "/metro/station"
+
+    base_url = URL("https://test_base_url")
+    url = template.url(base_url, template.format({}), encoded=True)
+    assert str(url) == "https://test_base_url/metro/station"
+    assert template.url(base_url, template.format({}), encoded=True) is url
+
+
+def test_quoted_path():
+    template = PathTemplate("/users/{user}/repos/{repo!s:>3}")
+    assert template.is_static is False
+    assert template.field_names == {"user", "repo"}
+    assert template.format({"user": "a b/c", "repo": 1}) == "/users/a%20b%2Fc/repos/%20%201"
+
+    with pytest.raises(KeyError):
+        template.format({"user": "user"})
+
+
+def test_url_cache():
+    template = PathTemplate("/users/{user}", cache_size=2)
+    base_url = URL("https://test_base_url/api/")
+
+    url_1 = template.url(base_url, template.format({"user": "user_1"}), encoded=True)
+    assert str(url_1) == "https://test_base_url/users/user_1"
+    assert template.url(base_url, "/users/user_1", encoded=True) is url_1
+
+    template.url(base_url, template.format({"user": "user_2"}), encoded=True)
+    template.url(base_url, template.format({"user": "user_3"}), encoded=True)
+    assert len(template._url_cache) == 2
+    assert (base_url, "/users/user_1", True) not in template._url_cache
+
+
+def test_encoded_url():
+    template = PathTemplate("/users/{user}")
+    base_url = URL("https://test_base_url")
+    assert template.url(base_url, "/users/a%20b", encoded=True).raw_path == "/users/a%20b"
+    assert template.url(base_url, "/users/a b").raw_path == "/users/a%20b"
+    assert template.url(base_url, "/users/가").raw_path == "/users/%EA%B0%80"
+
+
+class HookSession(Session):
+    @request("GET", "/users/{user}")
+    async def user(self, response: aiohttp.ClientResponse, user: Path | str) -> str:
+        return await response.text()
+
+    @user.before_hook
+    async def before_hook(self, request, path):
+        # The path returned by hooks is not percent-encoded.
+        return request, path + "/a b"
+
+
+def test_hook_path_encoding():
+    async def handler(request: web.Request):
+        return web.Response(text=request.raw_path)
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/users/{user}/{name}", handler)
+        async with TestServer(app) as server:
+            async with HookSession(str(server.make_url(""))) as session:
+                assert await session.user("가") == "/users/%EA%B0%80/a%20b"
+
+    asyncio.run(main())
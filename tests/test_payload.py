@@ -0,0 +1,102 @@
+import asyncio
+import io
+import mmap
+import pathlib
+from typing import Annotated, AsyncIterator
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from ahttp_client import *
+from ahttp_client.payload import BufferPayload, FilePayload, is_binary_body, is_replayable_body, make_payload
+
+DATA = b"0123456789" * 10000
+
+
+def test_make_payload(tmp_path: pathlib.Path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(DATA)
+
+    payload = make_payload(path)
+    assert isinstance(payload, FilePayload)
+    assert payload.size == len(DATA)
+
+    payload = make_payload(memoryview(DATA))
+    assert isinstance(payload, BufferPayload)
+    assert payload.size == len(DATA)
+    assert make_payload(DATA) is DATA
+
+    assert is_binary_body(DATA)
+    assert not is_binary_body({"a": 1})
+
+
+def test_replayable_body():
+    async def generator():
+        yield b"a"
+
+    assert is_replayable_body(DATA)
+    assert is_replayable_body(io.BytesIO(DATA))
+    assert not is_replayable_body(generator())
+
+
+class UploadSession(Session):
+    @request("POST", "/upload")
+    async def upload_path(self, response: aiohttp.ClientResponse, body: Annotated[pathlib.Path, Body]):
+        return await response.json()
+
+    @request("POST", "/upload")
+    async def upload_bytes(self, response: aiohttp.ClientResponse, body: Annotated[bytes, Body]):
+        return await response.json()
+
+    @request("POST", "/upload")
+    async def upload_stream(self, response: aiohttp.ClientResponse, body: Annotated[AsyncIterator[bytes], Body]):
+        return await response.json()
+
+    @request("POST", "/upload")
+    async def upload_any(self, response: aiohttp.ClientResponse, body: Annotated[dict | memoryview, Body]):
+        return await response.json()
+
+    @request("POST", "/form")
+    async def upload_form(self, response: aiohttp.ClientResponse, file: BodyForm, name: BodyForm):
+        return await response.json()
+
+
+def test_session_upload(tmp_path: pathlib.Path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(DATA)
+
+    async def upload(request: web.Request):
+        body = await request.read()
+        return web.json_response(
+            {"size": len(body), "equal": body == DATA, "chunked": "Content-Length" not in request.headers}
+        )
+
+    async def form(request: web.Request):
+        data = await request.post()
+        return web.json_response({"size": len(data["file"].file.read()), "name": data["name"]})
+
+    async def generator():
+        for index in range(0, len(DATA), 1000):
+            yield DATA[index : index + 1000]
+
+    async def main():
+        app = web.Application(client_max_size=1024 * 1024)
+        app.add_routes([web.post("/upload", upload), web.post("/form", form)])
+        async with TestServer(app) as server:
+            async with UploadSession(str(server.make_url("/"))) as client:
+                expected = {"size": len(DATA), "equal": True, "chunked": False}
+                assert await client.upload_path(path) == expected
+                assert await client.upload_bytes(DATA) == expected
+                assert await client.upload_stream(generator()) == {**expected, "chunked": True}
+                assert await client.upload_any(memoryview(DATA)) == expected
+                assert (await client.upload_any({"a": 1}))["size"] == len(b'{"a":1}')
+
+                with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    assert await client.upload_any(mapped) == expected
+
+                with open(path, "rb") as file:
+                    assert await client.upload_form(file, "a") == {"size": len(DATA), "name": "a"}
+                assert await client.upload_form(path, "b") == {"size": len(DATA), "name": "b"}
+
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from ahttp_client import *
+
+
+def test_profiler_sampling():
+    profiler = Profiler(sample_rate=0.25)
+    sampled = [profiler.sample("hello") for _ in range(8)]
+    assert [stats is not None for stats in sampled] == [False, False, False, True] * 2
+    assert sampled[3] is sampled[7]
+
+    sampled[3].record(0, 1000)
+    sampled[3].record(0, 3000)
+    assert profiler.stats("hello") == {"bind": {"count": 2, "total": 4e-6, "mean": 2e-6, "max": 3e-6}}
+    assert profiler.stats("unknown") == {}
+
+    with pytest.raises(ValueError):
+        Profiler(sample_rate=0)
+
+
+class ProfiledSession(Session):
+    profiler = Profiler()
+
+    @request("GET", "/hello")
+    async def hello(self, response: aiohttp.ClientResponse, name: Query | str) -> str:
+        return await response.text()
+
+    @hello.before_hook
+    async def before_hook(self, request, path):
+        return request, path
+
+    @hello.after_hook
+    async def after_hook(self, response):
+        return response
+
+    async def before_request(self, request, path):
+        return request, path
+
+
+def test_session_stats():
+    async def hello(request: web.Request):
+        return web.Response(text="Hello, %s" % request.query["name"])
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/hello", hello)
+        async with TestServer(app) as server:
+            async with ProfiledSession(str(server.make_url(""))) as session:
+                assert await session.hello("world") == "Hello, world"
+                assert await session.hello("world") == "Hello, world"
+
+                stats = session.stats()
+                assert list(stats.keys()) == ["hello"]
+                assert set(stats["hello"].keys()) == {
+                    "bind",
+                    "before_hook",
+                    "before_request",
+                    "request_kwargs",
+                    "network",
+                    "after_hook",
+                    "function",
+                    "total",
+                }
+                assert all(phase["count"] == 2 for phase in stats["hello"].values())
+                assert stats["hello"]["total"]["total"] >= stats["hello"]["network"]["total"]
+                assert session.stats("hello") == stats["hello"]
+
+            async with Session("http://localhost") as session:
+                assert session.stats() == {}
+
+    asyncio.run(main())
@@ -0,0 +1,156 @@
+import asyncio
+from typing import Annotated, Any
+
+import aiohttp
+import pydantic
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from ahttp_client import *
+from ahttp_client.extension import get_type_adapter, pydantic_request_model, pydantic_response_model
+from ahttp_client.extension._model import may_hold_model
+
+
+class Station(pydantic.BaseModel):
+    id: int
+    name: str
+
+
+class PydanticSession(Session):
+    @pydantic_response_model(index=0)
+    @request("GET", "/station", directly_response=True)
+    async def station(self) -> Station:
+        pass
+
+    @pydantic_response_model(index=0)
+    @request("GET", "/stations", directly_response=True)
+    async def stations(self) -> Station:
+        pass
+
+    @pydantic_response_model(list[Station], index=0)
+    @request("GET", "/stations", directly_response=True)
+    async def station_list(self) -> list[Station]:
+        pass
+
+    @pydantic_response_model(list[Station], index=0)
+    @request("GET", "/station", directly_response=True)
+    async def station_object(self) -> list[Station]:
+        pass
+
+    @pydantic_response_model(index=0, by_name=True)
+    @request("GET", "/station", directly_response=True)
+    async def station_by_name(self) -> Station:
+        pass
+
+    @pydantic_response_model(index=0)
+    @request("GET", "/empty", directly_response=True)
+    async def empty(self) -> Station:
+        pass
+
+
+class RequestModelSession(Session):
+    @pydantic_request_model(index=0)
+    @request("POST", "/echo")
+    async def create_any(
+        self, response: aiohttp.ClientResponse, body: Annotated[Any, Body], filter: Query = None
+    ) -> dict:
+        return {"filter": response.headers.get("X-Filter"), "body": await response.json()}
+
+    @pydantic_request_model(index=0)
+    @request("POST", "/echo")
+    async def create(
+        self, response: aiohttp.ClientResponse, body: Body | Station, filter: Query | Station | None = None
+    ) -> dict:
+        return {
+            "content_type": response.headers.get("X-Content-Type"),
+            "filter": response.headers.get("X-Filter"),
+            "body": await response.json(),
+        }
+
+    @pydantic_request_model(index=0)
+    @request("POST", "/echo")
+    async def create_many(self, response: aiohttp.ClientResponse, body: Body | list[Station]) -> dict:
+        return await response.json()
+
+
+def test_may_hold_model():
+    assert may_hold_model(Station, pydantic.BaseModel)
+    assert may_hold_model(Header | list[Station], pydantic.BaseModel)
+    assert may_hold_model(Annotated[Any, Body], pydantic.BaseModel)
+    assert may_hold_model(Query, pydantic.BaseModel)
+    assert may_hold_model("Station", pydantic.BaseModel)
+    assert not may_hold_model(Query | str, pydantic.BaseModel)
+    assert not may_hold_model(Body | dict | None, pydantic.BaseModel)
+    assert not may_hold_model(Annotated[list[int], Body], pydantic.BaseModel)
+
+
+def test_type_adapter_cache():
+    assert get_type_adapter(Station) is get_type_adapter(Station)
+    assert get_type_adapter(list[Station]) is get_type_adapter(list[Station])
+
+
+def test_invalid_model():
+    with pytest.raises(TypeError):
+
+        @pydantic_response_model()
+        @request("GET", "/station")
+        async def station(self):
+            pass
+
+
+def test_pydantic_response_model():
+    async def station(_):
+        return web.Response(body=b'{"id": 1, "name": "Seoul"}', content_type="application/json")
+
+    async def stations(_):
+        return web.Response(body=b' [{"id": 1, "name": "Seoul"}, {"id": 2, "name": "Busan"}]')
+
+    async def empty(_):
+        return web.Response(body=b"")
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/station", station)
+        app.router.add_get("/stations", stations)
+        app.router.add_get("/empty", empty)
+        async with TestServer(app) as server:
+            async with PydanticSession(str(server.make_url(""))) as session:
+                assert await session.station() == Station(id=1, name="Seoul")
+                assert await session.stations() == [Station(id=1, name="Seoul"), Station(id=2, name="Busan")]
+                assert await session.station_list() == [Station(id=1, name="Seoul"), Station(id=2, name="Busan")]
+                # The JSON object is validated as the model, even if the model is a list.
+                assert await session.station_object() == Station(id=1, name="Seoul")
+                assert await session.station_by_name() == Station(id=1, name="Seoul")
+                assert await session.empty() is None
+
+    asyncio.run(main())
+
+
+def test_pydantic_request_model():
+    async def echo(request: web.Request):
+        return web.json_response(
+            await request.json(),
+            headers={"X-Filter": request.query.get("filter", ""), "X-Content-Type": request.content_type},
+        )
+
+    async def main():
+        app = web.Application()
+        app.router.add_post("/echo", echo)
+        async with TestServer(app) as server:
+            async with RequestModelSession(str(server.make_url(""))) as session:
+                result = await session.create(Station(id=1, name="Seoul"), filter=Station(id=2, name="Busan"))
+                assert result["body"] == {"id": 1, "name": "Seoul"}
+                assert result["content_type"] == "application/json"
+                assert result["filter"] == '{"id":2,"name":"Busan"}'
+
+                assert await session.create_many([Station(id=1, name="Seoul")]) == [{"id": 1, "name": "Seoul"}]
+                assert await session.create_many([]) == []
+
+                # The annotation can't exclude a model. The values are checked at call time.
+                result = await session.create_any(Station(id=1, name="Seoul"), filter=Station(id=2, name="Busan"))
+                assert result == {"filter": '{"id":2,"name":"Busan"}', "body": {"id": 1, "name": "Seoul"}}
+                result = await session.create_any(b'{"id": 3}', filter="Daegu")
+                assert result == {"filter": "Daegu", "body": {"id": 3}}
+
+    asyncio.run(main())
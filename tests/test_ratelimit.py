@@ -0,0 +1,110 @@
+import asyncio
+import time
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from ahttp_client import *
+
+
+def test_token_bucket_burst():
+    async def main():
+        bucket = TokenBucket(rate=20, capacity=5)
+        start = time.monotonic()
+        for _ in range(5):
+            await bucket.acquire()
+        assert time.monotonic() - start < 0.05
+
+        await bucket.acquire(2)
+        assert time.monotonic() - start >= 0.09
+
+    asyncio.run(main())
+
+
+def test_token_bucket_fifo():
+    async def main():
+        bucket = TokenBucket(rate=100, capacity=1)
+        await bucket.acquire()
+
+        order = []
+
+        async def waiter(index, weight):
+            await bucket.acquire(weight)
+            order.append(index)
+
+        await asyncio.gather(waiter(0, 1), waiter(1, 1), waiter(2, 1))
+        assert order == [0, 1, 2]
+
+        with pytest.raises(ValueError):
+            await bucket.acquire(2)
+
+    asyncio.run(main())
+
+
+def test_token_bucket_cancel():
+    async def main():
+        bucket = TokenBucket(rate=10, capacity=1)
+        await bucket.acquire()
+
+        task = asyncio.ensure_future(bucket.acquire())
+        await asyncio.sleep(0)
+        assert bucket.waiters == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        await bucket.acquire()
+        assert bucket.waiters == 0
+
+    asyncio.run(main())
+
+
+def test_token_bucket_update():
+    bucket = TokenBucket(rate=100, capacity=10)
+    bucket.update(remaining=0, reset_after=60)
+    assert bucket.tokens == 0
+    assert not bucket.try_acquire()
+
+
+def test_rate_limiter_key():
+    from yarl import URL
+
+    assert RateLimiter(1, scope="host").make_key(URL("https://api.yhs.kr/a"), "a") == "api.yhs.kr"
+    assert RateLimiter(1, scope="endpoint").make_key(URL("https://api.yhs.kr/a"), "a") == "a"
+    assert RateLimiter(1).make_key(URL("https://api.yhs.kr/a"), "a") is None
+
+    with pytest.raises(ValueError):
+        RateLimiter(1, scope="unknown")
+
+
+class RateLimitedSession(Session):
+    rate_limiter = RateLimiter(20, burst=1)
+
+    @request("GET", "/limited", rate_limit_weight=1)
+    async def limited(self, response: aiohttp.ClientResponse):
+        return response.status
+
+    @request("GET", "/limited", rate_limiter=RateLimiter(1000, burst=4), rate_limit_weight=4)
+    async def weighted(self, response: aiohttp.ClientResponse):
+        return response.status
+
+
+def test_session_rate_limiter():
+    async def handler(_: web.Request):
+        return web.Response(text="ok", headers={"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": "1"})
+
+    async def main():
+        app = web.Application()
+        app.add_routes([web.get("/limited", handler)])
+        async with TestServer(app) as server:
+            async with RateLimitedSession(str(server.make_url("/"))) as client:
+                start = time.monotonic()
+                assert await asyncio.gather(*[client.limited() for _ in range(3)]) == [200, 200, 200]
+                assert time.monotonic() - start >= 0.09
+
+                with pytest.raises(ValueError):
+                    await client.weighted()
+
+    asyncio.run(main())
@@ -39,27 +39,39 @@ def test_copy_and_equal(test_method):
     bound_argument = test_method._signature.bind(test_method.session)
     bound_argument.apply_defaults()
 
-    other_method._fill_parameter(bound_argument)
-    assert other_method != test_method
+    state = other_method._fill_parameter(bound_argument)
+    assert other_method == test_method
+    assert state.headers != other_method.headers
 
 
-def test_fill_parameter(test_method):
-    new_method = test_method.copy()
+def test_immutable_template(test_method):
+    with pytest.raises(AttributeError):
+        test_method.headers = {"header": "OTHER_HEADER"}
 
-    assert "header" in new_method.header_parameter.keys()
-    assert "parameter" in new_method.query_parameter.keys()
+    with pytest.raises(TypeError):
+        test_method.headers["header"] = "OTHER_HEADER"
 
-    assert "header" not in new_method.headers.keys()
-    assert "parameter" not in new_method.params.keys()
+    with pytest.raises(TypeError):
+        test_method.query_parameter["parameter"] = None
+
+
+def test_fill_parameter(test_method):
+    assert "header" in test_method.header_parameter.keys()
+    assert "parameter" in test_method.query_parameter.keys()
 
     bound_argument = test_method._signature.bind(test_method.session)
     bound_argument.apply_defaults()
 
-    new_method._fill_parameter(bound_argument)
-    assert "header" in new_method.headers.keys()
-    assert "parameter" in new_method.params.keys()
-    assert new_method.headers["header"] == "TEST_HEADER"
-    assert new_method.params["parameter"] == "TEST_QUERY"
+    state = test_method._fill_parameter(bound_argument)
+    assert isinstance(state, RequestState)
+    assert state.core is test_method
+    assert "header" in state.headers.keys()
+    assert "parameter" in state.params.keys()
+    assert state.headers["header"] == "TEST_HEADER"
+    assert state.params["parameter"] == "TEST_QUERY"
+
+    assert "header" not in test_method.headers.keys()
+    assert "parameter" not in test_method.params.keys()
 
 
 def test_formatted_path(test_method):
@@ -80,3 +92,52 @@ def test_private_component(test_method_for_private_parameter):
 
     assert test_method_for_private_parameter.headers.get("private_header") == "__PRIVATE_HEADER__"
     assert test_method_for_private_parameter.params.get("private_query") == "__PRIVATE_QUERY__"
+
+
+def test_compiled_bind(test_method):
+    assert test_method._compiled_bind is not None
+
+    state, formatted_path, arguments = test_method._compiled_bind(
+        test_method.session, "OTHER_PATH", header="OTHER_HEADER"
+    )
+    assert state.headers == {"header": "OTHER_HEADER"}
+    assert state.params == {"parameter": "TEST_QUERY"}
+    assert state.body is None
+    assert formatted_path == "/OTHER_PATH"
+    assert arguments["test_path"] == "OTHER_PATH"
+
+    # The compiled function must be same as the generic path.
+    bound_argument = test_method._signature.bind(test_method.session, "OTHER_PATH", header="OTHER_HEADER")
+    bound_argument.apply_defaults()
+
+    other_state = test_method._fill_parameter(bound_argument)
+    assert other_state.headers == state.headers
+    assert other_state.params == state.params
+    assert test_method._get_request_path(bound_argument) == formatted_path
+    assert bound_argument.arguments == arguments
+
+
+def test_compiled_bind_keyword_only():
+    @request("POST", "/test_path")
+    async def test_request(
+        session: Session,
+        *,
+        body_1: Annotated[str, BodyJson],
+        body_2: Annotated[int, BodyJson.custom_name("bodyTwo")] = 2,
+    ) -> None:
+        pass
+
+    with pytest.raises(TypeError):
+        test_request._compiled_bind(test_request.session, "BODY")
+
+    state, _, _ = test_request._compiled_bind(test_request.session, body_1="BODY")
+    assert state.body == {"body_1": "BODY", "bodyTwo": 2}
+    assert state.get_request_kwargs() == {"json": {"body_1": "BODY", "bodyTwo": 2}}
+
+
+def test_uncompiled_signature():
+    @request("GET", "/test_path")
+    async def test_request(session: Session, /, **kwargs) -> None:
+        pass
+
+    assert test_request._compiled_bind is None
@@ -0,0 +1,125 @@
+import asyncio
+import datetime
+import email.utils
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from ahttp_client import *
+from ahttp_client.retry import parse_retry_after
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("invalid") is None
+
+    retry_at = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=30)
+    assert 25 < parse_retry_after(email.utils.format_datetime(retry_at, usegmt=True)) <= 30
+
+
+def test_next_delay():
+    policy = RetryPolicy(backoff_base=0.1, backoff_max=1.0)
+    delay = None
+    for _ in range(20):
+        delay = policy.next_delay(delay)
+        assert 0.1 <= delay <= 1.0
+
+
+def test_retry_budget():
+    budget = RetryBudget(ratio=0.5, min_retries=1)
+    for _ in range(4):
+        budget.record_request()
+    for _ in range(3):
+        assert budget.can_retry()
+        budget.record_retry()
+    assert not budget.can_retry()
+
+
+class RetrySession(Session):
+    retry_policy = RetryPolicy(attempts=3, backoff_base=0.0, backoff_max=0.01)
+
+    @request("GET", "/flaky")
+    async def flaky(self, response: aiohttp.ClientResponse):
+        return response.status
+
+    @request("GET", "/flaky", retry_policy=RetryPolicy(attempts=1))
+    async def no_retry(self, response: aiohttp.ClientResponse):
+        return response.status
+
+    @request("POST", "/flaky")
+    async def create(self, response: aiohttp.ClientResponse):
+        return response.status
+
+    @request(
+        "POST", "/flaky", retry_policy=RetryPolicy(attempts=3, backoff_base=0.0, backoff_max=0.01, idempotency_key=True)
+    )
+    async def create_with_key(self, response: aiohttp.ClientResponse):
+        return response.status
+
+
+def test_session_retry():
+    calls = []
+
+    async def handler(request: web.Request):
+        calls.append(request)
+        if len(calls) % 3 != 0:
+            return web.Response(status=503, headers={"Retry-After": "0"})
+        return web.Response(text="ok")
+
+    async def main():
+        app = web.Application()
+        app.add_routes([web.get("/flaky", handler), web.post("/flaky", handler)])
+        async with TestServer(app) as server:
+            async with RetrySession(str(server.make_url("/")), retry_budget=RetryBudget(min_retries=100)) as client:
+                before_request_calls = []
+
+                async def before_request(request, path):
+                    # The state of each attempt is the copy of original state.
+                    assert "X-Attempt" not in request.headers
+                    request.headers["X-Attempt"] = str(len(before_request_calls))
+                    before_request_calls.append(path)
+                    return request, path
+
+                client.before_request = before_request
+                client._is_before_request_overridden = True
+
+                assert await client.flaky() == 200
+                assert len(calls) == 3
+                assert len(before_request_calls) == 3
+                assert [call.headers["X-Attempt"] for call in calls] == ["0", "1", "2"]
+
+                calls.clear()
+                assert await client.no_retry() == 503
+                assert len(calls) == 1
+
+                calls.clear()
+                assert await client.create() == 503
+                assert len(calls) == 1
+
+                calls.clear()
+                assert await client.create_with_key() == 200
+                assert len(calls) == 3
+                assert len({call.headers["Idempotency-Key"] for call in calls}) == 1
+
+    asyncio.run(main())
+
+
+def test_retry_exception():
+    attempts = []
+
+    async def send(state):
+        attempts.append(state)
+        raise aiohttp.ServerDisconnectedError()
+
+    async def main():
+        core = RetrySession.flaky
+        state = RequestState(core, {}, {})
+        with pytest.raises(aiohttp.ServerDisconnectedError):
+            await RetryPolicy(attempts=2, backoff_base=0.0, backoff_max=0.0).run(send, state)
+        assert len(attempts) == 2
+        assert attempts[0] is not state
+
+    asyncio.run(main())
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 
 from ahttp_client import *
@@ -20,3 +22,164 @@ def test_single_session(test_method_for_single_session):
 
     assert test_method_for_single_session.before_hook == test_method_for_single_session.__core__.before_hook
     assert test_method_for_single_session.after_hook == test_method_for_single_session.__core__.after_hook
+
+
+def test_pooled_single_session():
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    async def handler(_):
+        return web.Response(text="OK")
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/", handler)
+
+        session_pool = SessionPool(idle_timeout=60)
+        async with TestServer(app) as server:
+
+            @Session.single_session(str(server.make_url("/")), pooled=session_pool)
+            @request("GET", "/", directly_response=True)
+            async def test_request(session: Session) -> None:
+                pass
+
+            clients = []
+
+            @test_request.before_hook
+            async def before_hook(session: Session, request, path):
+                clients.append(session)
+                return request, path
+
+            response_1 = await test_request()
+            response_2 = await test_request()
+            assert await response_1.text() == "OK"
+            assert await response_2.text() == "OK"
+            assert len(session_pool) == 1
+
+            # Each call has its own client, and the shared request isn't bound to the client.
+            await asyncio.gather(test_request(), test_request())
+            assert len(set(map(id, clients))) == 4
+            assert test_request.__core__.session is NotImplemented
+
+            client_session = clients[-1].session
+            assert all(client.closed for client in clients)
+            assert client_session.closed is False
+
+            await session_pool.close()
+            assert len(session_pool) == 0
+            assert client_session.closed is True
+
+    asyncio.run(main())
+
+
+def test_pool_config_validation():
+    with pytest.raises(ValueError):
+        PoolConfig(limit=-1)
+
+    with pytest.raises(ValueError):
+        PoolConfig(limit=10, limit_per_host=20)
+
+    with pytest.raises(ValueError):
+        PoolConfig(keepalive_timeout=None)
+
+    config = PoolConfig(force_close=True)
+    assert config.keepalive_timeout is None
+    assert config == PoolConfig(force_close=True, keepalive_timeout=None)
+    assert config.replace(limit=10).limit == 10
+
+
+def test_session_with_loop():
+    # The session can be created outside the running event loop, when the loop is given.
+    loop = asyncio.new_event_loop()
+    try:
+        client = Session("https://test_base_url", loop=loop)
+        assert client.session.connector._loop is loop
+        loop.run_until_complete(client.close())
+
+        session_pool = SessionPool()
+        pooled_client = Session("https://test_base_url", loop=loop, _session_pool=session_pool)
+        assert pooled_client.session.connector._loop is loop
+        loop.run_until_complete(pooled_client.close())
+        loop.run_until_complete(session_pool.close())
+    finally:
+        loop.close()
+
+
+def test_pool_config_class_attribute():
+    class TestSession(Session):
+        pool_config = PoolConfig(limit=10, limit_per_host=5)
+
+    async def main():
+        async with TestSession("https://test_base_url") as client:
+            assert client.session.connector.limit == 10
+            assert client.session.connector.limit_per_host == 5
+
+        async with TestSession("https://test_base_url", pool_config=PoolConfig(limit=20)) as client:
+            assert client.session.connector.limit == 20
+
+    asyncio.run(main())
+
+
+def test_single_session_stream():
+    from collections.abc import AsyncIterator
+
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    # The non-pooled session is closed before the stream is consumed.
+    with pytest.raises(TypeError):
+
+        @Session.single_session("https://test_base_url")
+        @request("GET", "/records")
+        async def records(session: Session) -> AsyncIterator[dict]:
+            pass
+
+    with pytest.raises(TypeError):
+
+        @Session.single_session("https://test_base_url")
+        @sse("/events")
+        async def events(session: Session) -> EventSource:
+            pass
+
+    async def handler(_):
+        return web.Response(body=b'{"id": 1}\n{"id": 2}\n')
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/records", handler)
+
+        session_pool = SessionPool()
+        async with TestServer(app) as server:
+
+            @Session.single_session(str(server.make_url("/")), pooled=session_pool)
+            @request("GET", "/records")
+            async def pooled_records(session: Session) -> AsyncIterator[dict]:
+                pass
+
+            async with await pooled_records() as stream:
+                assert [record async for record in stream] == [{"id": 1}, {"id": 2}]
+        await session_pool.close()
+
+    asyncio.run(main())
+
+
+def test_pool_closed_loop(caplog):
+    session_pool = SessionPool()
+
+    async def acquire():
+        return session_pool.acquire("https://test_base_url")
+
+    # The pool isn't closed before the event loop is closed.
+    client_session = asyncio.run(acquire())
+    assert client_session.closed is False
+
+    with caplog.at_level("WARNING", logger="ahttp_client.pool"):
+        new_client_session = asyncio.run(acquire())
+    assert client_session.closed is True
+    assert new_client_session is not client_session
+    assert len(session_pool) == 1
+    assert "closed event loop" in caplog.text
+
+    asyncio.run(session_pool.close())
+    assert new_client_session.closed is True
+    assert len(session_pool) == 0
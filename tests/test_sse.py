@@ -0,0 +1,115 @@
+import asyncio
+import time
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from ahttp_client import *
+
+
+def test_parser():
+    parser = EventStreamParser()
+    stream = b'\xef\xbb\xbfdata: first\r\ndata:second\r\n\r\n: heartbeat\n\nevent: update\nid: 7\nretry: 1500\ndata: {"a": 1}\n\n'
+    events = []
+    # The bytes are fed one by one to test the incremental parsing.
+    for index in range(len(stream)):
+        events.extend(parser.feed(stream[index : index + 1]))
+
+    assert events == [
+        ServerSentEvent("message", "first\nsecond", "", None),
+        ServerSentEvent("update", '{"a": 1}', "7", 1500),
+    ]
+    assert events[1].json() == {"a": 1}
+    assert parser.last_event_id == "7"
+    assert parser.retry == 1500
+
+
+def test_parser_line_endings():
+    parser = EventStreamParser()
+    assert parser.feed(b"data: a\r") == []
+    assert parser.feed(b"\n\r") == [ServerSentEvent("message", "a")]
+    assert parser.feed(b"id\rdata\r\r") == [ServerSentEvent("message", "", "")]
+
+    with pytest.raises(ValueError):
+        EventStream(retry=-1)
+
+
+def test_parser_long_line():
+    parser = EventStreamParser()
+    data = b"data: " + b"x" * 320 * 1024 + b"\r\n\r\n"
+    events = []
+    started_at = time.perf_counter()
+    for index in range(0, len(data), 16):
+        events.extend(parser.feed(data[slice(index, index + 16)]))
+    # The incomplete line is not searched again for each chunk.
+    assert time.perf_counter() - started_at < 5
+    assert events == [ServerSentEvent("message", "x" * 320 * 1024)]
+
+
+class EventSession(Session):
+    @sse("/events", retry=0.0, max_reconnects=2)
+    async def events(self) -> EventSource:
+        pass
+
+    @sse("/silent", retry=0.0, heartbeat_timeout=0.05, max_reconnects=1)
+    async def silent(self) -> EventSource:
+        pass
+
+    @sse("/broken")
+    async def broken(self) -> EventSource:
+        pass
+
+
+def test_session_sse():
+    last_event_ids = []
+    silent_calls = []
+
+    async def events(request: web.Request):
+        last_event_ids.append(request.headers.get("Last-Event-ID"))
+        if len(last_event_ids) > 1:
+            return web.Response(status=204)
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        await response.write(b"id: 1\ndata: a\n\n")
+        await response.write(b"id: 2\ndata: b\n\n")
+        await response.write_eof()
+        return response
+
+    async def silent(request: web.Request):
+        silent_calls.append(request)
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        await response.write(b": connected\n\n")
+        await asyncio.sleep(1)
+        return response
+
+    async def broken(_: web.Request):
+        return web.Response(text="not stream")
+
+    async def main():
+        app = web.Application()
+        app.add_routes(
+            [
+                web.get("/events", events),
+                web.get("/silent", silent),
+                web.get("/broken", broken),
+            ]
+        )
+        async with TestServer(app) as server:
+            async with EventSession(str(server.make_url("/"))) as client:
+                event_source = await client.events()
+                assert [event.data async for event in event_source] == ["a", "b"]
+                assert last_event_ids == [None, "2"]
+                assert event_source.closed
+
+                event_source = await client.silent()
+                assert [event async for event in event_source] == []
+                assert len(silent_calls) == 2
+
+                with pytest.raises(aiohttp.ClientResponseError):
+                    await client.broken()
+
+    asyncio.run(main())
@@ -0,0 +1,131 @@
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Annotated
+
+import pydantic
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from ahttp_client import *
+from ahttp_client.response import BufferedResponse
+
+BODY = b"0123456789" * 1000
+RECORDS = b'{"id": 1, "name": "a"}\n\n{"id": 2, "name": "b"}\n{"id": 3, "name": "c"}'
+
+
+class Record(pydantic.BaseModel):
+    id: int
+    name: str
+
+
+def test_stream_annotation():
+    assert Stream.from_annotation(AsyncIterator[bytes]) == Stream()
+    assert Stream.from_annotation(Annotated[AsyncIterator[bytes], Stream(chunk_size=10)]) == Stream(10)
+    assert Stream.from_annotation(Annotated[AsyncIterator[bytes], Stream]) == Stream()
+    assert Stream.from_annotation(AsyncIterator[dict]) == Stream(item_type=dict)
+    assert Stream.from_annotation(bytes) is None
+
+    with pytest.raises(ValueError):
+        Stream(chunk_size=0)
+
+
+def test_buffered_response_stream():
+    async def main():
+        response = BufferedResponse("GET", "https://api.yhs.kr", 200, "OK", [], BODY)
+        chunks = [chunk async for chunk in ResponseStream(response, chunk_size=3000)]
+        assert [len(chunk) for chunk in chunks] == [3000, 3000, 3000, 1000]
+        assert b"".join(chunks) == BODY
+
+        # The body fitting in a chunk is returned as is.
+        chunks = [chunk async for chunk in ResponseStream(response, chunk_size=len(BODY))]
+        assert chunks[0] is BODY
+
+    asyncio.run(main())
+
+
+def test_buffered_json_lines_stream():
+    async def main():
+        long_record = b'{"id": 4, "name": "%s"}' % (b"x" * 1000)
+        response = BufferedResponse("GET", "https://api.yhs.kr", 200, "OK", [], RECORDS + b"\n" + long_record)
+        records = [record async for record in JsonLinesStream(response, chunk_size=5)]
+        assert [record["id"] for record in records] == [1, 2, 3, 4]
+        assert records[3]["name"] == "x" * 1000
+
+    asyncio.run(main())
+
+
+class StreamSession(Session):
+    @request("GET", "/export")
+    async def export(self) -> Annotated[AsyncIterator[bytes], Stream(chunk_size=1024)]:
+        pass
+
+    @request("GET", "/export")
+    async def export_size(self, body: AsyncIterator[bytes]) -> int:
+        size = 0
+        async for chunk in body:
+            size += len(chunk)
+        return size
+
+    @request("GET", "/records")
+    async def records(self) -> AsyncIterator[Record]:
+        pass
+
+    @request("GET", "/records")
+    async def raw_records(self) -> Annotated[AsyncIterator[dict], Stream(chunk_size=7)]:
+        pass
+
+    @request("GET", "/export")
+    async def export_abandoned(self, body: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        return body
+
+
+def test_session_stream():
+    async def handler(request: web.Request):
+        response = web.StreamResponse()
+        await response.prepare(request)
+        for index in range(0, len(BODY), 4000):
+            await response.write(BODY[index : index + 4000])
+        await response.write_eof()
+        return response
+
+    async def records(request: web.Request):
+        response = web.StreamResponse()
+        await response.prepare(request)
+        for index in range(0, len(RECORDS), 5):
+            await response.write(RECORDS[index : index + 5])
+        await response.write_eof()
+        return response
+
+    async def main():
+        app = web.Application()
+        app.add_routes([web.get("/export", handler), web.get("/records", records)])
+        async with TestServer(app) as server:
+            async with StreamSession(str(server.make_url("/"))) as client:
+                stream = await client.export()
+                assert isinstance(stream, ResponseStream)
+                chunks = [chunk async for chunk in stream]
+                assert all(len(chunk) <= 1024 for chunk in chunks)
+                assert b"".join(chunks) == BODY
+                assert stream.closed
+
+                assert await client.export_size() == len(BODY)
+
+                stream = await client.records()
+                assert isinstance(stream, JsonLinesStream)
+                assert [record async for record in stream] == [
+                    Record(id=1, name="a"),
+                    Record(id=2, name="b"),
+                    Record(id=3, name="c"),
+                ]
+                assert stream.closed
+
+                assert [record["id"] for record in await (await client.raw_records()).read()] == [1, 2, 3]
+
+                stream = await client.export_abandoned()
+                async with stream:
+                    assert len(await stream.__anext__()) > 0
+                assert stream.closed
+                assert stream.response.closed
+
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+import asyncio
+import random
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from ahttp_client import *
+
+
+def test_histogram():
+    histogram = Histogram()
+    assert histogram.percentile(0.5) is None
+    assert histogram.mean is None
+
+    values = sorted(random.uniform(0.001, 1.0) for _ in range(1000))
+    for value in values:
+        histogram.record(value)
+
+    assert histogram.count == 1000
+    assert histogram.min == values[0]
+    assert histogram.max == values[-1]
+    for percentile in (0.5, 0.9, 0.99):
+        expected = values[round(percentile * 1000) - 1]
+        # The relative error is bounded by the significant bits.
+        assert expected <= histogram.percentile(percentile) <= expected * (1 + 2**-4)
+    assert sum(count for _, count in histogram.buckets()) == 1000
+
+    other = Histogram()
+    other.record(5000.0)
+    histogram.merge(other)
+    assert histogram.count == 1001
+    assert histogram.max == 5000.0
+    assert histogram.percentile(1.0) == 5000.0
+
+    histogram.reset()
+    assert histogram.count == 0
+    assert list(histogram.buckets()) == []
+
+    with pytest.raises(ValueError):
+        histogram.merge(Histogram(significant_bits=2))
+
+
+class TraceSession(Session):
+    tracer = NetworkTracer()
+
+    @request("GET", "/slow", directly_response=True)
+    async def slow(self) -> bytes:
+        pass
+
+
+def test_network_tracer():
+    async def slow(_):
+        await asyncio.sleep(0.05)
+        return web.Response(body=b"slow")
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/slow", slow)
+        async with TestServer(app) as server:
+            async with TraceSession(str(server.make_url(""))) as session:
+                await session.slow()
+                await session.slow()
+                await session.session.get("/slow")
+
+                timings = session.network_timings()
+                assert list(timings.keys()) == ["slow"]
+                assert timings["slow"]["total"]["count"] == 2
+                assert timings["slow"]["ttfb"]["min"] >= 0.05
+                assert timings["slow"]["connect"]["count"] == 1
+                assert timings["slow"]["body"]["count"] == 2
+                assert session.network_timings("slow") == timings["slow"]
+
+            async with Session("http://localhost") as session:
+                assert session.network_timings() == {}
+
+    asyncio.run(main())